@@ -0,0 +1,133 @@
+"""Login storm: bcrypt inline on the event loop vs on the ``PasswordHasher`` process pool.
+
+``--clients`` concurrent clients log in back to back for ``--seconds`` while a
+probe requests ``/health`` and ``GET /products/{id}`` every ``--probe-ms``.
+"inline" runs bcrypt inside the async handler (the old behaviour); "pool"
+awaits the process pool. Login throughput is in the first table; the probe
+latency of the unrelated endpoints, which the inline hashing stalls, is in
+the second. Rejected logins (503) are the pool's admission limit at work.
+
+    python -m benchmarks.bench_auth --clients 32 --seconds 10 --rounds 12
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TypeVar
+
+import httpx
+
+from benchmarks.common import print_table, seed_products, summarize, use_database
+from src.shared.password_hasher import PasswordHasher, get_password_hasher
+from src.shared.security import hash_password
+from src.users.domain.entities import User
+from src.users.infrastructure.repositories.user_repository_sqlite import SQLiteUserRepository
+
+T = TypeVar("T")
+PASSWORD = "storm-password"
+
+
+class _InlineHasher(PasswordHasher):
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return fn(*args)
+
+
+async def _storm(app, hasher: PasswordHasher, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+    latencies: Dict[str, List[float]] = {"POST /auth/login": [], "/health": [], "GET /products/{id}": []}
+    rejected = 0
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Warm up: start the worker processes and open the DB pool
+            await client.post("/auth/login", json={"email": "user0@example.com", "password": PASSWORD})
+            deadline = time.perf_counter() + args.seconds
+
+            async def login(index: int) -> None:
+                nonlocal rejected
+                while time.perf_counter() < deadline:
+                    t0 = time.perf_counter()
+                    resp = await client.post(
+                        "/auth/login", json={"email": f"user{index % args.users}@example.com", "password": PASSWORD}
+                    )
+                    if resp.status_code == 503:
+                        rejected += 1
+                        await asyncio.sleep(0.05)
+                        continue
+                    assert resp.status_code == 200, resp.text
+                    latencies["POST /auth/login"].append(time.perf_counter() - t0)
+
+            async def probe() -> None:
+                # Open loop: latency counts from the scheduled send time, so a stalled loop shows up
+                scheduled = time.perf_counter()
+                step = 0
+                while scheduled < deadline:
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    label, url = ("/health", "/health") if step % 2 else ("GET /products/{id}", f"/products/{1 + step % 500}")
+                    await client.get(url)
+                    latencies[label].append(time.perf_counter() - scheduled)
+                    scheduled += args.probe_ms / 1000
+                    step += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(probe(), *(login(i) for i in range(args.clients)))
+            elapsed = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.pop(get_password_hasher, None)
+
+    rows = {label: summarize(values, elapsed) for label, values in latencies.items()}
+    rows["POST /auth/login"]["rejected"] = rejected
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=0, help="hashing processes (0 = CPU count)")
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--probe-ms", type=float, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # the legacy handlers log every statement
+
+    workers = args.workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_auth.db")
+        seed_products(db_path, 1000)
+        with use_database(db_path):
+            users = SQLiteUserRepository()
+            password_hash = hash_password(PASSWORD, rounds=args.rounds)
+            for i in range(args.users):
+                users.create_user(User.create(email=f"user{i}@example.com", password_hash=password_hash))
+
+            from main import app
+
+            results = {}
+            for name, hasher in (
+                ("inline", _InlineHasher(workers=workers, rounds=args.rounds, queue_size=args.queue_size)),
+                ("pool", PasswordHasher(workers=workers, rounds=args.rounds, queue_size=args.queue_size)),
+            ):
+                try:
+                    results[name] = asyncio.run(_storm(app, hasher, args))
+                finally:
+                    hasher.shutdown()
+                if name == "pool":
+                    print("\nhasher:", hasher.stats())
+
+    title = f"{args.clients} login clients, bcrypt cost {args.rounds}, {workers} hashing worker(s)"
+    print_table(f"{title}: logins", {name: rows["POST /auth/login"] for name, rows in results.items()})
+    print("rejected (503):", {name: int(rows["POST /auth/login"]["rejected"]) for name, rows in results.items()})
+    for label in ("/health", "GET /products/{id}"):
+        print_table(f"{title}: {label} during the storm", {name: rows[label] for name, rows in results.items()})
+
+
+if __name__ == "__main__":
+    main()
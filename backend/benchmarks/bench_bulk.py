@@ -0,0 +1,116 @@
+"""Bulk product endpoints vs one request per item.
+
+Creates, updates and deletes ``--items`` products through the API (in-process
+ASGI), first one HTTP request per item (``POST /products/``, ``PUT`` and
+``DELETE /products/{id}``: one connection checkout and one commit each), then
+through ``POST|PATCH|DELETE /products/bulk`` in batches of ``--batch``.
+
+    python -m benchmarks.bench_bulk --items 10000 --batch 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import seed_products, use_database
+from src.products.api import get_uow
+from src.products.infrastructure.uow import SQLAlchemyUnitOfWork
+
+
+def _item(i: int) -> dict:
+    return {"name": f"Sync item {i}", "price": 10 + i % 90, "stock": i % 50, "category": "Toys"}
+
+
+def _batches(items: List, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _one_by_one(client: httpx.AsyncClient, n: int) -> Dict[str, float]:
+    timings = {}
+    started = time.perf_counter()
+    ids = [(await client.post("/products/", json=_item(i))).json()["id"] for i in range(n)]
+    timings["create"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for pid in ids:
+        await client.put(f"/products/{pid}", json={"stock": 7})
+    timings["update"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for pid in ids:
+        await client.delete(f"/products/{pid}")
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def _bulk(client: httpx.AsyncClient, n: int, batch: int) -> Dict[str, float]:
+    timings = {}
+    ids: List[int] = []
+    started = time.perf_counter()
+    for chunk in _batches([_item(i) for i in range(n)], batch):
+        resp = await client.post("/products/bulk", json={"items": chunk})
+        ids.extend(r["id"] for r in resp.json()["results"])
+    timings["create"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for chunk in _batches(ids, batch):
+        await client.patch("/products/bulk", json={"items": [{"id": pid, "stock": 7} for pid in chunk]})
+    timings["update"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for chunk in _batches(ids, batch):
+        await client.request("DELETE", "/products/bulk", params={"hard": "true"}, json={"ids": chunk})
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def _run(args: argparse.Namespace, db_path: str) -> Dict[str, Dict[str, float]]:
+    from main import app
+
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    factory = sessionmaker(bind=engine, future=True)
+    app.dependency_overrides[get_uow] = lambda: SQLAlchemyUnitOfWork(factory)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return {
+                "one request per item": await _one_by_one(client, args.items),
+                f"bulk, {args.batch} per request": await _bulk(client, args.items, args.batch),
+            }
+    finally:
+        app.dependency_overrides.pop(get_uow, None)
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    parser.add_argument("--rows", type=int, default=100_000, help="catalog size before the run")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # the legacy handlers log every statement
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_bulk.db")
+        seed_products(db_path, args.rows)
+        with use_database(db_path):
+            results = asyncio.run(_run(args, db_path))
+
+    print(f"\n{args.items} items, seconds per phase (items/s in parentheses)")
+    print(f"{'':<28}" + "".join(f"{op:>20}" for op in ("create", "update", "delete")))
+    for label, timings in results.items():
+        cells = "".join(f"{f'{t:.2f} ({args.items / t:,.0f})':>20}" for t in timings.values())
+        print(f"{label:<28}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Checkout under contention: concurrent orders on a few hot SKUs, checked for oversell.
+
+``--checkouts`` orders of 1 to ``--max-lines`` lines, drawn from ``--skus`` hot
+products with ``--stock`` units each, are all started at once. Demand is well
+above supply, so many are refused, and every sale must come out of stock.
+
+- "POST /orders": the API end to end (token auth, run_in_db, place_order).
+- "place_order": the use case on the DB threads, without HTTP.
+- "read-modify-write": the per-item pattern the orders module avoids.
+  ``get_by_id``, check the stock, ``Product.with_updates(stock - qty)``, then
+  ``update`` and commit.
+
+After each run the units sold (from order rows, or counted by the client for
+read-modify-write) are compared with the stock that left each SKU. "oversold"
+counts units sold beyond a SKU's initial stock. "lost" counts units sold but
+never decremented (lost updates). Both must be 0.
+
+    python -m benchmarks.bench_checkout --checkouts 500 --skus 20 --stock 50
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import print_table, seed_products, summarize, use_database
+from src.orders.application.dto import CheckoutLine
+from src.orders.application.use_cases.place_order import place_order
+from src.orders.domain.errors import InsufficientStock
+from src.orders.infrastructure.uow import SQLAlchemyOrderUnitOfWork
+from src.products.infrastructure.db.session import dispose_engines
+from src.products.infrastructure.uow import SQLAlchemyUnitOfWork
+from src.shared.db_executor import run_in_db
+from src.shared.migrations import apply_migrations, registered_migrations
+from src.shared.security import create_token
+
+Lines = List[Tuple[int, int]]
+
+USERS = 50
+
+
+def _workload(args: argparse.Namespace) -> List[Lines]:
+    rng = random.Random(args.seed)
+    skus = list(range(1, args.skus + 1))
+    return [
+        [(pid, rng.randint(1, 3)) for pid in rng.sample(skus, rng.randint(1, args.max_lines))]
+        for _ in range(args.checkouts)
+    ]
+
+
+def _prepare(path: str, args: argparse.Namespace) -> None:
+    seed_products(path, args.rows)
+    conn = sqlite3.connect(path)
+    try:
+        apply_migrations(conn, registered_migrations())  # users and orders
+        conn.execute("UPDATE products SET stock = ?, is_active = 1 WHERE id <= ?", (args.stock, args.skus))
+        conn.executemany(
+            "INSERT INTO users (email, password_hash) VALUES (?, 'x')", [(f"buyer{i}@bench.test",) for i in range(USERS)]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _place(lines: Lines) -> bool:
+    try:
+        with SQLAlchemyOrderUnitOfWork() as uow:
+            place_order(uow, user_id=None, lines=[CheckoutLine(pid, qty) for pid, qty in lines])
+        return True
+    except InsufficientStock:
+        return False
+
+
+def _read_modify_write(lines: Lines) -> bool:
+    with SQLAlchemyUnitOfWork() as uow:
+        for pid, qty in lines:
+            product = uow.products.get_by_id(pid)
+            if product is None or product.stock_units < qty:
+                uow.rollback()
+                return False
+            uow.products.update(product.with_updates(stock_units=product.stock_units - qty))
+    return True
+
+
+async def _run(workload: List[Lines], call) -> Tuple[Dict[str, float], List[Optional[bool]]]:
+    """Start every checkout at once; outcomes (True placed, False refused, None error) in workload order."""
+    latencies: List[float] = []
+    outcomes: List[Optional[bool]] = [None] * len(workload)
+
+    async def one(index: int, lines: Lines) -> None:
+        started = time.perf_counter()
+        try:
+            outcomes[index] = await call(lines)
+        except Exception:
+            pass  # an error: neither sold nor refused
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i, lines) for i, lines in enumerate(workload)))
+    return summarize(latencies, time.perf_counter() - started), outcomes
+
+
+async def _api(workload: List[Lines]):
+    from main import app
+
+    tokens = [create_token({"sub": str(i)}) for i in range(1, USERS + 1)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        counter = iter(range(len(workload)))
+
+        async def call(lines: Lines) -> Optional[bool]:
+            headers = {"Authorization": f"Bearer {tokens[next(counter) % USERS]}"}
+            items = [{"product_id": pid, "quantity": qty} for pid, qty in lines]
+            response = await client.post("/orders", json={"items": items}, headers=headers)
+            return {201: True, 409: False}.get(response.status_code)
+
+        return await _run(workload, call)
+
+
+async def _in_db(workload: List[Lines], fn):
+    async def call(lines: Lines) -> bool:
+        return await run_in_db(fn, lines)
+
+    return await _run(workload, call)
+
+
+def _audit(path: str, args: argparse.Namespace, workload: List[Lines], outcomes, from_orders: bool) -> Dict[str, int]:
+    conn = sqlite3.connect(path)
+    try:
+        remaining = dict(conn.execute("SELECT id, stock FROM products WHERE id <= ?", (args.skus,)).fetchall())
+        if from_orders:
+            sold = dict(conn.execute("SELECT product_id, SUM(quantity) FROM order_items GROUP BY 1").fetchall())
+        else:
+            sold = {}
+            for lines, placed in zip(workload, outcomes):
+                for pid, qty in lines if placed else ():
+                    sold[pid] = sold.get(pid, 0) + qty
+    finally:
+        conn.close()
+    decremented = {pid: args.stock - left for pid, left in remaining.items()}
+    return {
+        "placed": sum(1 for o in outcomes if o),
+        "refused": sum(1 for o in outcomes if o is False),
+        "errors": sum(1 for o in outcomes if o is None),
+        "units_sold": sum(sold.values()),
+        "oversold": sum(max(0, units - args.stock) for units in sold.values()),
+        "lost": sum(max(0, units - decremented.get(pid, 0)) for pid, units in sold.items()),
+        "negative_stock": sum(1 for left in remaining.values() if left < 0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkouts", type=int, default=500)
+    parser.add_argument("--skus", type=int, default=20, help="hot products every order draws from")
+    parser.add_argument("--stock", type=int, default=50, help="initial units of each hot product")
+    parser.add_argument("--max-lines", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=10_000, help="catalog size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # refused checkouts and lost-update errors are expected
+
+    workload = _workload(args)
+    modes = {
+        "POST /orders": (lambda: _api(workload), True),
+        "place_order": (lambda: _in_db(workload, _place), True),
+        "read-modify-write": (lambda: _in_db(workload, _read_modify_write), False),
+    }
+    timings: Dict[str, Dict[str, float]] = {}
+    audits: Dict[str, Dict[str, int]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, (run, from_orders) in modes.items():
+            path = str(Path(tmp) / f"{label.replace(' ', '_').replace('/', '')}.db")
+            _prepare(path, args)
+            with use_database(path):
+                timings[label], outcomes = asyncio.run(run())
+                dispose_engines()
+            audits[label] = _audit(path, args, workload, outcomes, from_orders)
+
+    demand = sum(qty for lines in workload for _pid, qty in lines)
+    print_table(
+        f"{args.checkouts} concurrent checkouts, {args.skus} SKUs x {args.stock} units "
+        f"({demand} units demanded, {args.skus * args.stock} in stock)",
+        timings,
+    )
+    columns = ["placed", "refused", "errors", "units_sold", "oversold", "lost", "negative_stock"]
+    print(f"\n{'':<28}" + "".join(f"{c:>16}" for c in columns))
+    for label, audit in audits.items():
+        print(f"{label:<28}" + "".join(f"{audit[c]:>16}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
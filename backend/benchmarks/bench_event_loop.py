@@ -0,0 +1,134 @@
+"""p99 latency of the API under concurrent clients, with and without the DB executor.
+
+"blocking" calls the sqlite3 functions inline from the async handlers (the old
+behaviour); "offloaded" goes through ``run_in_db``.
+
+Clients are open-loop: each of the ``--clients`` sends one request every
+``--interval`` seconds on a fixed schedule, and latency is measured from the
+scheduled send time (as wrk2 does). A stalled event loop makes requests late
+and shows up in the percentiles, even though the app runs in-process.
+
+While clients run, a background "catalog sync" writer holds SQLite's write
+lock for ``--hold-ms`` out of every ``--period-ms``. Clients mix stock updates,
+which wait on that lock through busy_timeout, with cheap ``/health`` and
+get-by-id reads. The p99 of the reads shows how long other requests' database
+waits stall the event loop.
+
+    python -m benchmarks.bench_event_loop --clients 200 --rows 200000
+"""
+
+import argparse
+import asyncio
+import logging
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import print_table, seed_products, summarize, use_database
+from src.products import api as products_api
+from src.shared.db_executor import get_db_executor, run_in_db
+
+
+async def _inline(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def _hold_write_lock(db_path: str, hold: float, period: float, stop: threading.Event) -> None:
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold)
+            conn.execute("COMMIT")
+            stop.wait(period - hold)
+    finally:
+        conn.close()
+
+
+async def _run_clients(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    from main import app
+
+    latencies: Dict[str, List[float]] = {"/health": [], "GET /products/{id}": [], "PUT /products/{id}": []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        loop = asyncio.get_running_loop()
+        origin = loop.time()
+
+        async def worker(index: int) -> None:
+            scheduled = origin + args.interval * index / args.clients
+            for step in range(args.requests):
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                kind = (index + step) % 4
+                product_url = f"/products/{1 + (index * 97 + step) % 1000}"
+                if kind == 0:
+                    label = "PUT /products/{id}"
+                    response = await client.put(product_url, json={"stock": step})
+                elif kind == 1:
+                    label = "GET /products/{id}"
+                    response = await client.get(product_url)
+                else:
+                    label = "/health"
+                    response = await client.get("/health")
+                latencies[label].append(loop.time() - scheduled)
+                assert response.status_code in (200, 404), response.text
+                scheduled += args.interval
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    return {label: summarize(values, elapsed) for label, values in latencies.items()}
+
+
+def _measure(db_path: str, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    stop = threading.Event()
+    writer = threading.Thread(
+        target=_hold_write_lock, args=(db_path, args.hold_ms / 1000, args.period_ms / 1000, stop), daemon=True
+    )
+    writer.start()
+    try:
+        return asyncio.run(_run_clients(args))
+    finally:
+        stop.set()
+        writer.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between a client's requests")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--hold-ms", type=float, default=50, help="write lock held by the sync writer")
+    parser.add_argument("--period-ms", type=float, default=250, help="sync writer cycle length")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("src.products.api").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        seed_products(path, args.rows)
+
+        with use_database(path):
+            products_api.run_in_db = _inline
+            try:
+                before = _measure(path, args)
+            finally:
+                products_api.run_in_db = run_in_db
+            after = _measure(path, args)
+
+    offered = args.clients / args.interval
+    print_table(f"blocking (inline sqlite3), {args.clients} clients, {offered:.0f} req/s offered", before)
+    print_table(f"offloaded (run_in_db), {args.clients} clients, {offered:.0f} req/s offered", after)
+    print("\nexecutor:", get_db_executor().stats())
+
+
+if __name__ == "__main__":
+    main()
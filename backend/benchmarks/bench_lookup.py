@@ -0,0 +1,86 @@
+"""Cart-sized product fetches: N ``GET /products/{id}`` vs one ``POST /products/lookup``.
+
+Each "page" fetches ``--cart`` random ids through the API (in-process ASGI),
+either as N concurrent single-product requests (N connection checkouts and N
+queries) or as one lookup request (one ``IN (...)`` query on a read-only
+connection). Ids are random over ``--rows`` products, so the response cache
+rarely hits.
+
+    python -m benchmarks.bench_lookup --rows 100000 --cart 20 --pages 500
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import print_table, seed_products, summarize, use_database
+from src.products.api import get_read_uow_factory
+from src.products.infrastructure.db.session import ReadOnlySession, create_read_only_engine
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork
+
+
+async def _time(pages: List[List[int]], fetch: Callable[[List[int]], Awaitable[None]]) -> Dict[str, float]:
+    await fetch(pages[0])  # warm up connections and statement caches
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for ids in pages:
+        t0 = time.perf_counter()
+        await fetch(ids)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def _run(args: argparse.Namespace, db_path: str) -> Dict[str, Dict[str, float]]:
+    from main import app
+
+    engine = create_read_only_engine(db_path)
+    factory = sessionmaker(bind=engine, class_=ReadOnlySession, autoflush=False, expire_on_commit=False)
+    app.dependency_overrides[get_read_uow_factory] = lambda: lambda: SQLAlchemyReadOnlyUnitOfWork(factory)
+    rng = random.Random(42)
+    pages = [rng.sample(range(1, args.rows + 1), args.cart) for _ in range(args.pages)]
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one_by_one(ids: List[int]) -> None:
+                await asyncio.gather(*(client.get(f"/products/{pid}") for pid in ids))
+
+            async def lookup(ids: List[int]) -> None:
+                (await client.post("/products/lookup", json={"ids": ids})).raise_for_status()
+
+            return {
+                f"{args.cart} x GET /products/{{id}}": await _time(pages, one_by_one),
+                "1 x POST /products/lookup": await _time(pages, lookup),
+            }
+    finally:
+        app.dependency_overrides.pop(get_read_uow_factory, None)
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cart", type=int, default=20, help="ids per page")
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # the legacy handlers log every statement
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_lookup.db")
+        seed_products(db_path, args.rows)
+        with use_database(db_path):
+            results = asyncio.run(_run(args, db_path))
+
+    print_table(f"Fetch {args.cart} products per page ({args.rows} rows, {args.pages} pages)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Price conversion throughput: REAL + Decimal (previous) vs integer cents.
+
+Measures, in values/s, the conversions the product paths do per row:
+
+- read: a stored price to the domain's amount string. Previously
+  ``f"{row.price:.2f}"`` per row; now ``format_cents`` over the whole batch.
+- write: an amount string to what is stored. Previously a ``Decimal`` parse
+  and ``quantize`` then ``float``; now ``parse_cents`` (plain two-decimal
+  amounts skip ``Decimal``).
+- write, awkward input: amounts with more than two decimals, which still go
+  through ``Decimal`` for exact rounding.
+
+    python -m benchmarks.bench_money --values 200000
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from src.products.domain.value_objects import format_cents, parse_cents
+
+_CENT = Decimal("0.01")
+
+
+def _previous_write(amount: str) -> float:
+    value = Decimal(amount).quantize(_CENT)
+    if value < Decimal("0.00"):
+        raise ValueError("Money amount cannot be negative")
+    return float(value)
+
+
+def _rate(fn: Callable[[], object], count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--values", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cents: List[int] = [rng.randrange(1, 10_000_000) for _ in range(args.values)]
+    prices = [c / 100 for c in cents]
+    amounts = format_cents(cents)
+    awkward = [f"{a}{rng.randrange(10)}" for a in amounts]
+
+    assert [f"{p:.2f}" for p in prices] == amounts
+    assert [parse_cents(a) for a in amounts] == cents
+
+    results: Dict[str, Dict[str, float]] = {
+        "read (row -> amount)": {
+            "REAL + f-string": _rate(lambda: [f"{p:.2f}" for p in prices], args.values),
+            "cents + format_cents": _rate(lambda: format_cents(cents), args.values),
+        },
+        "write (amount -> stored)": {
+            "Decimal -> REAL": _rate(lambda: [_previous_write(a) for a in amounts], args.values),
+            "parse_cents": _rate(lambda: [parse_cents(a) for a in amounts], args.values),
+        },
+        "write, 3 decimals": {
+            "Decimal -> REAL": _rate(lambda: [_previous_write(a) for a in awkward], args.values),
+            "parse_cents": _rate(lambda: [parse_cents(a) for a in awkward], args.values),
+        },
+    }
+
+    print(f"\n{args.values} values")
+    print(f"{'':<28}{'path':<24}{'values/s':>14}{'speedup':>10}")
+    for label, paths in results.items():
+        baseline = next(iter(paths.values()))
+        for name, rate in paths.items():
+            print(f"{label:<28}{name:<24}{rate:>14,.0f}{rate / baseline:>9.1f}x")
+            label = ""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""``SQLAlchemyProductRepository.list``: separate COUNT + ORM entities vs one projected statement.
+
+"before" is the previous implementation: ``SELECT count(*) FROM (subquery)``
+then ``select(ProductORM)``, hydrating identity-mapped entities and copying
+them into domain ``Product`` objects. "after" is the repository as it is now:
+page rows and the total from one statement (an uncorrelated ``COUNT(*)``
+subquery in the page SELECT), projected as plain rows.
+
+The count cache is cleared before every call, so each exact total is really
+counted; that is the path a write (a new catalog version) puts every
+filter combination on. ``window`` times ``COUNT(*) OVER ()`` for comparison:
+SQLite must buffer every matching row before returning the first one.
+
+    python -m benchmarks.bench_repository_list --sizes 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import and_, create_engine, func, literal_column, select, text
+from sqlalchemy.orm import Session
+
+from benchmarks.common import print_table, seed_products, summarize
+from src.products.domain.entities import Product
+from src.products.infrastructure.db.models import ProductORM
+from src.products.infrastructure.repositories.product_repository_sqlalchemy import (
+    SQLAlchemyProductRepository,
+    _to_domain,
+)
+from src.products.totals import count_cache
+
+# label -> filters
+SCENARIOS = {
+    "price range (~40% of rows)": {"min_price": "100", "max_price": "500"},
+    "category + price (~5%)": {"category": "Home", "min_price": "100", "max_price": "500"},
+    "search 'kettle' (~6%)": {"search": "kettle"},
+}
+
+
+def _conditions(filters: dict) -> list:
+    conditions = [ProductORM.is_active == literal_column("1")]
+    if filters.get("category"):
+        conditions.append(ProductORM.category == filters["category"])
+    if filters.get("min_price"):
+        conditions.append(ProductORM.price_cents >= int(filters["min_price"]) * 100)
+    if filters.get("max_price"):
+        conditions.append(ProductORM.price_cents <= int(filters["max_price"]) * 100)
+    if filters.get("search"):
+        conditions.append(
+            ProductORM.id.in_(text("SELECT rowid FROM products_fts WHERE products_fts MATCH :q").bindparams(
+                q=f'"{filters["search"]}"*'
+            ))
+        )
+    return conditions
+
+
+def _before(session: Session, filters: dict, limit: int) -> Tuple[List[Product], int]:
+    stmt = select(ProductORM).where(and_(*_conditions(filters)))
+    total = session.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+    rows = session.execute(stmt.order_by(ProductORM.id).limit(limit)).scalars().all()
+    return [_to_domain(r) for r in rows], total
+
+
+def _after(session: Session, filters: dict, limit: int) -> Tuple[List[Product], int]:
+    return SQLAlchemyProductRepository(session).list(filters=filters, limit=limit, offset=0)
+
+
+def _window(session: Session, filters: dict, limit: int) -> Tuple[List[Product], int]:
+    columns = [c for c in ProductORM.__table__.c if c.name != "price"]
+    stmt = select(*columns, func.count().over()).where(and_(*_conditions(filters)))
+    rows = session.execute(stmt.order_by(ProductORM.id).limit(limit)).all()
+    return [_to_domain(r) for r in rows], rows[0][-1] if rows else 0
+
+
+STRATEGIES: Dict[str, Callable[[Session, dict, int], Tuple[List[Product], int]]] = {
+    "before": _before,
+    "after": _after,
+    "window": _window,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=10, help="timed calls per scenario and strategy")
+    parser.add_argument("--limit", type=int, default=21, help="page size (list() asks for limit + 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = str(Path(tmp) / f"bench_list_{size}.db")
+            seed_products(db_path, size)
+            engine = create_engine(f"sqlite:///{db_path}", future=True)
+            for label, filters in SCENARIOS.items():
+                rows: Dict[str, Dict[str, float]] = {}
+                for name, run in STRATEGIES.items():
+                    # The window form takes seconds per call at 1M rows
+                    repeat = min(args.repeat, 3) if name == "window" and size >= 1_000_000 else args.repeat
+                    with Session(engine) as session:
+                        count_cache.clear()
+                        items, total = run(session, filters, args.limit)  # warm the page cache
+                        latencies: List[float] = []
+                        loop_started = time.perf_counter()
+                        for _ in range(repeat):
+                            count_cache.clear()
+                            t0 = time.perf_counter()
+                            items, total = run(session, filters, args.limit)
+                            latencies.append(time.perf_counter() - t0)
+                            session.expunge_all()
+                        rows[f"{name} ({total})"] = summarize(latencies, time.perf_counter() - loop_started)
+                print_table(f"{size} rows, {label}  [total in parentheses]", rows)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
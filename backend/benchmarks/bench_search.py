@@ -0,0 +1,111 @@
+"""Product text search: FTS5 index vs the old ``LIKE '%term%'`` scan.
+
+Seeds a catalog (1M rows by default; the FTS index is filled by the insert
+triggers) and times the statements ``GET /products?search=...`` issues: the
+total and the first page. "like name" is the old behaviour (substring on the
+name only); "like name+desc" is what a LIKE scan costs for the columns FTS
+covers; "fts" and "fts relevance" are the current filter and ranked forms.
+
+    python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import print_table, seed_products, summarize
+from src.products.search import MATCH_FILTER_SQL, RANKED_JOIN_SQL, build_match_query
+from src.shared.connection_pool import open_connection
+
+_COLUMNS = "id, name, price, stock, category, description, is_active"
+
+# term -> what it exercises
+TERMS = {
+    "kettle": "one word, ~6% of rows",
+    "prem lam": "two prefixes, ~0.5% of rows",
+    "walnut teapot": "name + description words",
+    "424242": "single product",
+}
+
+
+def _like(columns: Tuple[str, ...]) -> Callable[[sqlite3.Connection, str, int], int]:
+    where = "is_active = 1 AND (" + " OR ".join(f"{c} LIKE ?" for c in columns) + ")"
+
+    def run(conn: sqlite3.Connection, term: str, limit: int) -> int:
+        params = [f"%{term}%"] * len(columns)
+        total = conn.execute(f"SELECT COUNT(*) FROM products WHERE {where}", params).fetchone()[0]
+        conn.execute(
+            f"SELECT {_COLUMNS} FROM products WHERE {where} ORDER BY id LIMIT ?", [*params, limit]
+        ).fetchall()
+        return total
+
+    return run
+
+
+def _fts(ranked: bool) -> Callable[[sqlite3.Connection, str, int], int]:
+    where = f"is_active = 1 AND {MATCH_FILTER_SQL}"
+
+    def run(conn: sqlite3.Connection, term: str, limit: int) -> int:
+        match = build_match_query(term)
+        total = conn.execute(f"SELECT COUNT(*) FROM products WHERE {where}", [match]).fetchone()[0]
+        if ranked:
+            conn.execute(
+                f"SELECT {_COLUMNS} FROM products {RANKED_JOIN_SQL} WHERE is_active = 1 "
+                "ORDER BY fts.rank, id LIMIT ?",
+                [match, limit],
+            ).fetchall()
+        else:
+            conn.execute(
+                f"SELECT {_COLUMNS} FROM products WHERE {where} ORDER BY id LIMIT ?", [match, limit]
+            ).fetchall()
+        return total
+
+    return run
+
+
+STRATEGIES = {
+    "like name": _like(("name",)),
+    "like name+desc": _like(("name", "description")),
+    "fts": _fts(ranked=False),
+    "fts relevance": _fts(ranked=True),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per term and strategy")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_search.db")
+        started = time.perf_counter()
+        seed_products(db_path, args.rows)
+        print(f"Seeded {args.rows} products (with FTS index) in {time.perf_counter() - started:.1f}s")
+
+        conn = open_connection(db_path)
+        try:
+            for term, label in TERMS.items():
+                rows: Dict[str, Dict[str, float]] = {}
+                for name, run in STRATEGIES.items():
+                    run(conn, term, args.limit)  # warm the page cache
+                    latencies: List[float] = []
+                    total = 0
+                    loop_started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        total = run(conn, term, args.limit)
+                        latencies.append(time.perf_counter() - t0)
+                    stats = summarize(latencies, time.perf_counter() - loop_started)
+                    rows[f"{name} ({total})"] = stats
+                print_table(f"search={term!r}: {label}  [matches per strategy in parentheses]", rows)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Rows/s serialized for a ``GET /products`` page: response_model path vs fast path.
+
+"response_model" is the previous handler: a ``Product`` per row, then
+FastAPI's ``serialize_response`` (validation + dump) and ``JSONResponse``
+rendering. "fast path" is ``render_page`` (src/products/serialization.py).
+Both produce identical bytes (tests/test_serialization.py).
+
+    python -m benchmarks.bench_serialization --page-size 100 --pages 2000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks.common import CATEGORIES
+from src.products.models import PaginatedProducts, Product
+from src.products.serialization import render_page, render_page_with_models
+
+_FIELD = create_response_field(name="response", type_=PaginatedProducts)
+
+
+def _rows(n: int) -> List[Tuple]:
+    return [
+        (i, f"Portable Speaker {i}", 1000 + i * 37, i % 90, CATEGORIES[i % len(CATEGORIES)],
+         f"Handmade from walnut, synthetic product {i}", 1)
+        for i in range(1, n + 1)
+    ]
+
+
+async def _response_model(rows: List[Tuple], page: dict) -> bytes:
+    products: List[Product] = []
+    for p in rows:
+        products.append(Product(
+            id=p[0], name=p[1], price=p[2] / 100, stock=p[3], category=p[4],
+            description=p[5] if p[5] else "", is_active=bool(p[6]),
+        ))
+    content = await serialize_response(
+        field=_FIELD, response_content=PaginatedProducts(items=products, **page), is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+async def _time(render: Callable, rows: List[Tuple], page: dict, pages: int) -> float:
+    started = time.perf_counter()
+    for _ in range(pages):
+        body = render(rows, page)
+        if asyncio.iscoroutine(body):
+            body = await body
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = _rows(args.page_size)
+    page = dict(total=1_000_000, limit=args.page_size, offset=0, next_cursor="WyJpZCIsMTAwLDEwMF0")
+    strategies: Dict[str, Callable] = {
+        "response_model": _response_model,
+        "models + model_dump": lambda r, p: render_page_with_models(r, **p),
+        "fast path": lambda r, p: render_page(r, **p),
+    }
+
+    async def run() -> Dict[str, float]:
+        return {name: await _time(fn, rows, page, args.pages) for name, fn in strategies.items()}
+
+    timings = asyncio.run(run())
+    total_rows = args.page_size * args.pages
+    baseline = timings["response_model"]
+    print(f"\n{args.pages} pages of {args.page_size} rows")
+    print(f"{'':<24}{'rows/s':>14}{'us/page':>12}{'speedup':>10}")
+    for name, elapsed in timings.items():
+        print(f"{name:<24}{total_rows / elapsed:>14,.0f}{elapsed / args.pages * 1e6:>12.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Import-time profile and startup budget for the app.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter (no
+warm ``sys.modules``), sums the report into total and first-party
+(``main``/``src.*``) self time, lists the slowest modules, then times the
+lifespan startup steps against a scratch database. Exits non-zero when a
+budget is exceeded, so CI can run it as a regression check.
+
+    python -m benchmarks.bench_startup --top 15
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Budgets (milliseconds). Third-party imports (FastAPI, SQLAlchemy, pydantic) dominate the
+# total; first-party self time is what this codebase controls.
+IMPORT_TOTAL_BUDGET_MS = 3000.0
+IMPORT_FIRST_PARTY_BUDGET_MS = 400.0
+STARTUP_BUDGET_MS = 2000.0
+
+
+class ImportRow(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def import_profile(module: str = "main") -> List[ImportRow]:
+    """``-X importtime`` rows for importing ``module`` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append(ImportRow(name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarize_imports(rows: List[ImportRow]) -> Dict[str, float]:
+    first_party = [r for r in rows if r.module == "main" or r.module.split(".")[0] == "src"]
+    return {
+        "total_ms": sum(r.self_us for r in rows) / 1000,
+        "first_party_ms": sum(r.self_us for r in first_party) / 1000,
+        "modules": len(rows),
+    }
+
+
+async def _time_startup(db_path: str) -> Dict[str, float]:
+    from src.products import database as products_db
+    from src.shared import database as shared_db
+    from src.shared.startup import readiness
+
+    products_db.DATABASE_PATH = shared_db.DATABASE_PATH = db_path
+    from main import app, lifespan
+
+    started = time.perf_counter()
+    async with lifespan(app):
+        elapsed = time.perf_counter() - started
+        steps = readiness.status()["steps"]
+    return {"total_ms": elapsed * 1000, **{f"{name}_ms": seconds * 1000 for name, seconds in steps.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list (by self time)")
+    args = parser.parse_args()
+
+    rows = import_profile()
+    summary = summarize_imports(rows)
+    print(f"\nimport main: {summary['total_ms']:.0f} ms over {summary['modules']} modules, "
+          f"first-party {summary['first_party_ms']:.0f} ms")
+    print(f"{'module':<60}{'self_ms':>10}{'cumulative_ms':>15}")
+    for row in sorted(rows, key=lambda r: r.self_us, reverse=True)[:args.top]:
+        print(f"{row.module:<60}{row.self_us / 1000:>10.1f}{row.cumulative_us / 1000:>15.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        startup = asyncio.run(_time_startup(str(Path(tmp) / "bench_startup.db")))
+    print("\nlifespan startup (fresh database):")
+    for name, ms in startup.items():
+        print(f"  {name:<24}{ms:>10.1f} ms")
+
+    failures = [
+        f"{label} {value:.0f} ms > budget {budget:.0f} ms"
+        for label, value, budget in (
+            ("import total", summary["total_ms"], IMPORT_TOTAL_BUDGET_MS),
+            ("import first-party", summary["first_party_ms"], IMPORT_FIRST_PARTY_BUDGET_MS),
+            ("startup", startup["total_ms"], STARTUP_BUDGET_MS),
+        )
+        if value > budget
+    ]
+    if failures:
+        print("\nOVER BUDGET: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nwithin budget")
+
+
+if __name__ == "__main__":
+    main()
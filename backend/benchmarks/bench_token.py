@@ -0,0 +1,102 @@
+"""Per-request cost of ``verify_token``: before vs keyring vs keyring + cache.
+
+"before" reproduces the old path: ``get_settings()`` and ``get_jwt_secret()``
+(which prints a warning when the secret comes from code) on every call, then
+a full decode. "keyring" resolves keys once and picks one by ``kid``;
+"keyring + cache" also reuses verifications by token digest. Requests draw
+tokens from ``--users`` signed-in users with a Zipf-like skew, as repeat
+requests from the same sessions do. The last table times ``GET /auth/me``
+end to end (in-process ASGI) with the cache off and on.
+
+    python -m benchmarks.bench_token --requests 50000 --users 1000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import random
+import time
+from typing import Callable, Dict, List
+
+import httpx
+import jwt
+
+from benchmarks.common import print_table, summarize
+from src.shared import security
+from src.shared.config import get_jwt_secret, get_settings
+from src.shared.token_cache import TokenCache
+
+
+def _verify_before(token: str) -> Dict:
+    settings = get_settings()
+    algorithm = getattr(settings, "JWT_ALGORITHM", "HS256")
+    secret_key = get_jwt_secret()
+    return jwt.decode(token, secret_key, algorithms=[algorithm])
+
+
+def _time(tokens: List[str], verify: Callable[[str], Dict]) -> Dict[str, float]:
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for token in tokens:
+        t0 = time.perf_counter()
+        verify(token)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def _time_me(tokens: List[str]) -> Dict[str, float]:
+    from main import app
+
+    latencies: List[float] = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.perf_counter()
+        for token in tokens:
+            t0 = time.perf_counter()
+            resp = await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.text
+        return summarize(latencies, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    sessions = [security.create_token({"sub": str(i)}) for i in range(args.users)]
+    weights = [1 / (rank + 1) for rank in range(args.users)]
+    tokens = rng.choices(sessions, weights=weights, k=args.requests)
+
+    cache = security.token_cache
+    no_cache = TokenCache(max_entries=0)
+    with contextlib.redirect_stdout(io.StringIO()):  # the legacy secret warning, once per call
+        before = _time(tokens, _verify_before)
+    security.token_cache = no_cache
+    keyring = _time(tokens, security.verify_token)
+    security.token_cache = cache
+    cache.clear()
+    cached = _time(tokens, security.verify_token)
+    stats = cache.stats()
+
+    print(f"\nverify_token, {args.requests} requests over {args.users} sessions (microseconds)")
+    print(f"{'':<20}{'mean_us':>12}{'p50_us':>12}{'p99_us':>12}")
+    for label, row in (("before", before), ("keyring", keyring), ("keyring + cache", cached)):
+        print(f"{label:<20}" + "".join(f"{row[c] * 1000:>12.1f}" for c in ("mean_ms", "p50_ms", "p99_ms")))
+    print(f"cache hit ratio: {stats['hit_ratio']:.3f} ({stats['hits']} hits, {stats['misses']} misses)")
+
+    me_tokens = tokens[: min(len(tokens), 5_000)]
+    security.token_cache = no_cache
+    me_without = asyncio.run(_time_me(me_tokens))
+    security.token_cache = cache
+    cache.clear()
+    me_with = asyncio.run(_time_me(me_tokens))
+    print_table("GET /auth/me", {"keyring": me_without, "keyring + cache": me_with})
+
+
+if __name__ == "__main__":
+    main()
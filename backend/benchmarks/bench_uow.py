@@ -0,0 +1,84 @@
+"""Per-request cost of query use cases: read/write vs read-only unit of work.
+
+Each request is ``with uow: use_case(uow, ...)``, as a router would run it.
+"current" is ``SQLAlchemyUnitOfWork`` over a regular session factory
+(commits on exit); "read-only" is ``SQLAlchemyReadOnlyUnitOfWork`` over
+``create_read_only_engine`` (mode=ro pool, query_only, no autoflush, no commit).
+
+    python -m benchmarks.bench_uow --rows 10000 --requests 5000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import CATEGORIES, print_table, seed_products, summarize
+from src.products.application.dto import ListProductsFilters
+from src.products.application.use_cases.get_product import get_product
+from src.products.application.use_cases.list_products import list_products
+from src.products.infrastructure.db.session import ReadOnlySession, create_read_only_engine
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork, SQLAlchemyUnitOfWork
+from src.shared.connection_pool import PoolConfig, configure_connection
+
+
+def _time(requests: int, request: Callable[[int], None]) -> Dict[str, float]:
+    request(0)  # warm up connections and statement caches
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        request(i)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_uow.db")
+        seed_products(db_path, args.rows)
+
+        rw_engine = create_engine(f"sqlite:///{db_path}", future=True)
+        event.listen(rw_engine, "connect", lambda conn, _: configure_connection(conn, PoolConfig.from_settings()))
+        ro_engine = create_read_only_engine(db_path)
+        rw_sessions = sessionmaker(bind=rw_engine, autoflush=False)
+        ro_sessions = sessionmaker(bind=ro_engine, class_=ReadOnlySession, autoflush=False, expire_on_commit=False)
+        units = {
+            "current": lambda: SQLAlchemyUnitOfWork(rw_sessions),
+            "read-only": lambda: SQLAlchemyReadOnlyUnitOfWork(ro_sessions),
+        }
+        ids = [random.Random(i).randrange(1, args.rows + 1) for i in range(args.requests)]
+
+        for title, make_request in {
+            "get_product by id": lambda new_uow: lambda i: _get(new_uow, ids[i]),
+            "list_products, category page of 20": lambda new_uow: lambda i: _list(new_uow, CATEGORIES[i % len(CATEGORIES)]),
+        }.items():
+            rows = {name: _time(args.requests, make_request(new_uow)) for name, new_uow in units.items()}
+            print_table(f"{title} ({args.rows} rows)", rows)
+
+        rw_engine.dispose()
+        ro_engine.dispose()
+
+
+def _get(new_uow: Callable, product_id: int) -> None:
+    with new_uow() as uow:
+        get_product(uow, product_id=product_id)
+
+
+def _list(new_uow: Callable, category: str) -> None:
+    with new_uow() as uow:
+        list_products(uow, filters=ListProductsFilters(category=category), limit=20, offset=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Throughput vs worker count for the production server (``python main.py --workers N``).
+
+For each worker count, starts the supervised server on a scratch catalog of
+``--rows`` products, drives it over real TCP with ``--connections``
+keep-alive clients for ``--seconds`` (a mix of get-by-id, filtered list and
+``/health``), then stops it with SIGTERM. Throughput can only scale up to the
+number of cores left after the load generator, which shares the machine.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --connections 64 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import CATEGORIES, print_table, seed_products, summarize
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start(workers: int, port: int, cwd: str) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "main.py"), "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR), "LOG_LEVEL": "WARNING"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            # Every worker runs its own startup; wait until a burst of probes is all ready
+            if all(httpx.get(f"http://127.0.0.1:{port}/readyz").status_code == 200 for _ in range(workers * 4)):
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not become ready")
+
+
+async def _load(port: int, args: argparse.Namespace) -> Dict[str, float]:
+    latencies: List[float] = []
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + args.seconds
+
+        async def client_loop(index: int) -> None:
+            rng = random.Random(index)
+            while time.perf_counter() < deadline:
+                roll = rng.random()
+                if roll < 0.6:
+                    url = f"/products/{rng.randint(1, args.rows)}"
+                elif roll < 0.9:
+                    url = f"/products/?category={rng.choice(CATEGORIES)}&limit=20&offset={rng.randrange(0, 200, 20)}"
+                else:
+                    url = "/health"
+                t0 = time.perf_counter()
+                resp = await client.get(url)
+                latencies.append(time.perf_counter() - t0)
+                assert resp.status_code in (200, 404), (url, resp.status_code, resp.text)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(i) for i in range(args.connections)))
+        return summarize(latencies, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_products(str(Path(tmp) / "ecommerce.db"), args.rows)  # the server's default relative path
+        for workers in args.workers:
+            port = _free_port()
+            server = _start(workers, port, tmp)
+            try:
+                results[f"{workers} worker(s)"] = asyncio.run(_load(port, args))
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+
+    print_table(
+        f"{args.connections} keep-alive connections, {args.seconds:.0f}s, {args.rows} rows, "
+        f"{os.cpu_count()} CPU(s)",
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
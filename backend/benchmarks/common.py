@@ -0,0 +1,98 @@
+"""Shared helpers for backend benchmarks: catalog seeding, DB switching and latency stats."""
+
+import math
+import sqlite3
+import statistics
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+from src.products import database as products_db
+from src.shared import database as shared_db
+from src.shared.connection_pool import close_all_pools
+
+CATEGORIES = ("Electronics", "Home", "Sports", "Books", "Toys", "Garden", "Beauty", "Food")
+# Word pools for synthetic names/descriptions, so text search has realistic selectivity
+ADJECTIVES = ("Compact", "Deluxe", "Classic", "Portable", "Smart", "Premium", "Rustic", "Ultra", "Eco", "Vintage", "Pro")
+NOUNS = (
+    "Lamp", "Kettle", "Backpack", "Speaker", "Blender", "Jacket", "Notebook", "Drone",
+    "Helmet", "Candle", "Teapot", "Monitor", "Sandals", "Puzzle", "Grill", "Scarf", "Router",
+)
+MATERIALS = ("bamboo", "steel", "leather", "ceramic", "walnut", "linen", "aluminium", "glass", "cotton", "granite", "copper", "wool", "marble")
+
+
+@contextmanager
+def use_database(path: str) -> Iterator[None]:
+    """Point the legacy and shared DB modules at ``path`` for the duration of a benchmark."""
+    previous = (products_db.DATABASE_PATH, shared_db.DATABASE_PATH)
+    products_db.DATABASE_PATH = path
+    shared_db.DATABASE_PATH = path
+    try:
+        yield
+    finally:
+        close_all_pools()
+        products_db.DATABASE_PATH, shared_db.DATABASE_PATH = previous
+
+
+def seed_products(path: str, rows: int) -> None:
+    """Create the schema at ``path`` and append ``rows`` deterministic products."""
+    with use_database(path):
+        products_db.init_database()
+
+    conn = sqlite3.connect(path)
+    try:
+        category_case = _case_sql("n", CATEGORIES)
+        adjective = _case_sql("n", ADJECTIVES)
+        noun = _case_sql("n / 7", NOUNS)
+        material = _case_sql("n / 3", MATERIALS)
+        conn.execute(
+            f"""
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO products (name, price, price_cents, stock, category, description, is_active)
+            SELECT {adjective} || ' ' || {noun} || ' ' || n,
+                   1 + ((n * 7919) % 100000) / 100.0,
+                   100 + (n * 7919) % 100000,
+                   (n * 31) % 100,
+                   {category_case},
+                   'Handmade from ' || {material} || ', synthetic product ' || n,
+                   CASE WHEN n % 10 = 0 THEN 0 ELSE 1 END
+            FROM seq
+            """,
+            (rows,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _case_sql(expr: str, words: Sequence[str]) -> str:
+    """SQL picking ``words[(expr) % len(words)]``."""
+    branches = " ".join(f"WHEN {i} THEN '{word}'" for i, word in enumerate(words))
+    return f"CASE ({expr}) % {len(words)} {branches} END"
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles in milliseconds."""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    columns = ["requests", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'':<28}" + "".join(f"{c:>16}" for c in columns))
+    for label, stats in rows.items():
+        print(f"{label:<28}" + "".join(f"{stats[c]:>16.2f}" for c in columns))
@@ -0,0 +1,358 @@
+"""Reproducible benchmark suite for every product endpoint, with a JSON report.
+
+For each catalog size (default 10k, 100k and 1M products) a template
+database is seeded once with ``seed_products`` (deterministic rows; kept in
+``--db-dir`` between runs) and copied fresh for each path, so the writes of
+one run never leak into the next. Two paths are measured:
+
+- ``legacy``: HTTP requests to the app in-process (httpx ASGI transport),
+  i.e. ``src/products/api.py`` over ``products/database.py``;
+- ``uow``: the application use cases inside ``SQLAlchemyReadOnlyUnitOfWork``
+  (reads) or ``SQLAlchemyUnitOfWork`` (writes), awaited through
+  ``run_in_db`` as an async router would.
+
+Every scenario runs ``--requests`` operations from ``--concurrency``
+concurrent client tasks after a short warm-up; throughput is operations per
+wall-clock second and latencies are per operation. The catalog response
+cache is off unless ``--response-cache`` is given, so reads reach SQLite.
+Ids, filters and payloads come from fixed seeds: two runs on the same commit
+and machine issue the same requests, and their reports diff cleanly.
+
+    python -m benchmarks.suite --sizes 10000 --requests 200 --output before.json
+    python -m benchmarks.suite --db-dir /tmp/bench-dbs --output after.json
+    python -m benchmarks.suite --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import CATEGORIES, MATERIALS, NOUNS, print_table, seed_products, summarize, use_database
+from src.products.application.dto import ListProductsFilters
+from src.products.application.use_cases.create_product import create_product
+from src.products.application.use_cases.delete_product import delete_product
+from src.products.application.use_cases.get_product import get_product
+from src.products.application.use_cases.list_products import list_products
+from src.products.application.use_cases.update_product import update_product
+from src.products.cache import catalog_cache
+from src.products.infrastructure.db.session import dispose_engines
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork, SQLAlchemyUnitOfWork
+from src.shared.db_executor import run_in_db
+from src.shared.pagination import encode_cursor
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+PATHS = ("legacy", "uow")
+SEED = 20240101
+
+Operation = Callable[[int], Awaitable[None]]
+
+
+class Workload:
+    """Deterministic inputs for one catalog size; operation ``i`` always uses the same values."""
+
+    def __init__(self, rows: int, requests: int) -> None:
+        self.rows = rows
+        rng = random.Random(SEED + rows)
+        # seed_products deactivates every 10th product
+        active = [n for n in range(1, rows + 1) if n % 10]
+        self.read_ids = [rng.choice(active) for _ in range(requests)]
+        self.update_ids = [rng.choice(active) for _ in range(requests)]
+        self.delete_ids = rng.sample(active, requests)
+        self.prices = [rng.randrange(100, 90_000) for _ in range(requests)]
+
+    def category(self, i: int) -> str:
+        return CATEGORIES[i % len(CATEGORIES)]
+
+    def price_band(self, i: int) -> tuple:
+        low = self.prices[i] // 100
+        return low, low + 50
+
+    def term(self, i: int) -> str:
+        words = NOUNS + MATERIALS
+        return words[i % len(words)].lower()
+
+    @property
+    def deep_offset(self) -> int:
+        return int(self.rows * 0.9)
+
+    @property
+    def deep_cursor(self) -> str:
+        return encode_cursor("id", self.deep_offset, self.deep_offset)
+
+
+def legacy_operations(client: httpx.AsyncClient, w: Workload) -> Dict[str, Operation]:
+    async def call(method: str, url: str, expected: int = 200, **kwargs: Any) -> None:
+        resp = await client.request(method, url, **kwargs)
+        if resp.status_code != expected:
+            raise RuntimeError(f"{method} {url}: {resp.status_code} {resp.text[:200]}")
+
+    def get(params: Callable[[int], dict]) -> Operation:
+        return lambda i: call("GET", "/products/", params={"limit": 20, **params(i)})
+
+    return {
+        "list": get(lambda i: {}),
+        "list_category": get(lambda i: {"category": w.category(i)}),
+        "list_price_range": get(lambda i: dict(zip(("min_price", "max_price"), w.price_band(i)))),
+        "list_category_price_sorted": get(lambda i: {"category": w.category(i), "min_price": w.price_band(i)[0], "sort": "price"}),
+        "search": get(lambda i: {"search": w.term(i)}),
+        "search_relevance": get(lambda i: {"search": w.term(i), "sort": "relevance"}),
+        "deep_offset": get(lambda i: {"offset": w.deep_offset, "total_mode": "none"}),
+        "deep_cursor": get(lambda i: {"cursor": w.deep_cursor, "total_mode": "none"}),
+        "get_by_id": lambda i: call("GET", f"/products/{w.read_ids[i]}"),
+        "create": lambda i: call("POST", "/products/", 201, json={
+            "name": f"Bench product {i}", "price": w.prices[i] / 100, "stock": i % 50,
+            "category": w.category(i), "description": "created by the benchmark suite",
+        }),
+        "update": lambda i: call("PUT", f"/products/{w.update_ids[i]}", json={"price": w.prices[i] / 100, "stock": i % 50}),
+        "delete": lambda i: call("DELETE", f"/products/{w.delete_ids[i]}"),
+    }
+
+
+def uow_operations(w: Workload) -> Dict[str, Operation]:
+    def read(**kwargs: Any) -> Callable[[int], Any]:
+        def run(i: int) -> None:
+            with SQLAlchemyReadOnlyUnitOfWork() as uow:
+                list_products(uow, limit=20, **{k: v(i) if callable(v) else v for k, v in kwargs.items()})
+        return run
+
+    def price(cents: int) -> str:
+        return f"{cents / 100:.2f}"
+
+    def get(i: int) -> None:
+        with SQLAlchemyReadOnlyUnitOfWork() as uow:
+            if get_product(uow, product_id=w.read_ids[i]) is None:
+                raise RuntimeError(f"Product {w.read_ids[i]} not found")
+
+    def create(i: int) -> None:
+        with SQLAlchemyUnitOfWork() as uow:
+            create_product(
+                uow, name=f"Bench product {i}", price_amount=price(w.prices[i]), stock_units=i % 50,
+                category=w.category(i), description="created by the benchmark suite",
+            )
+
+    def update(i: int) -> None:
+        with SQLAlchemyUnitOfWork() as uow:
+            update_product(uow, product_id=w.update_ids[i], price_amount=price(w.prices[i]), stock_units=i % 50)
+
+    def delete(i: int) -> None:
+        with SQLAlchemyUnitOfWork() as uow:
+            delete_product(uow, product_id=w.delete_ids[i])
+
+    def band(i: int) -> ListProductsFilters:
+        low, high = w.price_band(i)
+        return ListProductsFilters(min_price=str(low), max_price=str(high))
+
+    sync_ops: Dict[str, Callable[[int], None]] = {
+        "list": read(filters=ListProductsFilters(), offset=0),
+        "list_category": read(filters=lambda i: ListProductsFilters(category=w.category(i)), offset=0),
+        "list_price_range": read(filters=band, offset=0),
+        "list_category_price_sorted": read(
+            filters=lambda i: ListProductsFilters(category=w.category(i), min_price=str(w.price_band(i)[0])),
+            offset=0, sort="price",
+        ),
+        "search": read(filters=lambda i: ListProductsFilters(search=w.term(i)), offset=0),
+        "search_relevance": read(filters=lambda i: ListProductsFilters(search=w.term(i)), offset=0, sort="relevance"),
+        "deep_offset": read(filters=ListProductsFilters(), offset=w.deep_offset, total_mode="none"),
+        "deep_cursor": read(filters=ListProductsFilters(), offset=0, cursor=w.deep_cursor, total_mode="none"),
+        "get_by_id": get,
+        "create": create,
+        "update": update,
+        "delete": delete,
+    }
+    return {name: (lambda fn: lambda i: run_in_db(fn, i))(fn) for name, fn in sync_ops.items()}
+
+
+async def measure(op: Operation, requests: int, concurrency: int, warmup: int) -> Dict[str, float]:
+    """Run ``op(0..requests-1)`` from ``concurrency`` client tasks; warm-up indices are not measured."""
+    for i in range(warmup):
+        await op(i)
+    latencies: List[float] = []
+    errors: List[str] = []
+    indices = iter(range(warmup, warmup + requests))
+
+    async def client() -> None:
+        for i in indices:  # shared: every index runs exactly once
+            started = time.perf_counter()
+            try:
+                await op(i)
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result = {key: round(value, 3) for key, value in summarize(latencies, time.perf_counter() - started).items()}
+    result["errors"] = len(errors)
+    if errors:
+        print(f"    {len(errors)} errors, first: {errors[0]}")
+    return result
+
+
+def prepare_template(db_dir: Path, rows: int) -> Path:
+    """Seeded, checkpointed catalog of ``rows`` products (reused when already present)."""
+    path = db_dir / f"catalog_{rows}.db"
+    if not path.exists():
+        started = time.perf_counter()
+        partial = path.with_suffix(".partial")
+        for leftover in db_dir.glob(partial.name + "*"):
+            leftover.unlink()
+        seed_products(str(partial), rows)
+        conn = sqlite3.connect(partial)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode = DELETE")  # a single self-contained file to copy
+        conn.close()
+        partial.rename(path)
+        print(f"  seeded {rows} products in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+async def run_path(path: str, db_path: str, w: Workload, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with use_database(db_path):
+        client: Optional[httpx.AsyncClient] = None
+        try:
+            if path == "legacy":
+                from main import app
+
+                client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+                operations = legacy_operations(client, w)
+            else:
+                operations = uow_operations(w)
+            for name, op in operations.items():
+                if args.scenarios and name not in args.scenarios:
+                    continue
+                results[name] = await measure(op, args.requests, args.concurrency, args.warmup)
+        finally:
+            if client is not None:
+                await client.aclose()
+            dispose_engines()
+    return results
+
+
+def run_suite(args: argparse.Namespace, db_dir: Path) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"meta": environment(args), "results": {}}
+    cache_enabled, catalog_cache.enabled = catalog_cache.enabled, args.response_cache
+    src_logger = logging.getLogger("src")
+    # Slow-query warnings and per-request logs would swamp the tables: still emitted, not shown
+    quiet, propagate, src_logger.propagate = logging.NullHandler(), src_logger.propagate, False
+    src_logger.addHandler(quiet)
+    try:
+        for rows in args.sizes:
+            print(f"\n== {rows} products ==")
+            template = prepare_template(db_dir, rows)
+            # Warm-up and measured operations each need their own inputs (deletes are one-shot)
+            workload = Workload(rows, args.warmup + args.requests)
+            report["results"][str(rows)] = {}
+            for path in args.paths:
+                work_db = db_dir / f"work_{rows}_{path}.db"
+                shutil.copyfile(template, work_db)
+                catalog_cache.clear()
+                results = asyncio.run(run_path(path, str(work_db), workload, args))
+                report["results"][str(rows)][path] = results
+                print_table(f"{path} path, {rows} products, concurrency {args.concurrency}", results)
+                for leftover in db_dir.glob(work_db.name + "*"):
+                    leftover.unlink()
+    finally:
+        catalog_cache.enabled = cache_enabled
+        catalog_cache.clear()
+        src_logger.removeHandler(quiet)
+        src_logger.propagate = propagate
+    return report
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    def git(*cmd: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *cmd], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": multiprocessing.cpu_count(),
+        "sizes": args.sizes,
+        "paths": args.paths,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+        "response_cache": args.response_cache,
+        "seed": SEED,
+    }
+
+
+def compare(before_path: str, after_path: str) -> None:
+    """Print throughput and latency changes between two reports."""
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+    columns = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+    print(f"{'':<44}" + "".join(f"{c:>22}" for c in columns))
+    for rows, paths in after["results"].items():
+        for path, scenarios in paths.items():
+            for scenario, new in scenarios.items():
+                old = before["results"].get(rows, {}).get(path, {}).get(scenario)
+                if old is None:
+                    continue
+                cells = []
+                for column in columns:
+                    change = (new[column] - old[column]) / old[column] * 100 if old[column] else 0.0
+                    cells.append(f"{old[column]:.1f} -> {new[column]:.1f} ({change:+.0f}%)")
+                print(f"{rows + ' ' + path + ' ' + scenario:<44}" + "".join(f"{c:>22}" for c in cells))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(",")], default=list(DEFAULT_SIZES))
+    parser.add_argument("--paths", type=lambda s: s.split(","), default=list(PATHS))
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), help="comma-separated subset (default: all)")
+    parser.add_argument("--requests", type=int, default=300, help="measured operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent client tasks")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--response-cache", action="store_true", help="keep the catalog response cache on")
+    parser.add_argument("--db-dir", help="keep seeded catalogs here between runs (default: a temporary directory)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two reports and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    unknown = set(args.paths) - set(PATHS)
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(sorted(unknown))}")
+
+    if args.db_dir:
+        db_dir = Path(args.db_dir)
+        db_dir.mkdir(parents=True, exist_ok=True)
+        report = run_suite(args, db_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_suite(args, Path(tmp))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
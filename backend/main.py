@@ -1,14 +1,104 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from src.orders.api import router as orders_router
+from src.products import api as products_api
 from src.products.api import router as products_router
-from src.shared.database import init_db
+from src.products.infrastructure.db.session import dispose_engines, get_engine, get_read_only_engine
+from src.products.cache import catalog_cache
+from src.products.totals import count_cache
+from src.shared import database as shared_database
+from src.shared import password_hasher, security
+from src.shared.connection_pool import all_pool_stats, close_all_pools, get_pool
+from src.shared.db_executor import get_db_executor
+from src.shared.health import deep_health, liveness, readiness_checks
+from src.shared.metrics import MetricsMiddleware, registry, stats_gauges
+from src.shared.query_log import query_log
+from src.shared.startup import configure_logging, readiness, run_startup
+from src.users.api import router as auth_router
+
+
+async def _init_database() -> None:
+    # Migrations and seed data, off the event loop
+    await asyncio.to_thread(shared_database.init_db)
+
+
+async def _open_pools() -> None:
+    def touch() -> None:
+        for read_only in (False, True):
+            with get_pool(shared_database.DATABASE_PATH, read_only=read_only).connection() as conn:
+                conn.execute("SELECT 1")
+        for engine in (get_engine(), get_read_only_engine()):
+            with engine.connect():
+                pass
+
+    await asyncio.to_thread(touch)
+    get_db_executor()
+
+
+async def _configure_logging() -> None:
+    configure_logging()
+
+
+async def _start_health_checks() -> None:
+    # The path is looked up on every run: tests point the app at a temporary database
+    await deep_health.start(lambda: shared_database.DATABASE_PATH)
+
+
+def _runtime_gauges():
+    # Read at scrape time from the components' own stats(); nothing is counted twice
+    for path, stats in all_pool_stats().items():
+        yield from stats_gauges("db_pool", "SQLite connection pool state", stats, {"pool": path})
+    yield from stats_gauges("db_executor", "Blocking-DB thread pool state", get_db_executor().stats())
+    yield from stats_gauges("catalog_cache", "Catalog response cache state", catalog_cache.stats())
+    yield from stats_gauges("count_cache", "Listing total cache state", count_cache.stats())
+    yield from stats_gauges("query_log", "Statement fingerprint tracking", query_log.stats())
+    yield from stats_gauges("token_cache", "Verified token cache state", security.token_cache.stats())
+    if password_hasher._hasher is not None:  # a scrape must not spawn the bcrypt pool
+        yield from stats_gauges("password_hasher", "bcrypt process pool state", password_hasher._hasher.stats())
+
+
+registry.register_collector("runtime", _runtime_gauges)
+
+# Keyed by name too: a second import of this module replaces these instead of adding more
+deep_health.add_stats("db_executor", lambda: get_db_executor().stats())
+deep_health.add_stats("catalog_cache", catalog_cache.stats)
+deep_health.add_stats("count_cache", count_cache.stats)
+deep_health.add_stats("token_cache", security.token_cache.stats)
+deep_health.add_stats("query_log", query_log.stats)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Everything that touches disk happens here, once per worker, instead of on import
+    await run_startup([
+        ("logging", _configure_logging),
+        ("database", _init_database),
+        ("pools", _open_pools),
+        ("warm_caches", products_api.warm_up),
+        ("health_checks", _start_health_checks),
+    ])
+    try:
+        yield
+    finally:
+        readiness.mark_stopping()
+        await deep_health.stop()
+        dispose_engines()
+        close_all_pools()
+        password_hasher.shutdown_password_hasher()
+
 
 # ❌ PROBLEMA: Configuración muy básica sin validación
 app = FastAPI(
     title="E-commerce Legacy API",
     description="Legacy e-commerce API that needs refactoring",
     version="0.1.0",
+    lifespan=lifespan,
     # ❌ PROBLEMA: No configuración de seguridad
 )
 
@@ -21,10 +111,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ❌ PROBLEMA: No middleware de logging, no rate limiting, no security headers
+# Request latency/status per route template for GET /metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
+# ❌ PROBLEMA: No rate limiting, no security headers
 
 # Include routers
 app.include_router(products_router)
+app.include_router(auth_router)
+app.include_router(orders_router)
 
 @app.get("/", tags=["General"])
 async def root():
@@ -40,20 +135,79 @@ async def health_check():
     """Basic health check endpoint"""
     return {"status": "ok", "message": "API is running"}
 
+@app.get("/livez", tags=["General"])
+async def livez():
+    """Liveness: constant time, no I/O."""
+    return liveness()
+
+@app.get("/readyz", tags=["General"])
+async def readyz():
+    """503 until startup has completed, and while a pool or the schema cannot serve requests."""
+    status = readiness.status()
+    if status["ready"]:
+        checks = await readiness_checks(shared_database.DATABASE_PATH)
+        status = {**status, "ready": all(check["ok"] for check in checks.values()), "checks": checks}
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.get("/health/deep", tags=["General"])
+async def health_deep():
+    """Last background check of DB latency, pool saturation, WAL size and caches (no work per request)."""
+    result = deep_health.result()
+    return JSONResponse(result, status_code=503 if result["status"] in ("failing", "unknown") else 200)
+
+@app.get("/metrics", tags=["General"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of this worker's metrics."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/queries", tags=["General"])
+async def top_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: Literal["total_time", "max_time", "calls", "rows", "slow_calls"] = "total_time",
+):
+    """This worker's statement fingerprints, most expensive first, with captured plans."""
+    return {**query_log.stats(), "queries": query_log.top(limit, order_by)}
+
+def _parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the API. --workers N selects the production supervisor.")
+    parser.add_argument("--workers", type=int, help="worker processes (production mode; 0 = CPU count)")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--backlog", type=int)
+    parser.add_argument("--keepalive", type=int, help="idle keep-alive timeout, seconds")
+    parser.add_argument("--graceful-timeout", type=int, help="drain time on shutdown, seconds")
+    parser.add_argument("--max-requests", type=int, help="recycle a worker after this many requests")
+    parser.add_argument("--max-requests-jitter", type=int)
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    # Initialize database on startup
-    print("🔧 Initializing database...")
-    init_db()
-    print("✅ Database initialized")
-    
+    import sys
+
+    import uvicorn
+
+    from src.shared.config import get_settings
+    from src.shared.server import ServerOptions, serve
+
+    args = _parse_args()
+    if args.workers is not None:
+        # Production: pre-forked, supervised workers (src/shared/server.py)
+        options = ServerOptions.from_settings().with_overrides(
+            host=args.host, port=args.port, backlog=args.backlog, keepalive=args.keepalive,
+            graceful_timeout=args.graceful_timeout, max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+        )
+        if args.workers > 0:
+            options = options.with_overrides(workers=args.workers)
+        sys.exit(serve(options))
+
+    # Database setup runs in the app lifespan
     # ❌ PROBLEMA: No configuración de production, no logging setup
     print("🚀 Starting E-commerce Legacy API...")
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # ❌ PROBLEMA: reload=True hardcodeado
-        # ❌ PROBLEMA: No configuración de workers, no SSL
+        host=args.host or "0.0.0.0",
+        port=args.port or 8000,
+        reload=get_settings().RELOAD,  # development mode; use --workers for production
     )
-
-
@@ -0,0 +1,101 @@
+"""Checkout and order endpoints (bearer token required).
+
+``POST /orders`` reserves stock for every line and records the order in one
+transaction (src/orders/application/use_cases/place_order.py). When a line
+cannot be served the whole order is refused with 409 and the shortfalls.
+"""
+
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+
+from src.shared.db_executor import run_in_db
+from src.users.api import get_token_claims
+from .application.dto import CheckoutLine
+from .application.use_cases.get_order import get_order
+from .application.use_cases.place_order import place_order
+from .domain.entities import Order as DomainOrder
+from .domain.errors import DomainError, InsufficientStock
+from .infrastructure.uow import SQLAlchemyOrderUnitOfWork
+from .models import CheckoutRequest, Order, OrderItem, StockShortfall
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+
+def get_order_uow() -> SQLAlchemyOrderUnitOfWork:
+    """Unit of work for the order endpoints (overridable via ``app.dependency_overrides``)."""
+    return SQLAlchemyOrderUnitOfWork()
+
+
+def _run_in_uow(uow: SQLAlchemyOrderUnitOfWork, use_case, **kwargs):
+    # Runs on a DB thread: the session is opened, used and closed there
+    with uow:
+        return use_case(uow, **kwargs)
+
+
+def _to_api_order(order: DomainOrder) -> Order:
+    return Order(
+        id=order.id,
+        user_id=order.user_id,
+        status=order.status,
+        total=(order.total_cents or 0) / 100,
+        items=[
+            OrderItem(
+                product_id=line.product_id,
+                quantity=line.quantity,
+                unit_price=(line.unit_price_cents or 0) / 100,
+                line_total=line.total_cents / 100,
+            )
+            for line in order.lines
+        ],
+        created_at=order.created_at,
+    )
+
+
+@router.post("", response_model=Order, status_code=201)
+async def checkout(
+    request: CheckoutRequest,
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    uow: SQLAlchemyOrderUnitOfWork = Depends(get_order_uow),
+):
+    """
+    Place an order: all lines are reserved, or none.
+
+    Repeated products are merged into one line. 409 lists each product that
+    is short (or missing) with the quantity requested and the stock left.
+    """
+    lines = [CheckoutLine(product_id=item.product_id, quantity=item.quantity) for item in request.items]
+    try:
+        order = await run_in_db(_run_in_uow, uow, place_order, user_id=int(claims["sub"]), lines=lines)
+    except InsufficientStock as e:
+        requested: Dict[int, int] = {}
+        for line in lines:
+            requested[line.product_id] = requested.get(line.product_id, 0) + line.quantity
+        shortfalls = [
+            StockShortfall(product_id=pid, requested=requested[pid], available=available).model_dump()
+            for pid, available in e.shortfalls.items()
+        ]
+        return JSONResponse({"detail": "Insufficient stock", "shortfalls": shortfalls}, status_code=409)
+    except DomainError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error placing order: {e}")
+        raise HTTPException(status_code=500, detail="Error placing order")
+    return _to_api_order(order)
+
+
+@router.get("/{order_id}", response_model=Order)
+async def read_order(
+    order_id: int,
+    claims: Dict[str, Any] = Depends(get_token_claims),
+    uow: SQLAlchemyOrderUnitOfWork = Depends(get_order_uow),
+):
+    """One of the caller's orders (404 for anyone else's)."""
+    order = await run_in_db(_run_in_uow, uow, get_order, order_id=order_id, user_id=int(claims["sub"]))
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return _to_api_order(order)
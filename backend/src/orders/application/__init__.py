@@ -0,0 +1 @@
+"""Application layer for orders: use cases, DTOs, and ports."""
@@ -0,0 +1,9 @@
+"""Application-level DTOs for inputs of order use cases."""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class CheckoutLine:
+    product_id: int
+    quantity: int
@@ -0,0 +1,49 @@
+"""Ports (interfaces) for repositories and units of work in the orders context."""
+
+from typing import Dict, List, Optional, Protocol, Sequence
+
+from ..domain.entities import Order
+
+
+class StockReservations(Protocol):
+    def reserve(self, quantities: Dict[int, int]) -> Dict[int, int]:
+        """Decrement stock for every product that is active and has enough of it.
+
+        Set-based: no product is read first. Returns ``{product_id: unit price
+        in cents}`` for the lines reserved; the others are left untouched, so
+        the caller rolls back when the result is short.
+        """
+        ...
+
+    def available(self, product_ids: Sequence[int]) -> Dict[int, int]:
+        """Stock of the active products among ``product_ids``."""
+        ...
+
+
+class OrderRepository(Protocol):
+    def add_many(self, orders: Sequence[Order]) -> List[int]:
+        """Insert orders and their lines with multi-row statements.
+
+        Sets each order's ``id`` and ``created_at``; returns the ids in input order.
+        """
+        ...
+
+    def get(self, order_id: int) -> Optional[Order]:
+        ...
+
+
+class UnitOfWork(Protocol):
+    orders: OrderRepository
+    stock: StockReservations
+
+    def __enter__(self) -> "UnitOfWork":
+        ...
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        ...
+
+    def commit(self) -> None:
+        ...
+
+    def rollback(self) -> None:
+        ...
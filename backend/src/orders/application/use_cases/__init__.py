@@ -0,0 +1 @@
+"""Use case orchestrators for the orders application layer."""
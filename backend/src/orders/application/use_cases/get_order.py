@@ -0,0 +1,14 @@
+"""Get order use case."""
+
+from typing import Optional
+
+from ..ports import UnitOfWork
+from ...domain.entities import Order
+
+
+def get_order(uow: UnitOfWork, *, order_id: int, user_id: Optional[int] = None) -> Optional[Order]:
+    """The order, or None when it does not exist or (with ``user_id``) belongs to someone else."""
+    order = uow.orders.get(order_id)
+    if order is None or (user_id is not None and order.user_id != user_id):
+        return None
+    return order
@@ -0,0 +1,31 @@
+"""Checkout: reserve stock for every line and record the order, atomically.
+
+Stock is decremented with one conditional ``UPDATE ... WHERE stock >= qty``
+for all lines; if any line cannot be reserved the unit of work rolls back
+and nothing is sold. The order and its lines are then inserted with
+multi-row statements, all in the same transaction, which the unit of work
+commits when the checkout's block exits.
+"""
+
+from typing import Optional, Sequence
+
+from ..dto import CheckoutLine
+from ..ports import UnitOfWork
+from ...domain.entities import Order
+from ...domain.errors import InsufficientStock
+
+
+def place_order(uow: UnitOfWork, *, user_id: Optional[int], lines: Sequence[CheckoutLine]) -> Order:
+    order = Order.create(user_id=user_id, lines=[(line.product_id, line.quantity) for line in lines])
+    quantities = order.quantities
+
+    prices = uow.stock.reserve(quantities)
+    if len(prices) < len(quantities):
+        missing = [pid for pid in quantities if pid not in prices]
+        available = uow.stock.available(missing)
+        # The unit of work rolls back the lines that were reserved
+        raise InsufficientStock({pid: available.get(pid) for pid in missing})
+
+    order = order.priced(prices)
+    uow.orders.add_many([order])
+    return order
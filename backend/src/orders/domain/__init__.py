@@ -0,0 +1 @@
+"""Domain layer for orders: entities and errors."""
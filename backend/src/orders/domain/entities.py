@@ -0,0 +1,59 @@
+"""Domain entities for orders.
+
+Keep this layer free of framework and persistence concerns.
+"""
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .errors import EmptyOrder, InvalidQuantity
+
+MAX_LINE_QUANTITY = 1000
+
+
+@dataclass(frozen=True)
+class OrderLine:
+    product_id: int
+    quantity: int
+    unit_price_cents: Optional[int] = None  # captured when the stock is reserved
+
+    @property
+    def total_cents(self) -> int:
+        return (self.unit_price_cents or 0) * self.quantity
+
+
+@dataclass
+class Order:
+    """Aggregate root: an order and its lines, one line per product."""
+    id: Optional[int]
+    user_id: Optional[int]
+    lines: List[OrderLine] = field(default_factory=list)
+    status: str = "placed"
+    total_cents: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    @staticmethod
+    def create(*, user_id: Optional[int], lines: Sequence[Tuple[int, int]]) -> "Order":
+        """New order from (product id, quantity) pairs; repeated products are merged."""
+        quantities: Dict[int, int] = {}
+        for product_id, quantity in lines:
+            if product_id <= 0:
+                raise InvalidQuantity(f"Invalid product id {product_id}")
+            if quantity <= 0:
+                raise InvalidQuantity(f"Quantity for product {product_id} must be positive")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+            if quantities[product_id] > MAX_LINE_QUANTITY:
+                raise InvalidQuantity(f"At most {MAX_LINE_QUANTITY} units of product {product_id} per order")
+        if not quantities:
+            raise EmptyOrder("An order needs at least one line")
+        return Order(id=None, user_id=user_id, lines=[OrderLine(pid, qty) for pid, qty in quantities.items()])
+
+    @property
+    def quantities(self) -> Dict[int, int]:
+        return {line.product_id: line.quantity for line in self.lines}
+
+    def priced(self, unit_prices: Dict[int, int]) -> "Order":
+        """Copy with each line's unit price (integer cents) and the order total."""
+        lines = [replace(line, unit_price_cents=unit_prices[line.product_id]) for line in self.lines]
+        return replace(self, lines=lines, total_cents=sum(line.total_cents for line in lines))
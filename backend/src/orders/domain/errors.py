@@ -0,0 +1,27 @@
+"""Domain-specific error types for the orders bounded context."""
+
+from typing import Dict, Optional
+
+
+class DomainError(Exception):
+    """Base error for order rule violations."""
+
+
+class EmptyOrder(DomainError):
+    pass
+
+
+class InvalidQuantity(DomainError):
+    pass
+
+
+class InsufficientStock(DomainError):
+    """Some lines could not be reserved; nothing was.
+
+    ``shortfalls`` maps each such product id to its available stock, or
+    ``None`` when the product does not exist or is inactive.
+    """
+
+    def __init__(self, shortfalls: Dict[int, Optional[int]]) -> None:
+        self.shortfalls = shortfalls
+        super().__init__(f"Insufficient stock for products {sorted(shortfalls)}")
@@ -0,0 +1 @@
+"""Infrastructure layer for orders: DB models, repositories, unit of work."""
@@ -0,0 +1 @@
+"""ORM models for orders."""
@@ -0,0 +1,30 @@
+"""ORM models for the orders context."""
+
+from datetime import datetime
+
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class OrderORM(Base):
+    __tablename__ = "orders"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int | None]
+    status: Mapped[str]
+    total_cents: Mapped[int]
+    item_count: Mapped[int]
+    created_at: Mapped[datetime | None]
+    updated_at: Mapped[datetime | None]
+
+
+class OrderItemORM(Base):
+    __tablename__ = "order_items"
+
+    order_id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(primary_key=True)
+    quantity: Mapped[int]
+    unit_price_cents: Mapped[int]
@@ -0,0 +1,41 @@
+"""Schema migrations for orders and order items.
+
+``order_items`` is keyed by (order_id, product_id), one line per product, and
+clustered on it (``WITHOUT ROWID``), so an order's lines are one range read.
+``idx_order_items_product`` serves "orders containing this product" and the
+foreign key check when a product is deleted. Unit prices are integer cents
+captured at checkout.
+"""
+
+from src.shared.migrations import Migration
+
+MIGRATIONS = [
+    Migration(
+        version="orders_0001",
+        description="Create orders and order_items tables",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER REFERENCES users(id),
+                status TEXT NOT NULL DEFAULT 'placed',
+                total_cents INTEGER NOT NULL,
+                item_count INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_orders_user_id ON orders(user_id, id)",
+            """
+            CREATE TABLE IF NOT EXISTS order_items (
+                order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+                product_id INTEGER NOT NULL REFERENCES products(id),
+                quantity INTEGER NOT NULL CHECK (quantity > 0),
+                unit_price_cents INTEGER NOT NULL,
+                PRIMARY KEY (order_id, product_id)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items(product_id)",
+        ],
+    ),
+]
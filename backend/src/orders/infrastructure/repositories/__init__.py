@@ -0,0 +1 @@
+"""Repository implementations for the orders context."""
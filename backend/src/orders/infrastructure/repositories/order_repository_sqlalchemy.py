@@ -0,0 +1,115 @@
+"""SQLAlchemy implementations of the OrderRepository and StockReservations ports."""
+
+from typing import Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from src.shared.metrics import timed_methods
+
+from ...application.ports import OrderRepository, StockReservations
+from ...domain.entities import Order, OrderLine
+from ..db.models import OrderItemORM, OrderORM
+
+# One statement for every line: products that are inactive or short are simply not
+# matched (and not returned), so there is no read-modify-write window between checkouts.
+# It must start with UPDATE (not WITH): sqlite3 only opens its implicit transaction
+# before statements it recognizes as DML, and a rollback has to undo the reservation.
+_RESERVE_SQL = """
+    UPDATE products
+    SET stock = products.stock - lines.column2, updated_at = CURRENT_TIMESTAMP
+    FROM (VALUES {rows}) AS lines
+    WHERE products.id = lines.column1 AND products.is_active = 1 AND products.stock >= lines.column2
+    RETURNING products.id, products.price_cents
+"""
+
+
+def _chunks(items: Sequence, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@timed_methods("stock_reservations")
+class SQLAlchemyStockReservations(StockReservations):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        # Products whose stock changed since the unit of work last committed or rolled back
+        self.changed_ids: Set[int] = set()
+
+    def reserve(self, quantities: Dict[int, int]) -> Dict[int, int]:
+        reserved: Dict[int, int] = {}
+        connection = self.session.connection()
+        # 2 parameters per line: 500-line statements
+        for chunk in _chunks(list(quantities.items()), 500):
+            sql = _RESERVE_SQL.format(rows=", ".join("(?, ?)" for _ in chunk))
+            params = tuple(value for line in chunk for value in line)
+            reserved.update((int(pid), int(cents)) for pid, cents in connection.exec_driver_sql(sql, params))
+        self.changed_ids.update(reserved)
+        return reserved
+
+    def available(self, product_ids: Sequence[int]) -> Dict[int, int]:
+        connection = self.session.connection()
+        found: Dict[int, int] = {}
+        for chunk in _chunks(list(product_ids), 500):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = connection.exec_driver_sql(
+                f"SELECT id, stock FROM products WHERE id IN ({placeholders}) AND is_active = 1", tuple(chunk)
+            )
+            found.update((int(pid), int(stock)) for pid, stock in rows)
+        return found
+
+
+@timed_methods("order_repository")
+class SQLAlchemyOrderRepository(OrderRepository):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def add_many(self, orders: Sequence[Order]) -> List[int]:
+        new_ids: List[int] = []
+        # 4 parameters per row in both tables: 1000-row INSERT ... VALUES (...), (...) statements
+        for chunk in _chunks(orders, 1000):
+            rows = [
+                {"user_id": o.user_id, "status": o.status, "total_cents": o.total_cents, "item_count": len(o.lines)}
+                for o in chunk
+            ]
+            table = OrderORM.__table__
+            stmt = insert(table).values(rows).returning(table.c.id, table.c.created_at)
+            # AUTOINCREMENT hands out increasing ids in VALUES order, so sorted ids match input order
+            for order, (new_id, created_at) in zip(chunk, sorted(self.session.execute(stmt).all())):
+                order.id, order.created_at = int(new_id), created_at
+                new_ids.append(order.id)
+
+        items = [
+            {
+                "order_id": order_id,
+                "product_id": line.product_id,
+                "quantity": line.quantity,
+                "unit_price_cents": line.unit_price_cents,
+            }
+            for order_id, order in zip(new_ids, orders)
+            for line in order.lines
+        ]
+        for chunk in _chunks(items, 1000):
+            self.session.execute(insert(OrderItemORM.__table__).values(chunk))
+        return new_ids
+
+    def get(self, order_id: int) -> Optional[Order]:
+        orders = OrderORM.__table__.c
+        row = self.session.execute(
+            select(orders.id, orders.user_id, orders.status, orders.total_cents, orders.created_at)
+            .where(orders.id == order_id)
+        ).first()
+        if row is None:
+            return None
+        items = OrderItemORM.__table__.c
+        lines = self.session.execute(
+            select(items.product_id, items.quantity, items.unit_price_cents).where(items.order_id == order_id)
+        ).all()
+        return Order(
+            id=row.id,
+            user_id=row.user_id,
+            status=row.status,
+            total_cents=row.total_cents,
+            created_at=row.created_at,
+            lines=[OrderLine(line.product_id, line.quantity, line.unit_price_cents) for line in lines],
+        )
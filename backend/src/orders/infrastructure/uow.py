@@ -0,0 +1,59 @@
+"""SQLAlchemy-based Unit of Work for orders.
+
+Shares the products engine (one SQLite database): a checkout's stock
+reservation and order rows commit or roll back together. Product pages show
+stock, so after a commit ``after_commit`` gets the products whose stock
+changed (by default their cached responses are dropped).
+"""
+
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from src.products.cache import invalidate_products
+from src.products.infrastructure.db.session import SessionLocal
+
+from ..application.ports import UnitOfWork
+from .repositories.order_repository_sqlalchemy import SQLAlchemyOrderRepository, SQLAlchemyStockReservations
+
+
+class SQLAlchemyOrderUnitOfWork(UnitOfWork):
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        after_commit: Callable[..., None] = invalidate_products,
+    ) -> None:
+        self._session_factory = session_factory or SessionLocal
+        self._after_commit = after_commit
+        self._session: Optional[Session] = None
+        self.orders = None  # type: ignore[assignment]
+        self.stock = None  # type: ignore[assignment]
+
+    def __enter__(self) -> "SQLAlchemyOrderUnitOfWork":
+        self._session = self._session_factory()
+        self.orders = SQLAlchemyOrderRepository(self._session)
+        self.stock = SQLAlchemyStockReservations(self._session)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc:
+                self.rollback()
+            else:
+                self.commit()
+        finally:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def commit(self) -> None:
+        if self._session is not None:
+            self._session.commit()
+            changed, self.stock.changed_ids = self.stock.changed_ids, set()
+            if changed:
+                self._after_commit(*changed)
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+            self.stock.changed_ids = set()
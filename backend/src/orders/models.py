@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .domain.entities import MAX_LINE_QUANTITY
+
+CHECKOUT_MAX_LINES = 100
+
+
+class CheckoutItem(BaseModel):
+    product_id: int = Field(..., gt=0)
+    quantity: int = Field(..., gt=0, le=MAX_LINE_QUANTITY)
+
+
+class CheckoutRequest(BaseModel):
+    items: List[CheckoutItem] = Field(..., min_length=1, max_length=CHECKOUT_MAX_LINES)
+
+
+class OrderItem(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: float
+    line_total: float
+
+
+class Order(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    status: str
+    total: float
+    items: List[OrderItem]
+    created_at: Optional[datetime] = None
+
+
+class StockShortfall(BaseModel):
+    product_id: int
+    requested: int
+    available: Optional[int] = None  # None: no such active product
@@ -1,97 +1,478 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
 import logging
-from .models import Product, PaginatedProducts
+import os
+import shutil
+import sqlite3
+import tempfile
+from .models import (
+    Product,
+    PaginatedProducts,
+    BulkCreateRequest,
+    BulkUpdateRequest,
+    BulkDeleteRequest,
+    BulkItemResult,
+    BulkOperationResult,
+    ProductLookupRequest,
+    ProductLookupResult,
+)
 from .database import (
     get_products_from_db, 
-    get_count_from_db,
+    get_total_from_db,
     create_product_in_db, 
     get_product_by_id, 
     update_product_in_db, 
     delete_product_from_db
 )
+from src.shared.config import get_settings
+from src.shared.batch_loader import BatchLoader
+from src.shared.db_executor import run_in_db
+from src.shared.pagination import InvalidCursor, decode_cursor, encode_cursor
+from . import database as products_database
+from .cache import (
+    CATALOG_NAMESPACE,
+    LIST_NAMESPACE,
+    catalog_cache,
+    invalidate_catalog,
+    invalidate_products,
+    item_key,
+    item_namespace,
+    list_key,
+)
+from .export import MEDIA_TYPES, stream_export
+from .importer import get_import_jobs
+from .serialization import render_page, render_page_with_models
+from .search import MATCH_FILTER_SQL, RANKED_JOIN_SQL, build_match_query
+from .domain.value_objects import MAX_STORED_INTEGER, cents_at_least, cents_at_most
+from .application.dto import NewProduct, ProductChanges
+from .application.use_cases.bulk_products import (
+    bulk_create_products,
+    bulk_delete_products,
+    bulk_update_products,
+)
+from .application.use_cases.get_product import get_products as get_products_by_ids
+from .domain.entities import Product as DomainProduct
+from .infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork, SQLAlchemyUnitOfWork
 
-# ❌ PROBLEMA: Logging básico sin configuración
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once at startup (main.py lifespan), not on import
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# sort option -> (ORDER BY clause, keyset comparison on (sort key, id), sort key column index)
+_SORTS = {
+    "id": ("id", "id > ?", 0),
+    "price": ("price_cents, id", "(price_cents, id) > (?, ?)", 2),
+    "-price": ("price_cents DESC, id DESC", "(price_cents, id) < (?, ?)", 2),
+    # BM25 scores move as the catalog changes, so relevance cursors carry the next offset
+    "relevance": ("fts.rank, id", None, None),
+}
+
+def _filter_clauses(
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    search: Optional[str],
+    match_query: Optional[str],
+) -> Tuple[List[str], List]:
+    """Parameterized WHERE clauses shared by the listing, its total and the export."""
+    clauses = ["is_active = 1"]
+    params: List = []
+
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+
+    # Prices are integer cents: compare against the tightest whole-cent bounds
+    if min_price is not None:
+        clauses.append("price_cents >= ?")
+        params.append(cents_at_least(min_price))
+
+    if max_price is not None:
+        clauses.append("price_cents <= ?")
+        params.append(cents_at_most(max_price))
+
+    if match_query is not None:
+        clauses.append(MATCH_FILTER_SQL)
+        params.append(match_query)
+    elif search:
+        # Nothing FTS can tokenize (e.g. only punctuation): plain substring on the name
+        clauses.append("name LIKE ?")
+        params.append(f"%{search}%")
+
+    return clauses, params
+
 # ❌ PROBLEMA: Lógica de negocio mezclada con presentación
 @router.get("/", response_model=PaginatedProducts)
 async def get_products(
     category: Optional[str] = Query(None, description="Filter by category"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
-    search: Optional[str] = Query(None, description="Search in product name"),
+    search: Optional[str] = Query(None, description="Full-text search in name, description and category (prefix match)"),
     limit: int = Query(20, ge=1, le=100, description="Number of products to return"),
-    offset: int = Query(0, ge=0, description="Number of products to skip")
+    offset: int = Query(0, ge=0, description="Number of products to skip"),
+    sort: str = Query("id", pattern="^(id|price|-price|relevance)$", description="Sort order: id, price, -price or relevance (with search)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page (keyset pagination)"),
+    total_mode: str = Query("exact", pattern="^(exact|estimate|none)$", description="How to compute total: exact, estimate or none")
 ):
     """
     Get all products with optional filters.
+
+    Pages either by ``offset`` (legacy) or by ``cursor``: every response
+    carries ``next_cursor``, which encodes the last (sort key, id) so the
+    next page is an index seek instead of scanning ``offset`` rows.
+    ``total_mode`` trades accuracy of ``total`` for cost (src/products/totals.py).
+    ``search`` goes through the FTS5 index (src/products/search.py);
+    ``sort=relevance`` orders matches by BM25 rank.
     
     ❌ PROBLEMA: Business logic in controller
     ❌ PROBLEMA: SQL injection vulnerabilities
     ❌ PROBLEMA: No error handling consistency
     """
-    try:
-        # Build safe, parameterized filters once to reuse for count and select
-        where_clauses = ["is_active = 1"]
-        filter_params: List = []
+    filters = {"category": category, "min_price": min_price, "max_price": max_price, "search": search}
+    key = list_key(
+        products_database.DATABASE_PATH, filters,
+        limit=limit, offset=offset, sort=sort, cursor=cursor, total_mode=total_mode,
+    )
+    # The cache keeps rendered JSON, so a hit costs no serialization at all
+    body = await catalog_cache.get_or_load(
+        key,
+        (CATALOG_NAMESPACE, LIST_NAMESPACE),
+        lambda: _get_products_page(category, min_price, max_price, search, limit, offset, sort, cursor, total_mode),
+    )
+    return Response(content=body, media_type="application/json")
 
-        if category:
-            where_clauses.append("category = ?")
-            filter_params.append(category)
 
-        if min_price is not None:
-            where_clauses.append("price >= ?")
-            filter_params.append(min_price)
+def _decode_page_cursor(cursor: str, sort: str) -> Tuple[int, int]:
+    """(sort key, id) from ``cursor``: whole cents for price sorts, an offset for relevance."""
+    if sort not in ("price", "-price"):
+        after = decode_cursor(cursor, sort=sort)
+        if sort == "relevance" and after[0] < 0:
+            raise InvalidCursor("Malformed cursor")
+        return after
+    key, last_id = decode_cursor(cursor, sort=sort, key_type=(int, float))
+    if isinstance(key, float):
+        # Cursor issued when keys were REAL prices
+        if not abs(key) < MAX_STORED_INTEGER / 100:
+            raise InvalidCursor("Malformed cursor")
+        key = round(key * 100)
+    return key, last_id
 
-        if max_price is not None:
-            where_clauses.append("price <= ?")
-            filter_params.append(max_price)
 
-        if search:
-            where_clauses.append("name LIKE ?")
-            filter_params.append(f"%{search}%")
+async def _get_products_page(
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    search: Optional[str],
+    limit: int,
+    offset: int,
+    sort: str,
+    cursor: Optional[str],
+    total_mode: str,
+) -> bytes:
+    """Uncached body of ``get_products``: the page as JSON bytes (src/products/serialization.py)."""
+    order_by, keyset_sql, sort_column = _SORTS[sort]
+    after = None
+    if cursor is not None:
+        if offset:
+            raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+        try:
+            after = _decode_page_cursor(cursor, sort)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if sort == "relevance":
+            offset, after = after[0], None
+    match_query = build_match_query(search) if search else None
+    if sort == "relevance" and match_query is None:
+        order_by = "id"
 
+    try:
+        # Build safe, parameterized filters once to reuse for count and select
+        where_clauses, filter_params = _filter_clauses(category, min_price, max_price, search, match_query)
         where_sql = " AND ".join(where_clauses)
 
-        # Total count (without pagination)
-        count_query = f"SELECT COUNT(*) FROM products WHERE {where_sql}"
-        total = get_count_from_db(count_query, filter_params)
+        from_sql = "products"
+        page_where_sql, page_params = where_sql, list(filter_params)
+        if match_query is not None and sort == "relevance":
+            # The ranked join does the matching for the page; the count keeps the plain filter
+            base_clauses, base_params = _filter_clauses(category, min_price, max_price, None, None)
+            from_sql = f"products {RANKED_JOIN_SQL}"
+            page_where_sql = " AND ".join(base_clauses)
+            page_params = [match_query, *base_params]
+
+        # Total (without pagination), from counters/cache where possible
+        filters = {"category": category, "min_price": min_price, "max_price": max_price, "search": search}
+        total = await run_in_db(get_total_from_db, filters, where_sql, filter_params, total_mode)
+
+        # Select page (with pagination); one extra row tells us whether there is a next page
+        if after is not None:
+            key, last_id = after
+            page_where_sql += f" AND {keyset_sql}"
+            page_params.extend([last_id] if sort == "id" else [key, last_id])
 
-        # Select page (with pagination)
         select_query = (
-            "SELECT id, name, price, stock, category, description, is_active "
-            "FROM products "
-            f"WHERE {where_sql} "
-            "ORDER BY id "
+            "SELECT id, name, price_cents, stock, category, description, is_active "
+            f"FROM {from_sql} "
+            f"WHERE {page_where_sql} "
+            f"ORDER BY {order_by} "
             "LIMIT ? OFFSET ?"
         )
 
-        select_params = [*filter_params, limit, offset]
-        products_data = get_products_from_db(select_query, select_params)
+        select_params = [*page_params, limit + 1, 0 if after is not None else offset]
+        products_data = await run_in_db(get_products_from_db, select_query, select_params)
 
-        products: List[Product] = []
-        for p in products_data:
-            product = Product(
-                id=p[0],
-                name=p[1],
-                price=p[2],
-                stock=p[3],
-                category=p[4],
-                description=p[5] if p[5] else "",
-                is_active=bool(p[6])
-            )
-            products.append(product)
+        next_cursor = None
+        if len(products_data) > limit:
+            products_data = products_data[:limit]
+            last = products_data[-1]
+            if sort == "relevance":
+                next_cursor = encode_cursor(sort, offset + limit, last[0])
+            else:
+                next_cursor = encode_cursor(sort, last[sort_column], last[0])
 
-        return PaginatedProducts(items=products, total=total, limit=limit, offset=offset)
+        page = dict(total=total, limit=limit, offset=offset, next_cursor=next_cursor)
+        body = render_page(products_data, **page)
+        if body is None:
+            # A row the fast path cannot vouch for: validate through the models as before
+            body = render_page_with_models(products_data, **page)
+        return body
 
     except Exception as e:
         logger.error(f"Error getting products: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def warm_up() -> None:
+    """Startup warm-up: render and cache the default first page (totals, statements, serializers)."""
+    await get_products(
+        category=None, min_price=None, max_price=None, search=None,
+        limit=20, offset=0, sort="id", cursor=None, total_mode="exact",
+    )
+    Product(id=1, name="warm-up", price=1.0, stock=0, category="warm-up").model_dump_json()
+
+
+def get_uow() -> SQLAlchemyUnitOfWork:
+    """Unit of work for the bulk endpoints (overridable via ``app.dependency_overrides``)."""
+    return SQLAlchemyUnitOfWork()
+
+
+def _run_in_uow(uow: SQLAlchemyUnitOfWork, use_case, **kwargs):
+    # Runs on a DB thread: the session is opened, used and closed there
+    with uow:
+        return use_case(uow, **kwargs)
+
+
+def _bulk_response(results) -> BulkOperationResult:
+    items = [BulkItemResult(index=r.index, id=r.id, ok=r.ok, error=r.error) for r in results]
+    succeeded = sum(1 for r in items if r.ok)
+    return BulkOperationResult(results=items, succeeded=succeeded, failed=len(items) - succeeded)
+
+
+def get_read_uow_factory() -> Callable[[], SQLAlchemyReadOnlyUnitOfWork]:
+    """Factory of read-only units of work (overridable via ``app.dependency_overrides``)."""
+    return SQLAlchemyReadOnlyUnitOfWork
+
+
+def get_product_loader(
+    new_uow: Callable[[], SQLAlchemyReadOnlyUnitOfWork] = Depends(get_read_uow_factory),
+) -> BatchLoader[int, DomainProduct]:
+    """Per-request loader: concurrent ``load(id)`` calls become one ``IN (...)`` query."""
+
+    async def batch_load(ids: List[int]) -> Dict[int, DomainProduct]:
+        return await run_in_db(_run_in_uow, new_uow(), get_products_by_ids, product_ids=ids)
+
+    return BatchLoader(batch_load)
+
+
+def _to_api_product(product: DomainProduct) -> Product:
+    return Product(
+        id=product.id,
+        name=product.name,
+        price=float(product.price_amount),
+        stock=product.stock_units,
+        category=product.category,
+        description=product.description or "",
+        is_active=product.is_active,
+    )
+
+
+@router.post("/lookup", response_model=ProductLookupResult)
+async def lookup_products(
+    request: ProductLookupRequest,
+    loader: BatchLoader[int, DomainProduct] = Depends(get_product_loader),
+):
+    """
+    Products for a list of ids in one round trip, in request order.
+
+    Ids that do not exist or are inactive (404 on ``GET /{product_id}``)
+    are reported in ``missing``.
+    """
+    ids = list(dict.fromkeys(request.ids))
+    try:
+        found = await loader.load_many(ids)
+    except Exception as e:
+        logger.error(f"Error looking up {len(ids)} products: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    items: List[Product] = []
+    missing: List[int] = []
+    for product_id, product in zip(ids, found):
+        if product is None or not product.is_active:
+            missing.append(product_id)
+        else:
+            items.append(_to_api_product(product))
+    return ProductLookupResult(items=items, missing=missing)
+
+
+# Declared before the /{product_id} routes so "bulk" is not parsed as an id
+@router.post("/bulk", response_model=BulkOperationResult)
+async def bulk_create(request: BulkCreateRequest, uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    """
+    Create many products in one transaction.
+
+    Every item is validated on its own; invalid items are reported in
+    ``results`` and the rest are still created.
+    """
+    items = [
+        NewProduct(
+            name=item.name,
+            price_amount=str(item.price),
+            stock_units=item.stock,
+            category=item.category,
+            description=item.description,
+        )
+        for item in request.items
+    ]
+    try:
+        results = await run_in_db(_run_in_uow, uow, bulk_create_products, items=items)
+    except Exception as e:
+        logger.error(f"Error in bulk create: {e}")
+        raise HTTPException(status_code=500, detail="Error creating products")
+    return _bulk_response(results)
+
+
+@router.patch("/bulk", response_model=BulkOperationResult)
+async def bulk_update(request: BulkUpdateRequest, uow: SQLAlchemyUnitOfWork = Depends(get_uow)):
+    """Partially update many products in one transaction (only the fields sent change)."""
+    items = [
+        ProductChanges(
+            product_id=item.id,
+            name=item.name,
+            price_amount=None if item.price is None else str(item.price),
+            stock_units=item.stock,
+            category=item.category,
+            description=item.description,
+            is_active=item.is_active,
+        )
+        for item in request.items
+    ]
+    try:
+        results = await run_in_db(_run_in_uow, uow, bulk_update_products, items=items)
+    except Exception as e:
+        logger.error(f"Error in bulk update: {e}")
+        raise HTTPException(status_code=500, detail="Error updating products")
+    return _bulk_response(results)
+
+
+@router.delete("/bulk", response_model=BulkOperationResult)
+async def bulk_delete(
+    request: BulkDeleteRequest,
+    hard: bool = Query(False, description="Remove rows instead of deactivating them"),
+    uow: SQLAlchemyUnitOfWork = Depends(get_uow),
+):
+    """Delete (by default deactivate) many products in one transaction."""
+    try:
+        results = await run_in_db(
+            _run_in_uow, uow, bulk_delete_products, product_ids=request.ids, soft=not hard
+        )
+    except IntegrityError:
+        # order_items references some of the products: nothing was deleted, deactivate instead
+        raise HTTPException(status_code=409, detail="Some products have orders; deactivate them instead")
+    except Exception as e:
+        logger.error(f"Error in bulk delete: {e}")
+        raise HTTPException(status_code=500, detail="Error deleting products")
+    return _bulk_response(results)
+
+@router.get("/export")
+async def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    search: Optional[str] = Query(None, description="Full-text search in name, description and category (prefix match)"),
+):
+    """
+    Stream every active product matching the listing filters, ordered by id.
+
+    Rows are read from one cursor in ``EXPORT_BATCH_SIZE`` batches, so memory
+    stays flat however large the catalog is (src/products/export.py).
+    """
+    match_query = build_match_query(search) if search else None
+    clauses, params = _filter_clauses(category, min_price, max_price, search, match_query)
+    return StreamingResponse(
+        stream_export(format, " AND ".join(clauses), params, get_settings().EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+def _resolve_import_path(path: str) -> str:
+    """Absolute path of ``path`` if it lies inside IMPORT_DIRECTORY, else 400."""
+    root = os.path.realpath(get_settings().IMPORT_DIRECTORY)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root or not os.path.isfile(resolved):
+        raise HTTPException(status_code=400, detail="path must name a file inside the import directory")
+    return resolved
+
+
+def _spool_upload(upload: UploadFile, suffix: str) -> str:
+    with tempfile.NamedTemporaryFile("wb", suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(upload.file, tmp, 1024 * 1024)
+        return tmp.name
+
+
+@router.post("/import", status_code=202)
+async def start_import(
+    format: str = Form(..., pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    file: Optional[UploadFile] = File(None, description="Upload to import"),
+    path: Optional[str] = Form(None, description="Or a file inside IMPORT_DIRECTORY on the server"),
+    defer_indexes: bool = Form(False, description="Drop secondary indexes/FTS during the load, rebuild at the end"),
+):
+    """
+    Start a background import of a CSV or NDJSON catalog (src/products/importer.py).
+
+    Returns a job id at once; poll ``GET /products/import/{job_id}`` for
+    progress, throughput and rejected rows.
+    """
+    if (file is None) == (path is None):
+        raise HTTPException(status_code=400, detail="Send exactly one of file or path")
+    if file is not None:
+        source_path = await asyncio.to_thread(_spool_upload, file, f".{format}")
+    else:
+        source_path = _resolve_import_path(path)
+
+    settings = get_settings()
+    job_id = get_import_jobs().submit(
+        source_path,
+        format,
+        database=products_database.DATABASE_PATH,
+        delete_after=file is not None,
+        on_complete=lambda stats: invalidate_catalog(),
+        chunk_size=settings.IMPORT_CHUNK_SIZE,
+        transaction_rows=settings.IMPORT_TRANSACTION_ROWS,
+        defer_indexes=defer_indexes,
+    )
+    return {"job_id": job_id, "status_url": f"/products/import/{job_id}"}
+
+
+@router.get("/import/{job_id}")
+async def get_import_status(job_id: str):
+    """Progress of a background import: status, rows read/imported/rejected, rows/s."""
+    stats = get_import_jobs().get(job_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return {"job_id": job_id, **stats.as_dict()}
+
 @router.get("/{product_id}", response_model=Product)
 async def get_product(product_id: int):
     """
@@ -100,13 +481,22 @@ async def get_product(product_id: int):
     ❌ PROBLEMA: No validación de input
     ❌ PROBLEMA: SQL injection vulnerability
     """
+    return await catalog_cache.get_or_load(
+        item_key(products_database.DATABASE_PATH, product_id),
+        (CATALOG_NAMESPACE, item_namespace(product_id)),
+        lambda: _get_product(product_id),
+    )
+
+
+async def _get_product(product_id: int) -> Product:
+    """Uncached body of ``get_product``."""
     try:
         if product_id <= 0:  # ❌ PROBLEMA: Validación básica en controller
             raise HTTPException(status_code=400, detail="Invalid product ID")
         
         # ❌ PROBLEMA: SQL directo vulnerable
         query = f"SELECT * FROM products WHERE id = {product_id} AND is_active = 1"
-        product_data = get_product_by_id(query)
+        product_data = await run_in_db(get_product_by_id, query)
         
         if not product_data:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -168,7 +558,8 @@ async def create_product(product_data: dict):  # ❌ PROBLEMA: dict en vez de Py
         
         logger.info(f"Creating product with query: {query}")  # ❌ Logging sensitive data
         
-        product_id = create_product_in_db(query)
+        product_id = await run_in_db(create_product_in_db, query)
+        invalidate_products(product_id)
         
         return {
             "message": "Product created successfully",
@@ -227,7 +618,8 @@ async def update_product(product_id: int, product_data: dict):
         
         logger.info(f"Updating product with query: {query}")
         
-        rows_affected = update_product_in_db(query)
+        rows_affected = await run_in_db(update_product_in_db, query)
+        invalidate_products(product_id)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -259,7 +651,8 @@ async def delete_product(product_id: int):
         # ❌ PROBLEMA: Hard delete en vez de soft delete
         query = f"DELETE FROM products WHERE id = {product_id}"  # ❌ SQL injection
         
-        rows_affected = delete_product_from_db(query)
+        rows_affected = await run_in_db(delete_product_from_db, query)
+        invalidate_products(product_id)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -271,12 +664,14 @@ async def delete_product(product_id: int):
         
     except HTTPException:
         raise
+    except sqlite3.IntegrityError:
+        # order_items references the product (foreign key): keep it, deactivate instead
+        raise HTTPException(status_code=409, detail="Product has orders; deactivate it instead")
     except Exception as e:
         logger.error(f"Error deleting product {product_id}: {e}")
         raise HTTPException(status_code=500, detail="Error deleting product")
 
 # ❌ PROBLEMA: No endpoints para:
-# - Bulk operations
 # - Stock management
 # - Category management
 # - Product images
@@ -1,7 +1,7 @@
 """Application-level DTOs for inputs and outputs of product use cases."""
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from ..domain.entities import Product
 
@@ -17,11 +17,40 @@ class ListProductsFilters:
 @dataclass
 class Page:
     items: List[Product]
-    total: int
+    total: int | None
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
+@dataclass
+class NewProduct:
+    name: str
+    price_amount: str
+    stock_units: int
+    category: str
+    description: str | None = None
 
 
+@dataclass
+class ProductChanges:
+    """Partial update for one product; ``None`` fields are left unchanged."""
+    product_id: int
+    name: str | None = None
+    price_amount: str | None = None
+    stock_units: int | None = None
+    category: str | None = None
+    description: str | None = None
+    is_active: bool | None = None
 
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item of a bulk operation, by its position in the request."""
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
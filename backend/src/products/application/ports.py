@@ -1,12 +1,29 @@
 """Ports (interfaces) for repositories and units of work in the products context."""
 
-from typing import Protocol, Optional, List, Any
+from typing import Protocol, Optional, List, Any, Dict, Sequence, Tuple
 
 from ..domain.entities import Product
 
 
 class ProductRepository(Protocol):
-    def list(self, *, filters: dict, limit: int, offset: int) -> tuple[List[Product], int]:
+    def list(
+        self,
+        *,
+        filters: dict,
+        limit: int,
+        offset: int,
+        sort: str = "id",
+        after: Optional[Tuple[Any, int]] = None,
+        total_mode: str = "exact",
+    ) -> tuple[List[Product], Optional[int]]:
+        """Return (page items, total matching filters).
+
+        ``after`` is the (sort key, id) of the previous page's last row; when
+        given, the page starts right after it (keyset pagination).
+        ``total_mode`` is exact, estimate or none (total is then None).
+        ``filters["search"]`` is a full-text prefix search over name,
+        description and category; ``sort="relevance"`` orders by its rank.
+        """
         ...
 
     def get_by_id(self, product_id: int) -> Optional[Product]:
@@ -21,6 +38,21 @@ class ProductRepository(Protocol):
     def delete(self, product_id: int, *, soft: bool = True) -> None:
         ...
 
+    def get_many(self, product_ids: Sequence[int]) -> Dict[int, Product]:
+        """Products by id; ids that do not exist are missing from the result."""
+        ...
+
+    def create_many(self, products: Sequence[Product]) -> List[int]:
+        """Insert all products with multi-row statements; ids in input order."""
+        ...
+
+    def update_many(self, products: Sequence[Product]) -> None:
+        ...
+
+    def delete_many(self, product_ids: Sequence[int], *, soft: bool = True) -> List[int]:
+        """Delete (or deactivate) products; returns the ids that existed."""
+        ...
+
 
 class UnitOfWork(Protocol):
     products: ProductRepository
@@ -0,0 +1,88 @@
+"""Bulk create/update/delete use cases.
+
+Each item is validated on its own through the domain (``Product.create`` /
+``with_updates``); invalid items are reported and skipped, the valid ones
+are written with batched statements and committed in one transaction.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from ..dto import BulkItemResult, NewProduct, ProductChanges
+from ..ports import UnitOfWork
+from ...domain.entities import Product
+from ...domain.errors import DomainError
+from ...domain.value_objects import MAX_STORED_INTEGER, parse_cents
+
+
+def _check_storable(price_amount: Optional[str], stock_units: Optional[int]) -> None:
+    """ValueError for amounts the domain accepts but an INTEGER column cannot hold."""
+    if price_amount is not None and parse_cents(price_amount) > MAX_STORED_INTEGER:
+        raise ValueError("Price is too large")
+    if stock_units is not None and stock_units > MAX_STORED_INTEGER:
+        raise ValueError("Stock is too large")
+
+
+def bulk_create_products(uow: UnitOfWork, *, items: Sequence[NewProduct]) -> List[BulkItemResult]:
+    results = [BulkItemResult(index=i) for i in range(len(items))]
+    valid: List[int] = []
+    products: List[Product] = []
+    for i, item in enumerate(items):
+        try:
+            product = Product.create(
+                name=item.name,
+                price_amount=item.price_amount,
+                stock_units=item.stock_units,
+                category=item.category,
+                description=item.description,
+            )
+            _check_storable(item.price_amount, item.stock_units)
+        except (DomainError, ValueError) as exc:
+            results[i].error = str(exc)
+            continue
+        products.append(product)
+        valid.append(i)
+
+    new_ids = uow.products.create_many(products)
+    uow.commit()
+    for i, new_id in zip(valid, new_ids):
+        results[i].id = new_id
+    return results
+
+
+def bulk_update_products(uow: UnitOfWork, *, items: Sequence[ProductChanges]) -> List[BulkItemResult]:
+    current = uow.products.get_many([item.product_id for item in items])
+    results = [BulkItemResult(index=i, id=item.product_id) for i, item in enumerate(items)]
+    changed: Dict[int, Product] = {}
+    for i, item in enumerate(items):
+        product = current.get(item.product_id)
+        if product is None:
+            results[i].error = "Product not found"
+            continue
+        try:
+            product = product.with_updates(
+                name=item.name,
+                price_amount=item.price_amount,
+                stock_units=item.stock_units,
+                category=item.category,
+                description=item.description,
+                is_active=item.is_active,
+            )
+            _check_storable(item.price_amount, item.stock_units)
+        except (DomainError, ValueError) as exc:
+            results[i].error = str(exc)
+            continue
+        # Later items for the same product build on earlier ones
+        current[item.product_id] = changed[item.product_id] = product
+
+    uow.products.update_many(list(changed.values()))
+    uow.commit()
+    return results
+
+
+def bulk_delete_products(uow: UnitOfWork, *, product_ids: Sequence[int], soft: bool = True) -> List[BulkItemResult]:
+    deleted = set(uow.products.delete_many(product_ids, soft=soft))
+    uow.commit()
+    return [
+        BulkItemResult(index=i, id=pid, error=None if pid in deleted else "Product not found")
+        for i, pid in enumerate(product_ids)
+    ]
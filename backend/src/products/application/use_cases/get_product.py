@@ -1,6 +1,6 @@
 """Get single product use case."""
 
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
 from ..ports import UnitOfWork
 from ...domain.entities import Product
@@ -10,6 +10,6 @@ def get_product(uow: UnitOfWork, *, product_id: int) -> Optional[Product]:
     return uow.products.get_by_id(product_id)
 
 
-
-
-
+def get_products(uow: UnitOfWork, *, product_ids: Sequence[int]) -> Dict[int, Product]:
+    """Products by id in one round trip (chunked ``IN``); missing ids are absent."""
+    return uow.products.get_many(product_ids)
@@ -2,19 +2,57 @@
 
 from ..dto import ListProductsFilters, Page
 from ..ports import UnitOfWork
-
-
-def list_products(uow: UnitOfWork, *, filters: ListProductsFilters, limit: int, offset: int) -> Page:
+from ...domain.value_objects import parse_cents
+from src.shared.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def list_products(
+    uow: UnitOfWork,
+    *,
+    filters: ListProductsFilters,
+    limit: int,
+    offset: int,
+    sort: str = "id",
+    cursor: str | None = None,
+    total_mode: str = "exact",
+) -> Page:
+    """Offset or keyset page of active products.
+
+    ``cursor`` (a previous ``Page.next_cursor``) takes precedence over
+    ``offset``; an invalid cursor raises ``InvalidCursor`` (a ``ValueError``).
+    ``total_mode`` (exact|estimate|none) controls how ``Page.total`` is computed.
+    ``filters.search`` is a full-text prefix search; ``sort="relevance"``
+    orders its matches by BM25 rank.
+    """
     filter_dict = {
         "category": filters.category,
         "min_price": filters.min_price,
         "max_price": filters.max_price,
         "search": filters.search,
     }
-    items, total = uow.products.list(filters=filter_dict, limit=limit, offset=offset)
-    return Page(items=items, total=total, limit=limit, offset=offset)
-
-
-
-
-
+    after = decode_cursor(cursor, sort=sort) if cursor else None
+    if after is not None and sort == "relevance":
+        # Relevance cursors carry the next offset: BM25 ranks shift as the catalog changes
+        if after[0] < 0:
+            raise InvalidCursor("Malformed cursor")
+        offset, after = after[0], None
+    # One extra row tells us whether there is a next page
+    items, total = uow.products.list(
+        filters=filter_dict,
+        limit=limit + 1,
+        offset=0 if after is not None else offset,
+        sort=sort,
+        after=after,
+        total_mode=total_mode,
+    )
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        if sort == "relevance":
+            key = offset + limit
+        else:
+            key = last.id if sort == "id" else parse_cents(last.price_amount)
+        next_cursor = encode_cursor(sort, key, last.id)
+    return Page(items=items, total=total, limit=limit, offset=offset, next_cursor=next_cursor)
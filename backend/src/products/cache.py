@@ -0,0 +1,82 @@
+"""Response cache for catalog reads (``GET /products`` and ``GET /products/{id}``).
+
+List pages depend on the ``products:list`` namespace and single products on
+``products:item:<id>``; both also depend on ``products``. Any product write
+bumps the list namespace plus the item namespaces of the products it
+touched, so other products stay cached. Writes must call
+``invalidate_products`` after they commit; ``SQLAlchemyUnitOfWork`` does so
+for the products its repository wrote. Writes that do not know which rows
+they touched (imports) call ``invalidate_catalog`` instead.
+
+That only reaches this process. With ``RESPONSE_CACHE_VERSION_CHECK`` (set
+by the supervisor for ``--workers`` > 1) every read also compares the
+trigger-maintained ``catalog_version`` with the one its entry was loaded at,
+so writes handled by other workers are seen at once.
+"""
+
+from typing import Hashable, Optional
+
+from src.shared.config import get_settings
+from src.shared.connection_pool import get_pool
+from src.shared.db_executor import run_in_db
+from src.shared.response_cache import ResponseCache
+
+from . import database as products_database
+from .totals import filters_key
+
+CATALOG_NAMESPACE = "products"
+LIST_NAMESPACE = "products:list"
+
+
+def _read_catalog_version(path: str) -> int:
+    with get_pool(path, read_only=True).connection() as conn:
+        row = conn.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+async def catalog_version() -> int:
+    """Version that every write to ``products`` bumps, whichever process made it."""
+    return await run_in_db(_read_catalog_version, products_database.DATABASE_PATH)
+
+
+_settings = get_settings()
+catalog_cache = ResponseCache(
+    max_entries=_settings.RESPONSE_CACHE_SIZE,
+    ttl=_settings.RESPONSE_CACHE_TTL,
+    stale_ttl=_settings.RESPONSE_CACHE_STALE_TTL,
+    stale_while_revalidate=_settings.RESPONSE_CACHE_SWR,
+    enabled=_settings.RESPONSE_CACHE_ENABLED,
+    version=catalog_version if _settings.RESPONSE_CACHE_VERSION_CHECK else None,
+)
+
+
+def item_namespace(product_id: int) -> str:
+    return f"products:item:{product_id}"
+
+
+def list_key(
+    database: str,
+    filters: dict,
+    *,
+    limit: int,
+    offset: int,
+    sort: str,
+    cursor: Optional[str],
+    total_mode: str,
+) -> Hashable:
+    """Cache key for a list page; equivalent filter spellings share one key."""
+    return ("list", filters_key(database, filters), limit, offset, sort, cursor, total_mode)
+
+
+def item_key(database: str, product_id: int) -> Hashable:
+    return ("item", database, product_id)
+
+
+def invalidate_products(*product_ids: int) -> None:
+    """Drop cached lists and the given products after a committed write."""
+    catalog_cache.bump(LIST_NAMESPACE, *(item_namespace(pid) for pid in product_ids))
+
+
+def invalidate_catalog() -> None:
+    """Drop every cached list and product, e.g. after a bulk import."""
+    catalog_cache.bump(CATALOG_NAMESPACE)
@@ -1,34 +1,50 @@
 import sqlite3
-import os
-from typing import List, Tuple, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple, Optional
+
+from src.shared.connection_pool import PooledConnection, get_pool
+from src.shared.metrics import timed_query
+from src.shared.migrations import apply_migrations
+from .migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+from .totals import resolve_total
 
 # ❌ PROBLEMA: Hardcoded database path
 DATABASE_PATH = "ecommerce.db"
 
+@contextmanager
+def db_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Check out a pooled connection for the current DATABASE_PATH.
+
+    The pool (src/shared/connection_pool.py) applies busy_timeout, WAL,
+    synchronous=NORMAL, cache/mmap sizing and foreign keys once per
+    connection, and reuses connections across calls.
+    """
+    with get_pool(DATABASE_PATH).connection() as conn:
+        yield conn
+
 def get_db_connection():
     """
-    Get database connection.
-    
-    ❌ PROBLEMA: No pool de conexiones
-    ❌ PROBLEMA: No manejo de errores
-    ❌ PROBLEMA: No configuración de timeout
-    ❌ PROBLEMA: No foreign keys habilitadas
+    Get a pooled database connection; call ``close()`` to return it.
+
+    Prefer ``db_connection()`` so the connection is always released.
     """
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        # ❌ PROBLEMA: Foreign keys no habilitadas por defecto
-        # conn.execute("PRAGMA foreign_keys = ON")  # Commented out - should be enabled
-        return conn
+        pool = get_pool(DATABASE_PATH)
+        return PooledConnection(pool, pool.acquire())
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         raise
 
+@timed_query("products.init_database")
 def init_database():
     """
-    Initialize database with basic schema.
-    
+    Initialize database: apply products migrations, then seed sample data.
+
+    Schema and indexes live in src/products/migrations.py and are tracked in
+    ``schema_migrations``, so this is safe to call on every startup.
+
     ❌ PROBLEMA: Schema muy básico sin constraints
-    ❌ PROBLEMA: No indices para performance
     ❌ PROBLEMA: No foreign keys
     ❌ PROBLEMA: No audit fields consistentes
     """
@@ -36,28 +52,9 @@ def init_database():
     cursor = conn.cursor()
     
     try:
-        # ❌ PROBLEMA: Tabla muy básica sin constraints apropiadas
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            price REAL NOT NULL,                    -- ❌ REAL para dinero (precision issues)
-            stock INTEGER NOT NULL DEFAULT 0,
-            category TEXT,                          -- ❌ TEXT en vez de foreign key
-            description TEXT,
-            is_active INTEGER DEFAULT 1,           -- ❌ INTEGER en vez de BOOLEAN
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            -- ❌ PROBLEMA: No constraints de CHECK
-            -- ❌ PROBLEMA: No indices para búsquedas
-            -- ❌ PROBLEMA: No foreign keys
-        )
-        ''')
-        
-        # ❌ PROBLEMA: No índices para columnas consultadas frecuentemente
-        # cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)')
-        # cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_price ON products(price)')
-        # cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_active ON products(is_active)')
+        applied = apply_migrations(conn, PRODUCT_MIGRATIONS)
+        if applied:
+            print(f"✅ Applied products migrations: {', '.join(applied)}")
         
         # Insert sample data if table is empty
         cursor.execute("SELECT COUNT(*) FROM products")
@@ -96,6 +93,7 @@ def init_database():
     finally:
         conn.close()
 
+@timed_query("products.get_products_from_db")
 def get_products_from_db(query: str, params: List = None) -> List[Tuple]:
     """
     Execute SELECT query and return products.
@@ -124,6 +122,23 @@ def get_products_from_db(query: str, params: List = None) -> List[Tuple]:
     finally:
         conn.close()
 
+@timed_query("products.iter_products_from_db")
+def iter_products_from_db(query: str, params: List = None, batch_size: int = 1000) -> Iterator[List[Tuple]]:
+    """
+    Execute SELECT query and yield its rows in ``fetchmany`` batches.
+
+    Holds one pooled connection (and its read snapshot) until the generator
+    is exhausted or closed; memory stays at one batch whatever the result size.
+    """
+    with db_connection() as conn:
+        cursor = conn.execute(query, params or [])
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+@timed_query("products.get_count_from_db")
 def get_count_from_db(query: str, params: List = None) -> int:
     """
     Execute COUNT(*) style query and return integer count.
@@ -147,6 +162,33 @@ def get_count_from_db(query: str, params: List = None) -> int:
     finally:
         conn.close()
 
+@timed_query("products.get_total_from_db")
+def get_total_from_db(filters: dict, where_sql: str, params: List, mode: str = "exact") -> Optional[int]:
+    """
+    Total for a product listing according to ``mode`` (exact|estimate|none).
+
+    Uses the trigger-maintained counters or the version-checked count cache
+    when possible and only falls back to COUNT(*) over ``where_sql``.
+    """
+    with db_connection() as conn:
+        def query_one(sql, args):
+            return conn.execute(sql, args).fetchone()
+
+        count_query = f"SELECT COUNT(*) FROM products WHERE {where_sql}"
+        try:
+            return resolve_total(
+                query_one,
+                database=DATABASE_PATH,
+                filters=filters,
+                mode=mode,
+                count=lambda: query_one(count_query, params)[0],
+            )
+        except Exception as e:
+            print(f"❌ Database error in get_total_from_db: {e}")
+            print(f"❌ Query was: {count_query}")
+            raise
+
+@timed_query("products.get_product_by_id")
 def get_product_by_id(query: str) -> Optional[Tuple]:
     """
     Get single product by executing query.
@@ -170,6 +212,7 @@ def get_product_by_id(query: str) -> Optional[Tuple]:
     finally:
         conn.close()
 
+@timed_query("products.create_product_in_db")
 def create_product_in_db(query: str) -> int:
     """
     Create product by executing INSERT query.
@@ -198,6 +241,7 @@ def create_product_in_db(query: str) -> int:
     finally:
         conn.close()
 
+@timed_query("products.update_product_in_db")
 def update_product_in_db(query: str) -> int:
     """
     Update product by executing UPDATE query.
@@ -224,6 +268,7 @@ def update_product_in_db(query: str) -> int:
     finally:
         conn.close()
 
+@timed_query("products.delete_product_from_db")
 def delete_product_from_db(query: str) -> int:
     """
     Delete product by executing DELETE query.
@@ -250,17 +295,12 @@ def delete_product_from_db(query: str) -> int:
     finally:
         conn.close()
 
-# ❌ PROBLEMA: Initialize database on import (side effect)
-if not os.path.exists(DATABASE_PATH):
-    print("🔧 Database not found, creating new database...")
-    init_database()
+# Schema and seed data are applied by init_db() from the app lifespan (main.py), not on import
 
 # ❌ PROBLEMA: No funciones para:
 # - Bulk operations
 # - Transactions management
-# - Connection pooling
 # - Query optimization
-# - Schema migrations
 # - Backup/restore
 
 
@@ -1,28 +1,100 @@
 """Value objects for the product domain (money, stock, identifiers)."""
 
-from decimal import Decimal, InvalidOperation
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+from itertools import repeat
+from operator import truediv
+from typing import List, Sequence
+
+# Below this, cents / 100 as a double always formats back to the exact cents with %.2f
+_EXACT_FLOAT_CENTS = 10**15
+# SQLite INTEGER columns hold signed 64-bit values; larger cents or stock cannot be stored
+MAX_STORED_INTEGER = 2**63 - 1
+
+
+def parse_cents(amount: str) -> int:
+    """Whole cents in ``amount``, rounded as ``Decimal.quantize(Decimal("0.01"))`` would."""
+    if isinstance(amount, str):
+        # Plain amounts with at most two decimals need no rounding: skip Decimal
+        units, _, fraction = amount.partition(".")
+        if units.isdecimal() and len(fraction) <= 2 and (fraction.isdecimal() or not fraction):
+            return int(units + fraction.ljust(2, "0"))
+
+    try:
+        # round() on a Decimal is half-even, the same as quantize's default
+        cents = round(Decimal(amount) * 100)
+    except (InvalidOperation, TypeError, ValueError, OverflowError):
+        raise ValueError("Invalid money amount")
+
+    if cents < 0:
+        raise ValueError("Money amount cannot be negative")
+    return cents
+
+
+def format_cents(cents: Sequence[int]) -> List[str]:
+    """Decimal strings ("12.34") for a batch of non-negative cent amounts.
+
+    The batch is formatted by one ``%`` over all values and split, so the
+    per-value work stays in C.
+    """
+    if not cents:
+        return []
+    if max(cents) >= _EXACT_FLOAT_CENTS:
+        return ["%d.%02d" % divmod(c, 100) for c in cents]
+    return ("%.2f\x00" * len(cents) % tuple(map(truediv, cents, repeat(100))))[:-1].split("\x00")
+
+
+def cents_at_least(amount: float) -> int:
+    """Smallest whole number of cents that is >= ``amount`` (for lower price bounds).
+
+    Clamped to what an INTEGER column can hold, so any bound can be bound as a parameter.
+    """
+    return _clamp_cents(Decimal(str(amount)).scaleb(2).to_integral_value(rounding=ROUND_CEILING))
+
+
+def cents_at_most(amount: float) -> int:
+    """Largest whole number of cents that is <= ``amount`` (for upper price bounds), clamped likewise."""
+    return _clamp_cents(Decimal(str(amount)).scaleb(2).to_integral_value(rounding=ROUND_FLOOR))
+
+
+def _clamp_cents(cents: Decimal) -> int:
+    return int(min(max(cents, 0), MAX_STORED_INTEGER))
 
 
 class Money:
-    """Represents a monetary amount with two decimal places precision."""
+    """Represents a monetary amount with two decimal places precision, held as integer cents."""
+
+    __slots__ = ("_cents",)
 
     def __init__(self, amount: str):
-        try:
-            value = Decimal(amount)
-        except (InvalidOperation, TypeError):
-            raise ValueError("Invalid money amount")
+        self._cents = parse_cents(amount)
 
-        quantized = value.quantize(Decimal("0.01"))
-        if quantized < Decimal("0.00"):
-            raise ValueError("Money amount cannot be negative")
-        self._value = quantized
+    @classmethod
+    def from_cents(cls, cents: int) -> "Money":
+        if not isinstance(cents, int) or isinstance(cents, bool) or cents < 0:
+            raise ValueError("Money cents must be a non-negative integer")
+        money = cls.__new__(cls)
+        money._cents = cents
+        return money
+
+    @property
+    def cents(self) -> int:
+        return self._cents
 
     @property
     def value(self) -> Decimal:
-        return self._value
+        return Decimal(self._cents).scaleb(-2)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Money) and other._cents == self._cents
+
+    def __hash__(self) -> int:
+        return hash(self._cents)
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
 
     def __str__(self) -> str:
-        return f"{self._value:.2f}"
+        return "%d.%02d" % divmod(self._cents, 100)
 
 
 class Stock:
@@ -40,4 +112,3 @@ class Stock:
 
 
 
-
@@ -0,0 +1,85 @@
+"""Streaming catalog export (NDJSON or CSV).
+
+Rows come from ``iter_products_from_db`` in ``fetchmany`` batches, each
+fetched on a DB executor thread and encoded into one chunk, so the response
+never holds more than one batch in memory regardless of catalog size.
+Prices are read as integer cents and each batch is turned into decimal
+strings in one pass (``format_cents``); NDJSON writes them as JSON numbers.
+"""
+
+import asyncio
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from src.shared.db_executor import run_in_db
+
+from .database import iter_products_from_db
+from .domain.value_objects import format_cents
+
+EXPORT_COLUMNS = ("id", "name", "price", "stock", "category", "description", "is_active")
+# Same order as EXPORT_COLUMNS, with the price read as integer cents
+_SELECT_COLUMNS = ("id", "name", "price_cents", "stock", "category", "description", "is_active")
+
+_encode_str = json.encoder.encode_basestring
+_NDJSON_TEMPLATE = (
+    '{"id":%s,"name":%s,"price":%s,"stock":%s,"category":%s,"description":%s,"is_active":%s}'
+)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def export_query(where_sql: str) -> str:
+    return f"SELECT {', '.join(_SELECT_COLUMNS)} FROM products WHERE {where_sql} ORDER BY id"
+
+
+def encode_ndjson(rows: Sequence[Tuple]) -> bytes:
+    prices = format_cents([r[2] for r in rows])
+    lines = [
+        _NDJSON_TEMPLATE % (
+            r[0],
+            _encode_str(r[1]),
+            price,
+            r[3],
+            "null" if r[4] is None else _encode_str(r[4]),
+            _encode_str(r[5] or ""),
+            "true" if r[6] else "false",
+        )
+        for r, price in zip(rows, prices)
+    ]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(rows: Sequence[Tuple], *, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    prices = format_cents([r[2] for r in rows])
+    writer.writerows(
+        (r[0], r[1], price, r[3], r[4], r[5] or "", "true" if r[6] else "false") for r, price in zip(rows, prices)
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(fmt: str, where_sql: str, params: List, batch_size: int) -> AsyncIterator[bytes]:
+    """Encoded chunks of the export, one per fetched batch."""
+    batches = iter_products_from_db(export_query(where_sql), params, batch_size)
+    fetch: Optional["asyncio.Future[Optional[List[Tuple]]]"] = None
+    try:
+        if fmt == "csv":
+            yield encode_csv((), header=True)
+        while True:
+            # Shielded: if the client goes away mid-fetch, the batch still finishes on its DB thread
+            fetch = asyncio.ensure_future(run_in_db(next, batches, None))
+            rows = await asyncio.shield(fetch)
+            if rows is None:
+                break
+            yield encode_ndjson(rows) if fmt == "ndjson" else encode_csv(rows)
+    finally:
+        if fetch is not None:
+            await asyncio.gather(fetch, return_exceptions=True)
+        # The generator is idle now; closing it on a DB thread returns the connection to the pool
+        await run_in_db(batches.close)
@@ -0,0 +1,494 @@
+"""Streaming product import from CSV or NDJSON.
+
+The source is read incrementally, validated ``chunk_size`` records at a time
+against the ``Product`` domain rules and inserted with ``executemany`` (via a
+staging table, see ``INSERT_SQL``), committing every ``transaction_rows`` rows. Memory stays at one chunk, so
+multi-GB files are fine. Invalid records are counted, sampled in the stats
+and optionally written to a rejects file; they never stop the import.
+
+With ``defer_indexes`` the secondary indexes on ``products`` and its
+per-row insert triggers (FTS sync, counters) are dropped for the load and
+rebuilt once at the end: one index build and one FTS ``rebuild`` instead of
+a B-tree and FTS update per row. They are restored even if the load fails;
+their DDL is recorded in ``import_deferred_ddl`` along with the drop, so a
+load killed halfway is finished by the next import or by ``init_db``.
+
+CSV needs a header row; columns (and NDJSON keys) are ``name``, ``price``,
+``category`` and optionally ``stock`` and ``description``.
+
+Runs from the command line::
+
+    python -m src.products.importer catalog.csv --defer-indexes
+    zcat catalog.ndjson.gz | python -m src.products.importer - --format ndjson
+
+and as a background job via ``POST /products/import`` (see ``ImportJobs``).
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from src.shared.config import get_settings
+from src.shared.connection_pool import open_connection
+from src.shared.migrations import apply_migrations
+
+from .domain.entities import Product
+from .domain.errors import DomainError
+from .domain.value_objects import MAX_STORED_INTEGER, parse_cents
+
+FORMATS = ("csv", "ndjson")
+
+# Rows are staged with executemany into a trigger-free temp table, then moved into
+# products with one INSERT ... SELECT per chunk. Per-row INSERTs into products would
+# make FTS5 flush a tiny segment for every statement and slow down as segments pile up.
+STAGING_DDL = (
+    "CREATE TEMP TABLE IF NOT EXISTS import_staging "
+    "(name TEXT, price_cents INTEGER, stock INTEGER, category TEXT, description TEXT)"
+)
+STAGE_SQL = "INSERT INTO import_staging (name, price_cents, stock, category, description) VALUES (?, ?, ?, ?, ?)"
+INSERT_SQL = (
+    "INSERT INTO products (name, price, price_cents, stock, category, description, is_active) "
+    "SELECT name, price_cents / 100.0, price_cents, stock, category, description, 1 FROM import_staging ORDER BY rowid"
+)
+
+# Per-row insert triggers whose work is redone in bulk by finish_deferred
+DEFERRABLE_TRIGGERS = ("trg_products_fts_insert", "trg_products_counts_insert")
+# FTS5 buffers terms in memory up to ``hashsize`` bytes before writing a segment (default 1 MB);
+# a bigger buffer for the one-off rebuild means far fewer segments to write and merge
+FTS_REBUILD_HASHSIZE = 64 * 1024 * 1024
+FTS_DEFAULT_HASHSIZE = 1024 * 1024
+
+MAX_REJECT_SAMPLES = 100
+
+
+@dataclass
+class ImportStats:
+    status: str = "pending"  # pending | running | completed | failed
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    bytes_read: int = 0
+    total_bytes: Optional[int] = None
+    rejected_samples: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def progress(self) -> Optional[float]:
+        """Fraction of the source consumed, when its size is known."""
+        if self.status == "completed":
+            return 1.0
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes_read / self.total_bytes)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "rows_read": self.rows_read,
+            "rows_imported": self.rows_imported,
+            "rows_rejected": self.rows_rejected,
+            "progress": self.progress,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rejected_samples": self.rejected_samples,
+            "error": self.error,
+        }
+
+
+def iter_records(text: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, record) pairs; an unparsable NDJSON line yields its ValueError."""
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as exc:
+            yield line_no, exc
+
+
+def validate_record(record: Any) -> Tuple[str, int, int, str, Optional[str]]:
+    """Row for INSERT_SQL, or ValueError/DomainError describing why the record is rejected."""
+    if isinstance(record, Exception):
+        raise ValueError(f"Malformed record: {record}")
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+
+    price = record.get("price")
+    if price is None or str(price).strip() == "":
+        raise ValueError("price is required")
+    category = str(record.get("category") or "").strip()
+    if not category:
+        raise ValueError("category is required")
+    stock = record.get("stock")
+    try:
+        stock_units = 0 if stock in (None, "") else int(str(stock))
+    except ValueError:
+        raise ValueError("stock must be an integer")
+    if stock_units > MAX_STORED_INTEGER:
+        raise ValueError("stock is too large")
+
+    product = Product.create(
+        name=str(record.get("name") or ""),
+        price_amount=str(price).strip(),
+        stock_units=stock_units,
+        category=category,
+        description=record.get("description") or None,
+    )
+    cents = parse_cents(product.price_amount)
+    if cents > MAX_STORED_INTEGER:
+        raise ValueError("price is too large")
+    return (
+        product.name,
+        cents,
+        product.stock_units,
+        product.category,
+        product.description,
+    )
+
+
+def import_products(
+    source: BinaryIO,
+    fmt: str,
+    *,
+    database: str,
+    chunk_size: int = 5_000,
+    transaction_rows: int = 100_000,
+    defer_indexes: bool = False,
+    total_bytes: Optional[int] = None,
+    rejects: Optional[TextIO] = None,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+    stats: Optional[ImportStats] = None,
+    on_complete: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """Import every valid record of ``source`` (a binary stream) into ``database``.
+
+    ``on_complete`` runs once rows, indexes and triggers are final, before
+    ``stats.status`` leaves ``running``: pollers never see a finished import
+    whose caches have not been dropped yet.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+    stats = stats or ImportStats()
+    stats.total_bytes = total_bytes
+    stats.status = "running"
+    stats.started_at = time.time()
+
+    conn = open_connection(database)
+    deferred: List[Tuple[str, str, str]] = []
+    outcome = "failed"
+    try:
+        restore_deferred(conn)
+        if defer_indexes:
+            deferred = drop_deferrable(conn)
+        conn.execute(STAGING_DDL)
+        text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+        rows: List[Tuple] = []
+        in_transaction = 0
+        for line_no, record in iter_records(text, fmt):
+            stats.rows_read += 1
+            try:
+                rows.append(validate_record(record))
+            except (DomainError, ValueError) as exc:
+                _reject(stats, rejects, line_no, record, exc)
+            if stats.rows_read % chunk_size == 0:
+                in_transaction += _insert(conn, rows)
+                rows = []
+                if in_transaction >= transaction_rows:
+                    conn.commit()
+                    stats.rows_imported += in_transaction
+                    in_transaction = 0
+                _update_progress(stats, source, progress)
+        in_transaction += _insert(conn, rows)
+        conn.commit()
+        stats.rows_imported += in_transaction
+        outcome = "completed"
+    except Exception as exc:
+        conn.rollback()
+        stats.error = str(exc)
+        raise
+    finally:
+        try:
+            if deferred:
+                finish_deferred(conn, deferred)
+        finally:
+            conn.close()
+            try:
+                if on_complete is not None:
+                    on_complete(stats)
+            finally:
+                stats.status = outcome
+                stats.finished_at = time.time()
+                _update_progress(stats, source, progress)
+    return stats
+
+
+def _insert(conn: sqlite3.Connection, rows: List[Tuple]) -> int:
+    if rows:
+        conn.executemany(STAGE_SQL, rows)
+        conn.execute(INSERT_SQL)
+        conn.execute("DELETE FROM import_staging")
+    return len(rows)
+
+
+def _reject(stats: ImportStats, rejects: Optional[TextIO], line_no: int, record: Any, exc: Exception) -> None:
+    stats.rows_rejected += 1
+    entry = {"line": line_no, "error": str(exc)}
+    if len(stats.rejected_samples) < MAX_REJECT_SAMPLES:
+        stats.rejected_samples.append(entry)
+    if rejects is not None:
+        raw = record if isinstance(record, dict) else None
+        rejects.write(json.dumps({**entry, "record": raw}, ensure_ascii=False) + "\n")
+
+
+def _update_progress(stats: ImportStats, source: BinaryIO, progress: Optional[Callable[[ImportStats], None]]) -> None:
+    try:
+        stats.bytes_read = source.tell()
+    except (OSError, ValueError):
+        pass  # pipes and closed streams have no position
+    if progress is not None:
+        progress(stats)
+
+
+def drop_deferrable(conn: sqlite3.Connection) -> List[Tuple[str, str, str]]:
+    """Drop secondary indexes and per-row insert triggers on products; return their DDL.
+
+    The DDL is saved in ``import_deferred_ddl`` in the same transaction as the
+    drops, so it survives a crash before ``finish_deferred``.
+    """
+    placeholders = ", ".join("?" for _ in DEFERRABLE_TRIGGERS)
+    conn.commit()  # the caller's pending writes, as before; BEGIN needs no open transaction
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        deferred = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE tbl_name = 'products' AND sql IS NOT NULL "
+            f"AND (type = 'index' OR (type = 'trigger' AND name IN ({placeholders})))",
+            DEFERRABLE_TRIGGERS,
+        ).fetchall()
+        conn.executemany("INSERT OR REPLACE INTO import_deferred_ddl (type, name, sql) VALUES (?, ?, ?)", deferred)
+        for kind, name, _sql in deferred:
+            conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return deferred
+
+
+def restore_deferred(conn: sqlite3.Connection) -> List[str]:
+    """Finish deferred loads that never got to ``finish_deferred``; return the names restored."""
+    has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'import_deferred_ddl'").fetchone()
+    if not has_table:
+        return []
+    pending = conn.execute("SELECT type, name, sql FROM import_deferred_ddl ORDER BY rowid").fetchall()
+    if pending:
+        finish_deferred(conn, pending)
+    return [name for _kind, name, _sql in pending]
+
+
+def finish_deferred(conn: sqlite3.Connection, deferred: List[Tuple[str, str, str]]) -> None:
+    """Rebuild what the dropped triggers and indexes would have maintained, then restore them.
+
+    Runs as one transaction that also clears their ``import_deferred_ddl`` rows.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _rebuild_deferred(conn, [entry for entry in deferred if entry[1] not in existing])
+        conn.executemany("DELETE FROM import_deferred_ddl WHERE name = ?", [(name,) for _kind, name, _sql in deferred])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def _rebuild_deferred(conn: sqlite3.Connection, deferred: List[Tuple[str, str, str]]) -> None:
+    for kind, _name, sql in deferred:
+        if kind == "index":
+            conn.execute(sql)
+    has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'").fetchone()
+    if has_fts:
+        conn.execute("INSERT INTO products_fts (products_fts, rank) VALUES ('hashsize', ?)", (FTS_REBUILD_HASHSIZE,))
+        conn.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO products_fts (products_fts, rank) VALUES ('hashsize', ?)", (FTS_DEFAULT_HASHSIZE,))
+    has_counts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'product_counts'").fetchone()
+    if has_counts:
+        conn.execute("DELETE FROM product_counts")
+        conn.execute(
+            "INSERT INTO product_counts (category, active, n) "
+            "SELECT IFNULL(category, ''), CASE WHEN is_active = 1 THEN 1 ELSE 0 END, COUNT(*) "
+            "FROM products GROUP BY 1, 2"
+        )
+        conn.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+    for kind, _name, sql in deferred:
+        if kind == "trigger":
+            conn.execute(sql)
+
+
+class ImportJobs:
+    """Background imports, one at a time (SQLite has a single writer), with pollable stats."""
+
+    def __init__(self, max_jobs: int = 100) -> None:
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="import")
+        self._jobs: "OrderedDict[str, ImportStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        path: str,
+        fmt: str,
+        *,
+        database: str,
+        delete_after: bool = False,
+        on_complete: Optional[Callable[[ImportStats], None]] = None,
+        **options: Any,
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        stats = ImportStats()
+        with self._lock:
+            self._jobs[job_id] = stats
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, path, fmt, database, stats, delete_after, on_complete, options)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[ImportStats]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, path, fmt, database, stats, delete_after, on_complete, options) -> None:
+        try:
+            with open(path, "rb") as source:
+                import_products(
+                    source,
+                    fmt,
+                    database=database,
+                    total_bytes=os.path.getsize(path),
+                    stats=stats,
+                    on_complete=on_complete,
+                    **options,
+                )
+        except Exception as exc:
+            stats.status = "failed"
+            stats.error = stats.error or str(exc)
+        finally:
+            if delete_after:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+_jobs: Optional[ImportJobs] = None
+_jobs_lock = threading.Lock()
+
+
+def get_import_jobs() -> ImportJobs:
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = ImportJobs()
+        return _jobs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from . import database as products_database
+    from .migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Import products from a CSV or NDJSON file.")
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--database", default=products_database.DATABASE_PATH)
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--transaction-rows", type=int, default=settings.IMPORT_TRANSACTION_ROWS)
+    parser.add_argument("--defer-indexes", action="store_true", help="rebuild indexes/FTS once at the end")
+    parser.add_argument("--rejects", help="write rejected records (NDJSON) to this file")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        parser.error("cannot infer --format from the file name")
+
+    last_report = [0.0]
+
+    def report(stats: ImportStats) -> None:
+        now = time.monotonic()
+        if now - last_report[0] < 1 and stats.finished_at is None:
+            return
+        last_report[0] = now
+        pct = f"{stats.progress * 100:5.1f}% " if stats.progress is not None else ""
+        print(
+            f"{pct}{stats.rows_read:,} rows read, {stats.rows_imported:,} imported, "
+            f"{stats.rows_rejected:,} rejected ({stats.rows_per_second:,.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+    conn = open_connection(args.database)
+    try:
+        apply_migrations(conn, PRODUCT_MIGRATIONS)
+    finally:
+        conn.close()
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+    try:
+        if args.path == "-":
+            source, total = sys.stdin.buffer, None
+        else:
+            source, total = open(args.path, "rb"), os.path.getsize(args.path)
+        with source:
+            stats = import_products(
+                source,
+                fmt,
+                database=args.database,
+                chunk_size=args.chunk_size,
+                transaction_rows=args.transaction_rows,
+                defer_indexes=args.defer_indexes,
+                total_bytes=total,
+                rejects=rejects,
+                progress=report,
+            )
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+    print(
+        f"✅ Imported {stats.rows_imported:,} products, rejected {stats.rows_rejected:,} "
+        f"in {stats.elapsed:.1f}s ({stats.rows_per_second:,.0f} rows/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,8 @@ class ProductORM(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
-    price: Mapped[float]  # kept as float to match existing legacy schema
+    price: Mapped[float]  # legacy mirror of price_cents / 100 for raw-SQL readers
+    price_cents: Mapped[int]
     stock: Mapped[int]
     category: Mapped[str | None]
     description: Mapped[str | None]
@@ -1,9 +1,22 @@
-"""Session and engine configuration for SQLAlchemy 2.0 style."""
+"""Session and engine configuration for SQLAlchemy 2.0 style.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+Engines are created on first use, one per database path and mode, so
+importing this module does no I/O and sessions follow the configured
+``DATABASE_PATH`` (tests and benchmarks repoint it at run time).
+"""
 
+import threading
+from dataclasses import replace
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from src.shared.connection_pool import PoolConfig, configure_connection, open_connection
 from src.shared.database import get_database_url
+from src.shared.query_log import TracedConnection
 
 
 def _to_sqlalchemy_url(db_path: str) -> str:
@@ -12,7 +25,113 @@ def _to_sqlalchemy_url(db_path: str) -> str:
     return f"sqlite:///{db_path}"
 
 
-engine = create_engine(_to_sqlalchemy_url(get_database_url()), future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def _to_path(db_url: str) -> str:
+    return db_url[len("sqlite:///"):] if db_url.startswith("sqlite:///") else db_url
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    # Same busy_timeout/WAL/cache tuning as the shared sqlite3 pool
+    configure_connection(dbapi_connection, PoolConfig.from_settings())
+
+
+class ReadOnlyViolation(RuntimeError):
+    """Raised when a read-only session or unit of work is asked to write."""
+
+
+class ReadOnlySession(Session):
+    """Session for query use cases: flushing or ORM DML raises ``ReadOnlyViolation``."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session: Session, _flush_context, _instances) -> None:
+    raise ReadOnlyViolation(
+        f"Read-only session has pending changes "
+        f"(new={len(session.new)}, dirty={len(session.dirty)}, deleted={len(session.deleted)})"
+    )
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _reject_dml(state: ORMExecuteState) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements skip the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        raise ReadOnlyViolation("Read-only session cannot execute INSERT, UPDATE or DELETE")
+
+
+def create_read_only_engine(db_path: str) -> Engine:
+    """Engine over a pool of ``mode=ro`` connections with ``query_only`` on.
+
+    Writes that get past ``ReadOnlySession`` (e.g. raw SQL) fail in SQLite.
+    """
+    config = replace(PoolConfig.from_settings(), read_only=True)
+    return create_engine(
+        "sqlite://",
+        creator=lambda: open_connection(db_path, config),
+        poolclass=QueuePool,
+        pool_size=config.max_size,
+        future=True,
+    )
+
+
+# (path, read_only) -> (engine, session factory)
+_engines: Dict[Tuple[str, bool], Tuple[Engine, sessionmaker]] = {}
+_engines_lock = threading.Lock()
+
+
+def _key(db_path: Optional[str], read_only: bool) -> Tuple[str, bool]:
+    return (_to_path(db_path or get_database_url()), read_only)
+
+
+def get_engine(db_path: Optional[str] = None) -> Engine:
+    """Process-wide read/write engine for ``db_path`` (default: the configured database)."""
+    return _engine_for(_key(db_path, False))[0]
+
+
+def get_read_only_engine(db_path: Optional[str] = None) -> Engine:
+    """Process-wide ``create_read_only_engine`` for ``db_path`` (default: the configured database)."""
+    return _engine_for(_key(db_path, True))[0]
+
+
+def _engine_for(key: Tuple[str, bool]) -> Tuple[Engine, sessionmaker]:
+    entry = _engines.get(key)
+    if entry is not None:
+        return entry
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is None:
+            path, read_only = key
+            if read_only:
+                engine = create_read_only_engine(path)
+                factory = sessionmaker(
+                    bind=engine,
+                    class_=ReadOnlySession,
+                    autoflush=False,
+                    autocommit=False,
+                    expire_on_commit=False,
+                    future=True,
+                )
+            else:
+                connect_args = {"factory": TracedConnection} if PoolConfig.from_settings().trace_queries else {}
+                engine = create_engine(_to_sqlalchemy_url(path), future=True, connect_args=connect_args)
+                event.listen(engine, "connect", _apply_sqlite_pragmas)
+                factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+            entry = _engines[key] = (engine, factory)
+    return entry
+
+
+def SessionLocal() -> Session:  # noqa: N802  (was a module-level sessionmaker)
+    """New read/write session on the configured database."""
+    return _engine_for(_key(None, False))[1]()
+
+
+def ReadOnlySessionLocal() -> ReadOnlySession:  # noqa: N802
+    """New ``ReadOnlySession`` on the configured database's read-only engine."""
+    return _engine_for(_key(None, True))[1]()
 
 
+def dispose_engines() -> None:
+    """Close every engine's pooled connections and forget them (shutdown, tests)."""
+    with _engines_lock:
+        engines = [engine for engine, _ in _engines.values()]
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
@@ -1,21 +1,25 @@
 """SQLAlchemy implementation of ProductRepository port."""
 
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, literal_column, text, tuple_, insert, update, delete
 from sqlalchemy.orm import Session
 
+from src.shared.metrics import timed_methods
+
 from ...application.ports import ProductRepository
 from ...domain.entities import Product
 from ..db.models import ProductORM
-from ...domain.value_objects import Money
+from ...domain.value_objects import cents_at_least, cents_at_most, format_cents, parse_cents
+from ...search import RANK_SQL, build_match_query
+from ...totals import resolve_total
 
 
-def _to_domain(row: ProductORM) -> Product:
+def _to_domain(row: Any, price_amount: Optional[str] = None) -> Product:
     return Product(
         id=row.id,
         name=row.name,
-        price_amount=f"{row.price:.2f}",
+        price_amount=format_cents((row.price_cents,))[0] if price_amount is None else price_amount,
         stock_units=row.stock,
         category=row.category or "",
         description=row.description,
@@ -25,77 +29,216 @@ def _to_domain(row: ProductORM) -> Product:
     )
 
 
+def _to_domain_many(rows: Sequence[Any]) -> List[Product]:
+    # One batch conversion of cents to amounts instead of a Decimal per row
+    amounts = format_cents([row.price_cents for row in rows])
+    return [_to_domain(row, amount) for row, amount in zip(rows, amounts)]
+
+
+def _price_values(price_amount: str) -> dict:
+    """Integer cents plus the legacy REAL mirror, always written together."""
+    cents = parse_cents(price_amount)
+    return {"price_cents": cents, "price": cents / 100}
+
+
+def _to_values(product: Product) -> dict:
+    return {
+        "name": product.name,
+        **_price_values(product.price_amount),
+        "stock": product.stock_units,
+        "category": product.category,
+        "description": product.description,
+        "is_active": 1 if product.is_active else 0,
+    }
+
+
+def _chunks(ids: Sequence[int], size: int = 500):
+    # Keep IN (...) lists well under SQLite's bound-parameter limit
+    for start in range(0, len(ids), size):
+        yield list(ids[start:start + size])
+
+
+# Columns a domain Product needs. Read paths select these as plain rows, so no
+# ProductORM instances are built or tracked in the session's identity map.
+_ROW_COLUMNS = tuple(
+    ProductORM.__table__.c[name]
+    for name in (
+        "id", "name", "price_cents", "stock", "category", "description", "is_active", "created_at", "updated_at",
+    )
+)
+
+# sort option -> ORDER BY columns
+_ORDER_BY = {
+    "id": (ProductORM.id.asc(),),
+    "price": (ProductORM.price_cents.asc(), ProductORM.id.asc()),
+    "-price": (ProductORM.price_cents.desc(), ProductORM.id.desc()),
+}
+
+
+def _fts_matches(match_query: str):
+    """Subquery of (fts_id, rank) for products matching ``match_query``."""
+    return (
+        select(literal_column("rowid").label("fts_id"), literal_column(RANK_SQL).label("rank"))
+        .select_from(text("products_fts"))
+        .where(text("products_fts MATCH :match_query").bindparams(match_query=match_query))
+        .subquery("fts")
+    )
+
+
+def _keyset_condition(sort: str, after: Tuple[Any, int]):
+    key, last_id = after
+    if sort == "id":
+        return ProductORM.id > last_id
+    position = tuple_(ProductORM.price_cents, ProductORM.id)
+    bound = (key, last_id)  # price cursors carry whole cents
+    return position > bound if sort == "price" else position < bound
+
+
+@timed_methods("product_repository")
 class SQLAlchemyProductRepository(ProductRepository):
     def __init__(self, session: Session) -> None:
         self.session = session
-
-    def list(self, *, filters: dict, limit: int, offset: int) -> Tuple[List[Product], int]:
-        stmt = select(ProductORM)
-        conditions = [ProductORM.is_active == 1]
+        # Products written since the unit of work last committed or rolled back
+        self.changed_ids: Set[int] = set()
+
+    def list(
+        self,
+        *,
+        filters: dict,
+        limit: int,
+        offset: int,
+        sort: str = "id",
+        after: Optional[Tuple[Any, int]] = None,
+        total_mode: str = "exact",
+    ) -> Tuple[List[Product], Optional[int]]:
+        # Literal (not bound) 1 so SQLite can use the partial is_active = 1 indexes
+        conditions = [ProductORM.is_active == literal_column("1")]
 
         category = filters.get("category")
         if category:
             conditions.append(ProductORM.category == category)
 
+        # Same whole-cent bounds as the router's _filter_clauses
         min_price = filters.get("min_price")
-        if min_price:
-            conditions.append(ProductORM.price >= float(Money(min_price).value))
+        if min_price is not None:
+            conditions.append(ProductORM.price_cents >= cents_at_least(min_price))
 
         max_price = filters.get("max_price")
-        if max_price:
-            conditions.append(ProductORM.price <= float(Money(max_price).value))
+        if max_price is not None:
+            conditions.append(ProductORM.price_cents <= cents_at_most(max_price))
 
+        page_stmt = select(*_ROW_COLUMNS).where(and_(*conditions))
+        order_by = _ORDER_BY.get(sort, _ORDER_BY["id"])
         search = filters.get("search")
-        if search:
+        match_query = build_match_query(search) if search else None
+        ranked = False
+        if match_query is not None:
+            matches = _fts_matches(match_query)
+            conditions.append(ProductORM.id.in_(select(matches.c.fts_id)))
+            if sort == "relevance":
+                # The ranked join does the matching for the page; the count keeps the plain filter
+                page_stmt = page_stmt.join(matches, matches.c.fts_id == ProductORM.id)
+                order_by = (matches.c.rank.asc(), ProductORM.id.asc())
+                ranked = True
+        elif search:
+            # Nothing FTS can tokenize (e.g. only punctuation): plain substring on the name
             conditions.append(ProductORM.name.ilike(f"%{search}%"))
 
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-
-        total = self.session.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        if not ranked:
+            page_stmt = select(*_ROW_COLUMNS).where(and_(*conditions))
+        if after is not None:
+            page_stmt = page_stmt.where(_keyset_condition(sort, after))
+        page_stmt = page_stmt.order_by(*order_by).limit(limit).offset(offset)
+        count_stmt = select(func.count()).select_from(ProductORM.__table__).where(and_(*conditions))
+
+        rows = None
+
+        def count_with_page() -> int:
+            # The page and its total in one statement: SQLite evaluates the uncorrelated
+            # COUNT(*) subquery once, over the best index for the filters
+            nonlocal rows
+            rows = self.session.execute(page_stmt.add_columns(count_stmt.scalar_subquery())).all()
+            if rows:
+                return rows[0][-1]
+            return self.session.execute(count_stmt).scalar_one()  # an empty page carries no total
+
+        total = resolve_total(
+            self._query_one,
+            database=str(self.session.get_bind().url.database),
+            filters=filters,
+            mode=total_mode,
+            count=count_with_page,
+        )
+        if rows is None:
+            # Total came from counters or cache: just the page
+            rows = self.session.execute(page_stmt).all()
+        return _to_domain_many(rows), total
 
-        stmt = stmt.order_by(ProductORM.id).limit(limit).offset(offset)
-        rows = self.session.execute(stmt).scalars().all()
-        return [_to_domain(r) for r in rows], int(total)
+    def _query_one(self, sql: str, params) -> Optional[tuple]:
+        return self.session.connection().exec_driver_sql(sql, tuple(params)).fetchone()
 
     def get_by_id(self, product_id: int) -> Optional[Product]:
         row = self.session.get(ProductORM, product_id)
         return None if row is None else _to_domain(row)
 
     def create(self, product: Product) -> int:
-        row = ProductORM(
-            name=product.name,
-            price=float(Money(product.price_amount).value),
-            stock=product.stock_units,
-            category=product.category,
-            description=product.description,
-            is_active=1 if product.is_active else 0,
-        )
+        row = ProductORM(**_to_values(product))
         self.session.add(row)
         self.session.flush()
+        self.changed_ids.add(int(row.id))
         return int(row.id)
 
     def update(self, product: Product) -> None:
         row = self.session.get(ProductORM, product.id)
         if row is None:
             raise ValueError("Product not found")
-        row.name = product.name
-        row.price = float(Money(product.price_amount).value)
-        row.stock = product.stock_units
-        row.category = product.category
-        row.description = product.description
-        row.is_active = 1 if product.is_active else 0
+        for column, value in _to_values(product).items():
+            setattr(row, column, value)
+        self.changed_ids.add(product.id)
 
     def delete(self, product_id: int, *, soft: bool = True) -> None:
         row = self.session.get(ProductORM, product_id)
         if row is None:
             return
+        self.changed_ids.add(product_id)
         if soft:
             row.is_active = 0
         else:
             self.session.delete(row)
 
-
-
+    def get_many(self, product_ids: Sequence[int]) -> Dict[int, Product]:
+        found: Dict[int, Product] = {}
+        for chunk in _chunks(list(dict.fromkeys(product_ids))):
+            rows = self.session.execute(select(*_ROW_COLUMNS).where(ProductORM.id.in_(chunk))).all()
+            found.update((product.id, product) for product in _to_domain_many(rows))
+        return found
+
+    def create_many(self, products: Sequence[Product]) -> List[int]:
+        new_ids: List[int] = []
+        # 7 parameters per row: 1000-row INSERT ... VALUES (...), (...) statements
+        for start in range(0, len(products), 1000):
+            rows = [_to_values(p) for p in products[start:start + 1000]]
+            stmt = insert(ProductORM.__table__).values(rows).returning(ProductORM.__table__.c.id)
+            # AUTOINCREMENT hands out increasing ids in VALUES order, so sorted ids match input order
+            new_ids.extend(sorted(int(new_id) for new_id in self.session.execute(stmt).scalars()))
+        self.changed_ids.update(new_ids)
+        return new_ids
+
+    def update_many(self, products: Sequence[Product]) -> None:
+        if not products:
+            return
+        # ORM bulk UPDATE by primary key: one prepared statement, executemany
+        self.session.execute(update(ProductORM), [{"id": p.id, **_to_values(p)} for p in products])
+        self.changed_ids.update(p.id for p in products)
+
+    def delete_many(self, product_ids: Sequence[int], *, soft: bool = True) -> List[int]:
+        affected: List[int] = []
+        for chunk in _chunks(list(dict.fromkeys(product_ids))):
+            if soft:
+                stmt = update(ProductORM).where(ProductORM.id.in_(chunk)).values(is_active=0)
+            else:
+                stmt = delete(ProductORM).where(ProductORM.id.in_(chunk))
+            stmt = stmt.returning(ProductORM.id).execution_options(synchronize_session=False)
+            affected.extend(int(pid) for pid in self.session.execute(stmt).scalars())
+        self.changed_ids.update(affected)
+        return affected
@@ -1,21 +1,35 @@
 """SQLAlchemy-based Unit of Work for products."""
 
-from typing import Optional
+from typing import Callable, Optional
 
 from sqlalchemy.orm import Session
 
 from ..application.ports import UnitOfWork
-from .db.session import SessionLocal
+from ..cache import invalidate_products
+from .db.session import ReadOnlySessionLocal, ReadOnlyViolation, SessionLocal
 from .repositories.product_repository_sqlalchemy import SQLAlchemyProductRepository
 
 
 class SQLAlchemyUnitOfWork(UnitOfWork):
-    def __init__(self) -> None:
+    """Read-write unit of work.
+
+    After each successful commit, ``after_commit`` is called with the ids of
+    the products written since the previous one; by default it drops their
+    cached responses (src/products/cache.py).
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        after_commit: Callable[..., None] = invalidate_products,
+    ) -> None:
+        self._session_factory = session_factory or SessionLocal
+        self._after_commit = after_commit
         self._session: Optional[Session] = None
         self.products = None  # type: ignore[assignment]
 
     def __enter__(self) -> "SQLAlchemyUnitOfWork":
-        self._session = SessionLocal()
+        self._session = self._session_factory()
         self.products = SQLAlchemyProductRepository(self._session)
         return self
 
@@ -33,9 +47,47 @@ class SQLAlchemyUnitOfWork(UnitOfWork):
     def commit(self) -> None:
         if self._session is not None:
             self._session.commit()
+            changed, self.products.changed_ids = self.products.changed_ids, set()
+            if changed:
+                self._after_commit(*changed)
 
     def rollback(self) -> None:
         if self._session is not None:
             self._session.rollback()
+            self.products.changed_ids = set()
+
+
+class SQLAlchemyReadOnlyUnitOfWork(UnitOfWork):
+    """Unit of work for query use cases (list, get): never flushes or commits.
+
+    Sessions come from ``ReadOnlySessionLocal``: no autoflush, connections
+    from the read-only pool (``mode=ro``, ``query_only``). A ``session_factory``
+    passed in should produce ``ReadOnlySession`` objects to keep the write checks.
+    """
 
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        self._session_factory = session_factory or ReadOnlySessionLocal
+        self._session: Optional[Session] = None
+        self.products = None  # type: ignore[assignment]
+
+    def __enter__(self) -> "SQLAlchemyReadOnlyUnitOfWork":
+        self._session = self._session_factory()
+        self.products = SQLAlchemyProductRepository(self._session)
+        return self
 
+    def __exit__(self, exc_type, exc, tb) -> None:
+        session, self._session = self._session, None
+        if session is None:
+            return
+        try:
+            if exc is None and (session.new or session.dirty or session.deleted):
+                raise ReadOnlyViolation("Read-only unit of work ended with pending changes")
+        finally:
+            session.close()  # ends the read transaction; there is nothing to commit
+
+    def commit(self) -> None:
+        raise ReadOnlyViolation("Read-only unit of work cannot commit")
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
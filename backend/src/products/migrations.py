@@ -0,0 +1,231 @@
+"""Schema migrations for the products table.
+
+Index design follows the statements the app actually issues:
+
+- ``GET /products`` and ``SQLAlchemyProductRepository.list`` always filter on
+  ``is_active = 1`` and page ``ORDER BY id``; a category filter therefore
+  wants ``(category, id)`` restricted to active rows.
+- Price ranges (``price_cents >= ? AND price_cents <= ?``), alone or with a
+  category, want ``price_cents`` / ``(category, price_cents)`` restricted to
+  active rows.
+
+Partial indexes (``WHERE is_active = 1``) keep inactive rows out of the
+B-trees. SQLite only uses them when the query spells ``is_active = 1`` as a
+literal, which both the router and the repository do.
+
+Totals (see src/products/totals.py) are served from ``product_counts``, one
+row per (category, active) kept current by triggers, and from a count cache
+validated against ``catalog_version``, which every write to products bumps.
+
+Free-text search (see src/products/search.py) uses the ``products_fts`` FTS5
+table over name, description and category, also maintained by triggers.
+
+Prices are stored as integer cents in ``price_cents``. ``price`` (REAL) is
+kept as ``price_cents / 100.0`` for legacy SQL that still writes or reads it:
+a write that only sets ``price`` gets ``price_cents`` derived by trigger.
+"""
+
+from src.shared.migrations import Migration
+
+MIGRATIONS = [
+    Migration(
+        version="products_0001",
+        description="Create products table",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                price REAL NOT NULL,
+                stock INTEGER NOT NULL DEFAULT 0,
+                category TEXT,
+                description TEXT,
+                is_active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ],
+    ),
+    Migration(
+        version="products_0002",
+        description="Partial indexes for active-product listing filters",
+        statements=[
+            "CREATE INDEX IF NOT EXISTS idx_products_active_category_id "
+            "ON products(category, id) WHERE is_active = 1",
+            "CREATE INDEX IF NOT EXISTS idx_products_active_price_id "
+            "ON products(price, id) WHERE is_active = 1",
+            "CREATE INDEX IF NOT EXISTS idx_products_active_category_price "
+            "ON products(category, price) WHERE is_active = 1",
+        ],
+    ),
+    Migration(
+        version="products_0003",
+        description="Per-(category, active) counters and catalog version maintained by triggers",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS product_counts (
+                category TEXT NOT NULL,
+                active INTEGER NOT NULL,
+                n INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, active)
+            ) WITHOUT ROWID
+            """,
+            """
+            INSERT OR REPLACE INTO product_counts (category, active, n)
+            SELECT IFNULL(category, ''), CASE WHEN is_active = 1 THEN 1 ELSE 0 END, COUNT(*)
+            FROM products
+            GROUP BY 1, 2
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS catalog_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+            """,
+            "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)",
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_counts_insert AFTER INSERT ON products
+            BEGIN
+                INSERT INTO product_counts (category, active, n)
+                VALUES (IFNULL(NEW.category, ''), CASE WHEN NEW.is_active = 1 THEN 1 ELSE 0 END, 1)
+                ON CONFLICT (category, active) DO UPDATE SET n = n + 1;
+                UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_counts_delete AFTER DELETE ON products
+            BEGIN
+                UPDATE product_counts SET n = n - 1
+                WHERE category = IFNULL(OLD.category, '')
+                  AND active = CASE WHEN OLD.is_active = 1 THEN 1 ELSE 0 END;
+                UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_counts_update AFTER UPDATE OF category, is_active ON products
+            WHEN IFNULL(OLD.category, '') IS NOT IFNULL(NEW.category, '')
+              OR (OLD.is_active = 1) IS NOT (NEW.is_active = 1)
+            BEGIN
+                UPDATE product_counts SET n = n - 1
+                WHERE category = IFNULL(OLD.category, '')
+                  AND active = CASE WHEN OLD.is_active = 1 THEN 1 ELSE 0 END;
+                INSERT INTO product_counts (category, active, n)
+                VALUES (IFNULL(NEW.category, ''), CASE WHEN NEW.is_active = 1 THEN 1 ELSE 0 END, 1)
+                ON CONFLICT (category, active) DO UPDATE SET n = n + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_version_update AFTER UPDATE ON products
+            BEGIN
+                UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+            END
+            """,
+        ],
+    ),
+    Migration(
+        version="products_0004",
+        description="FTS5 index over name, description and category",
+        statements=[
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                name, description, category,
+                content='products', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON products
+            BEGIN
+                INSERT INTO products_fts (rowid, name, description, category)
+                VALUES (NEW.id, NEW.name, NEW.description, NEW.category);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, description, category)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.category);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE OF name, description, category ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, description, category)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.category);
+                INSERT INTO products_fts (rowid, name, description, category)
+                VALUES (NEW.id, NEW.name, NEW.description, NEW.category);
+            END
+            """,
+            "INSERT INTO products_fts (products_fts) VALUES ('rebuild')",
+        ],
+    ),
+    Migration(
+        version="products_0005",
+        description="Re-index FTS rows only when indexed text actually changes",
+        statements=[
+            # UPDATE OF fires whenever a column is in the SET list, and bulk updates set them all
+            "DROP TRIGGER IF EXISTS trg_products_fts_update",
+            """
+            CREATE TRIGGER trg_products_fts_update AFTER UPDATE OF name, description, category ON products
+            WHEN OLD.name IS NOT NEW.name
+              OR OLD.description IS NOT NEW.description
+              OR OLD.category IS NOT NEW.category
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, description, category)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.category);
+                INSERT INTO products_fts (rowid, name, description, category)
+                VALUES (NEW.id, NEW.name, NEW.description, NEW.category);
+            END
+            """,
+        ],
+    ),
+    Migration(
+        version="products_0006",
+        description="Store prices as integer cents",
+        statements=[
+            "ALTER TABLE products ADD COLUMN price_cents INTEGER",
+            "UPDATE products SET price_cents = CAST(ROUND(price * 100) AS INTEGER), price = ROUND(price * 100) / 100.0",
+            # Writers that only know about price (legacy SQL, older clients) get cents derived
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_price_cents_insert AFTER INSERT ON products
+            WHEN NEW.price_cents IS NULL
+            BEGIN
+                UPDATE products
+                SET price_cents = CAST(ROUND(NEW.price * 100) AS INTEGER), price = ROUND(NEW.price * 100) / 100.0
+                WHERE id = NEW.id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_price_cents_update AFTER UPDATE OF price ON products
+            WHEN NEW.price IS NOT OLD.price AND NEW.price IS NOT NEW.price_cents / 100.0
+            BEGIN
+                UPDATE products
+                SET price_cents = CAST(ROUND(NEW.price * 100) AS INTEGER), price = ROUND(NEW.price * 100) / 100.0
+                WHERE id = NEW.id;
+            END
+            """,
+            "DROP INDEX IF EXISTS idx_products_active_price_id",
+            "DROP INDEX IF EXISTS idx_products_active_category_price",
+            "CREATE INDEX IF NOT EXISTS idx_products_active_price_cents_id "
+            "ON products(price_cents, id) WHERE is_active = 1",
+            "CREATE INDEX IF NOT EXISTS idx_products_active_category_price_cents "
+            "ON products(category, price_cents) WHERE is_active = 1",
+        ],
+    ),
+    Migration(
+        version="products_0007",
+        description="Track indexes and triggers dropped by deferred imports",
+        statements=[
+            # Written in the same transaction as the DROPs, so an interrupted import can be finished later
+            """
+            CREATE TABLE IF NOT EXISTS import_deferred_ddl (
+                name TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                sql TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+]
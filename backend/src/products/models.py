@@ -37,7 +37,7 @@ class Product(BaseModel):
             datetime: lambda v: v.isoformat() if v else None
         }
         
-        schema_extra = {
+        json_schema_extra = {
             "example": {
                 "name": "Smartphone XYZ Pro",
                 "price": 899.99,
@@ -81,8 +81,67 @@ class ProductUpdateRequest(BaseModel):
 class PaginatedProducts(BaseModel):
     """Paginated response for products."""
     items: List[Product]
-    total: int
+    total: Optional[int]  # null when requested with total_mode=none
     limit: int
     offset: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for keyset pagination
 
 
+# Bulk operations: field types are checked here, business rules per item by the domain
+BULK_MAX_ITEMS = 10_000
+
+
+class BulkProductCreateItem(BaseModel):
+    name: str
+    price: float
+    stock: int = 0
+    category: str
+    description: Optional[str] = None
+
+
+class BulkProductUpdateItem(BaseModel):
+    id: int
+    name: Optional[str] = None
+    price: Optional[float] = None
+    stock: Optional[int] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class BulkCreateRequest(BaseModel):
+    items: List[BulkProductCreateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkUpdateRequest(BaseModel):
+    items: List[BulkProductUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int  # position in the request
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+
+
+class BulkOperationResult(BaseModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
+
+
+# Batch lookup by id (cart/order pages): one request instead of N GET /products/{id}
+LOOKUP_MAX_IDS = 1000
+
+
+class ProductLookupRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=LOOKUP_MAX_IDS)
+
+
+class ProductLookupResult(BaseModel):
+    items: List[Product]  # found products, in request order (duplicates collapsed)
+    missing: List[int]  # requested ids that do not exist or are inactive
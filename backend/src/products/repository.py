@@ -1,11 +1,14 @@
 from typing import List
 from datetime import datetime
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import literal_column, select
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
 
+from src.shared.metrics import timed_query
+
 from .models import Product
-from .database import DATABASE_PATH
+from . import database
+from .infrastructure.db.session import get_engine
 
 
 class Base(DeclarativeBase):
@@ -26,10 +29,7 @@ class ProductORM(Base):
     updated_at: Mapped[datetime | None]
 
 
-# Use the same SQLite database file used elsewhere in the app
-engine = create_engine(f"sqlite:///{DATABASE_PATH}", future=True)
-
-
+@timed_query("products.find_products_by_category")
 def find_products_by_category(
     category: str,
     *,
@@ -44,10 +44,11 @@ def find_products_by_category(
     if not category or not category.strip():
         return []
 
-    with Session(engine) as session:
+    # Same SQLite file as the rest of the app, resolved per call (engine created once per path)
+    with Session(get_engine(database.DATABASE_PATH)) as session:
         stmt = select(ProductORM).where(ProductORM.category == category)
         if not include_inactive:
-            stmt = stmt.where(ProductORM.is_active == 1)
+            stmt = stmt.where(ProductORM.is_active == literal_column("1"))
 
         stmt = stmt.order_by(ProductORM.id).limit(limit).offset(offset)
         rows = session.execute(stmt).scalars().all()
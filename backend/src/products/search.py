@@ -0,0 +1,37 @@
+"""Full-text product search backed by the ``products_fts`` FTS5 table.
+
+``products_fts`` is an external-content index over name, description and
+category (migration products_0004), kept in sync by triggers on products.
+User input is turned into a prefix query per token, so "coff mak" matches
+"Coffee Maker Deluxe". Results are ranked with BM25; a hit in the name
+weighs more than one in the category, which weighs more than the description.
+"""
+
+import re
+from typing import Optional
+
+# bm25() weights, in column order: name, description, category
+RANK_SQL = "bm25(products_fts, 10.0, 1.0, 2.0)"
+
+# Filter form (for counts and non-relevance sorts): restrict products to matching rows
+MATCH_FILTER_SQL = "id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?)"
+
+# Ranked form (sort=relevance): join products to the matches and their rank
+RANKED_JOIN_SQL = (
+    f"JOIN (SELECT rowid AS fts_id, {RANK_SQL} AS rank FROM products_fts WHERE products_fts MATCH ?) AS fts "
+    "ON fts.fts_id = products.id"
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(term: Optional[str]) -> Optional[str]:
+    """FTS5 query for free-text ``term``: every token must match as a prefix.
+
+    Returns None when ``term`` has no searchable tokens; callers then fall
+    back to a plain substring filter on the name.
+    """
+    tokens = _TOKEN.findall(term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
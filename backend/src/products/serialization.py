@@ -0,0 +1,107 @@
+"""Fast JSON rendering of product list pages straight from row tuples.
+
+``GET /products`` used to build a ``Product`` model per row and let FastAPI
+validate and serialize the whole ``PaginatedProducts`` again. Here each row
+is formatted into a precompiled template with the same encoders FastAPI's
+``JSONResponse`` ends up using (``json.dumps`` with ``ensure_ascii=False``
+and compact separators), so the bytes are identical to the model path.
+
+Rows are expected in ``PRODUCT_COLUMNS`` order, with the price as integer
+cents; the JSON keeps ``price`` as a number (``cents / 100``). A page is only rendered
+here when every row satisfies the ``Product`` model's field constraints;
+otherwise ``render_page`` returns None and the caller goes through the
+models, which keeps their validation errors as they were.
+"""
+
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+from .models import PaginatedProducts, Product
+
+PRODUCT_COLUMNS = ("id", "name", "price_cents", "stock", "category", "description", "is_active")
+
+# Same string encoder json.dumps(..., ensure_ascii=False) uses (the C one when available)
+_encode_str = json.encoder.encode_basestring
+_float_repr = float.__repr__
+
+# Field order of models.Product; timestamps are never selected by the listing
+_PRODUCT_TEMPLATE = (
+    '{"id":%d,"name":%s,"price":%s,"stock":%d,"category":%s,"description":%s,'
+    '"is_active":%s,"created_at":null,"updated_at":null}'
+)
+_PAGE_TEMPLATE = '{"items":[%s],"total":%s,"limit":%d,"offset":%d,"next_cursor":%s}'
+
+
+def row_fits_model(row: Sequence[Any]) -> bool:
+    """Would ``Product`` accept this row unchanged (types and Field constraints)?"""
+    id_, name, cents, stock, category, description, _active = row
+    return (
+        type(id_) is int
+        and type(name) is str and 0 < len(name) <= 255
+        and type(cents) is int and cents > 0
+        and type(stock) is int and stock >= 0
+        and type(category) is str and len(category) >= 1
+        and (description is None or (type(description) is str and len(description) <= 1000))
+    )
+
+
+def render_product(row: Sequence[Any]) -> str:
+    id_, name, cents, stock, category, description, active = row
+    return _PRODUCT_TEMPLATE % (
+        id_,
+        _encode_str(name),
+        _float_repr(cents / 100),
+        stock,
+        _encode_str(category),
+        _encode_str(description or ""),
+        "true" if active else "false",
+    )
+
+
+def render_page(
+    rows: Sequence[Sequence[Any]],
+    *,
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    next_cursor: Optional[str],
+) -> Optional[bytes]:
+    """JSON bytes of a ``PaginatedProducts`` page, or None if a row needs model validation."""
+    if not all(map(row_fits_model, rows)):
+        return None
+    return (
+        _PAGE_TEMPLATE % (
+            ",".join(map(render_product, rows)),
+            "null" if total is None else int(total),
+            limit,
+            offset,
+            "null" if next_cursor is None else _encode_str(next_cursor),
+        )
+    ).encode("utf-8")
+
+
+def render_page_with_models(
+    rows: Sequence[Sequence[Any]],
+    *,
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    next_cursor: Optional[str],
+) -> bytes:
+    """The validating path: ``Product`` models rendered the way FastAPI's JSONResponse does."""
+    products = [
+        Product(
+            id=p[0],
+            name=p[1],
+            price=None if p[2] is None else p[2] / 100,
+            stock=p[3],
+            category=p[4],
+            description=p[5] if p[5] else "",
+            is_active=bool(p[6]),
+        )
+        for p in rows
+    ]
+    page = PaginatedProducts(items=products, total=total, limit=limit, offset=offset, next_cursor=next_cursor)
+    return JSONResponse(page.model_dump(mode="json")).body
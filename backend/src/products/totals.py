@@ -0,0 +1,96 @@
+"""Cheap totals for paginated product queries.
+
+``total_mode`` lets clients choose what they pay for the ``total`` field:
+
+- ``exact``: filters that are only ``category`` (or nothing) read the
+  trigger-maintained ``product_counts`` row; other combinations run
+  ``COUNT(*)`` once per catalog version and are served from cache until a
+  write bumps ``catalog_version``.
+- ``estimate``: like ``exact``, but a cached count for the same filters is
+  reused for up to ``COUNT_ESTIMATE_TTL`` seconds even if writes happened.
+- ``none``: no total at all (``null``).
+
+Both the legacy router and ``SQLAlchemyProductRepository`` go through
+``resolve_total``; they pass a ``query_one(sql, params)`` callable for their
+connection type and a ``count`` callable that runs their own ``COUNT(*)``
+(the repository's also fetches the page in the same statement).
+"""
+
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from src.shared.config import get_settings
+from src.shared.count_cache import CountCache
+
+from .domain.value_objects import cents_at_least, cents_at_most
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+QueryOne = Callable[[str, Sequence[Any]], Optional[Sequence[Any]]]
+
+_settings = get_settings()
+count_cache = CountCache(
+    max_entries=_settings.COUNT_CACHE_SIZE,
+    estimate_ttl=_settings.COUNT_ESTIMATE_TTL,
+)
+
+
+def filters_key(database: str, filters: dict) -> Hashable:
+    """Normalized cache key for a filter combination on one database.
+
+    Prices are keyed by the whole-cent bounds the queries bind, so two
+    filters share a key exactly when they select the same rows.
+    """
+    return (
+        database,
+        filters.get("category") or None,
+        _cents_bound(filters.get("min_price"), cents_at_least),
+        _cents_bound(filters.get("max_price"), cents_at_most),
+        (filters.get("search") or "").strip().lower() or None,
+    )
+
+
+def resolve_total(
+    query_one: QueryOne,
+    *,
+    database: str,
+    filters: dict,
+    mode: str,
+    count: Callable[[], int],
+) -> Optional[int]:
+    if mode not in TOTAL_MODES:
+        raise ValueError(f"Unknown total_mode: {mode}")
+    if mode == "none":
+        return None
+
+    only_category = not any(filters.get(k) not in (None, "") for k in ("min_price", "max_price", "search"))
+    if only_category:
+        category = filters.get("category")
+        if category:
+            row = query_one(
+                "SELECT n FROM product_counts WHERE category = ? AND active = 1", (category,)
+            )
+        else:
+            row = query_one("SELECT SUM(n) FROM product_counts WHERE active = 1", ())
+        return int(row[0]) if row and row[0] is not None else 0
+
+    key = filters_key(database, filters)
+    if mode == "estimate":
+        cached = count_cache.peek(key)
+        if cached is not None:
+            return cached
+
+    version_row = query_one("SELECT version FROM catalog_version WHERE id = 1", ())
+    version = int(version_row[0]) if version_row else -1
+    cached = count_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    total = int(count())
+    count_cache.put(key, version, total)
+    return total
+
+
+def _cents_bound(value: Any, to_cents: Callable[[float], int]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return to_cents(value)
@@ -0,0 +1,68 @@
+"""Request-scoped batching of single-key lookups (the DataLoader pattern).
+
+``load(key)`` calls made in the same event-loop turn, e.g. from
+``asyncio.gather`` or from several helpers of one handler awaiting in parallel,
+are collected and resolved by one ``batch_load(keys)`` call, so N lookups
+cost one ``IN (...)`` query instead of N. Results are memoized for the
+loader's lifetime, which should be a single request.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 1000,
+    ) -> None:
+        self._batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._queue: List[K] = []
+        self._tasks: set = set()
+        self.batches = 0  # batch_load calls made, for tests and metrics
+
+    async def load(self, key: K) -> Optional[V]:
+        """Value for ``key``, or None when ``batch_load`` did not return it."""
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Dispatch after every coroutine already scheduled for this turn has queued its key
+                loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[K]) -> List[Optional[V]]:
+        """Values for ``keys`` in the same order (None for missing), in as few batches as possible."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            task = asyncio.get_running_loop().create_task(self._run(queue[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: List[K]) -> None:
+        self.batches += 1
+        try:
+            found = await self._batch_load(keys)
+        except Exception as exc:
+            for key in keys:
+                # Forget failures so a later load() can retry
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(found.get(key))
@@ -21,11 +21,64 @@ class Settings:
     
     # ❌ PROBLEMA: Database settings hardcodeados
     DATABASE_URL: str = "ecommerce.db"
-    
+
+    # SQLite connection pool and pragma tuning (see src/shared/connection_pool.py)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_CACHE_SIZE_KIB: int = int(os.getenv("DB_CACHE_SIZE_KIB", "16384"))
+    DB_MMAP_SIZE: int = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    # Threads used by async handlers for blocking DB calls (0 = DB_POOL_SIZE)
+    DB_EXECUTOR_WORKERS: int = int(os.getenv("DB_EXECUTOR_WORKERS", "0"))
+    # Per-statement stats and slow-query log with plans (see src/shared/query_log.py)
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "1") == "1"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_MAX_FINGERPRINTS: int = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+
+    # Health checks (see src/shared/health.py); /health/deep serves the last background result
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+    HEALTH_DB_LATENCY_WARN_MS: float = float(os.getenv("HEALTH_DB_LATENCY_WARN_MS", "50"))
+    HEALTH_POOL_SATURATION_WARN: float = float(os.getenv("HEALTH_POOL_SATURATION_WARN", "0.9"))
+    HEALTH_WAL_WARN_MB: float = float(os.getenv("HEALTH_WAL_WARN_MB", "64"))
+
+    # Listing totals (see src/products/totals.py)
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+    COUNT_ESTIMATE_TTL: float = float(os.getenv("COUNT_ESTIMATE_TTL", "60"))
+
+    # Catalog read cache (see src/shared/response_cache.py)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_STALE_TTL: float = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "300"))
+    RESPONSE_CACHE_SWR: bool = os.getenv("RESPONSE_CACHE_SWR", "1") == "1"
+    # Check catalog_version on every cached read; the supervisor turns it on for --workers > 1
+    RESPONSE_CACHE_VERSION_CHECK: bool = os.getenv("RESPONSE_CACHE_VERSION_CHECK", "0") == "1"
+
+    # Rows fetched per batch by GET /products/export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Product imports (see src/products/importer.py); server-side paths must live under IMPORT_DIRECTORY
+    IMPORT_DIRECTORY: str = os.getenv("IMPORT_DIRECTORY", "imports/")
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+    IMPORT_TRANSACTION_ROWS: int = int(os.getenv("IMPORT_TRANSACTION_ROWS", "100000"))
+
+    # Password hashing (see src/shared/password_hasher.py); stored hashes with another cost are rehashed on login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))  # 0 = CPU count
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "8"))  # waiting beyond this -> 503
+
     # ❌ PROBLEMA: JWT settings inseguros
     JWT_SECRET_KEY: str = "super-secret-key-that-should-not-be-hardcoded"  # ❌ INSEGURO!
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Key rotation (see src/shared/security.py): "kid1:secret1,kid2:secret2"; tokens are signed with
+    # JWT_ACTIVE_KID (default: first key) and verified with the key named by their "kid" header
+    JWT_KEYS: str = os.getenv("JWT_KEYS", "")
+    JWT_ACTIVE_KID: str = os.getenv("JWT_ACTIVE_KID", "")
+    # Verified-token cache (see src/shared/token_cache.py); entries never outlive the token's exp
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    TOKEN_CACHE_TTL: float = float(os.getenv("TOKEN_CACHE_TTL", "300"))
     
     # ❌ PROBLEMA: CORS settings muy permisivos
     CORS_ORIGINS: list = ["*"]  # ❌ Muy permisivo
@@ -45,7 +98,15 @@ class Settings:
     HOST: str = "0.0.0.0"  # ❌ Inseguro para producción
     PORT: int = 8000
     RELOAD: bool = True  # ❌ No para producción
-    
+
+    # Production serving (python main.py --workers N, see src/shared/server.py)
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "0"))  # 0 = CPU count
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "15"))  # seconds; above typical LB idle timeouts
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))  # drain time on shutdown
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", "0"))  # recycle a worker after N (0 = never)
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0"))
+
     # ❌ PROBLEMA: No logging configuration
     LOG_LEVEL: str = "INFO"
     
@@ -0,0 +1,284 @@
+"""Bounded, thread-aware SQLite connection pool with tuned pragmas.
+
+Every module that talks to SQLite directly (legacy products functions, the
+users repository, shared helpers) checks connections out of the pool that
+belongs to its database path instead of calling ``sqlite3.connect`` per call.
+"""
+
+import sqlite3
+import threading
+import time
+from urllib.parse import quote
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.shared.config import get_settings
+from src.shared.query_log import TracedConnection
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_size: int = 8
+    timeout: float = 30.0
+    busy_timeout_ms: int = 5000
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kib: int = 16384
+    mmap_size: int = 256 * 1024 * 1024
+    statement_cache_size: int = 256
+    foreign_keys: bool = True
+    # mode=ro URI plus query_only: any write fails with "attempt to write a readonly database"
+    read_only: bool = False
+    # Statements go through query_log (timings, slow-query log) on TracedConnection
+    trace_queries: bool = True
+
+    @classmethod
+    def from_settings(cls) -> "PoolConfig":
+        settings = get_settings()
+        return cls(
+            max_size=settings.DB_POOL_SIZE,
+            timeout=settings.DB_POOL_TIMEOUT,
+            busy_timeout_ms=settings.DB_BUSY_TIMEOUT_MS,
+            cache_size_kib=settings.DB_CACHE_SIZE_KIB,
+            mmap_size=settings.DB_MMAP_SIZE,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            trace_queries=settings.SLOW_QUERY_LOG_ENABLED,
+        )
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    waits: int = 0
+    wait_time_total: float = 0.0
+    timeouts: int = 0
+    connections_created: int = 0
+    same_thread_reuse: int = 0
+
+
+def configure_connection(conn: sqlite3.Connection, config: PoolConfig) -> None:
+    """Apply the pool pragmas to a freshly opened DB-API connection."""
+    conn.execute(f"PRAGMA busy_timeout = {int(config.busy_timeout_ms)}")
+    if config.read_only:
+        # The journal mode is the writers' business; a read-only handle cannot change it
+        conn.execute("PRAGMA query_only = ON")
+    else:
+        conn.execute(f"PRAGMA journal_mode = {config.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {config.synchronous}")
+    conn.execute(f"PRAGMA cache_size = {-int(config.cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size = {int(config.mmap_size)}")
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if config.foreign_keys else 'OFF'}")
+
+
+def open_connection(path: str, config: Optional[PoolConfig] = None) -> sqlite3.Connection:
+    """Open a standalone connection with the same tuning as pooled ones."""
+    config = config or PoolConfig.from_settings()
+    conn = sqlite3.connect(
+        f"file:{quote(path)}?mode=ro" if config.read_only else path,
+        timeout=config.busy_timeout_ms / 1000,
+        check_same_thread=False,
+        cached_statements=config.statement_cache_size,
+        uri=config.read_only,
+        factory=TracedConnection if config.trace_queries else sqlite3.Connection,
+    )
+    configure_connection(conn, config)
+    return conn
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections for a single database file.
+
+    - At most ``max_size`` connections are open; extra callers wait up to
+      ``timeout`` seconds and then get ``PoolTimeout``.
+    - A thread gets back the connection it used last when that one is idle,
+      which keeps SQLite's page cache and statement cache warm.
+    - Connections are returned with any open transaction rolled back.
+    """
+
+    def __init__(self, path: str, config: Optional[PoolConfig] = None) -> None:
+        self.path = path
+        self.config = config or PoolConfig.from_settings()
+        self._cond = threading.Condition()
+        self._idle: List[sqlite3.Connection] = []
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+        self._local = threading.local()
+        self._stats = PoolStats()
+
+    def acquire(self) -> sqlite3.Connection:
+        wait_started: Optional[float] = None
+        create = False
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            while True:
+                conn = self._take_idle()
+                if conn is not None:
+                    break
+                if self._open < self.config.max_size:
+                    self._open += 1
+                    create = True
+                    break
+                now = time.perf_counter()
+                if wait_started is None:
+                    wait_started = now
+                    self._stats.waits += 1
+                remaining = self.config.timeout - (now - wait_started)
+                if remaining <= 0:
+                    self._stats.timeouts += 1
+                    raise PoolTimeout(
+                        f"No SQLite connection available for {self.path!r} after {self.config.timeout}s"
+                    )
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._stats.checkouts += 1
+            if wait_started is not None:
+                self._stats.wait_time_total += time.perf_counter() - wait_started
+
+        if create:
+            try:
+                conn = open_connection(self.path, self.config)
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats.connections_created += 1
+
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy and not self._closed:
+                self._idle.append(conn)
+            else:
+                self._open -= 1
+                conn.close()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **asdict(self._stats),
+                "open_connections": self._open,
+                "idle_connections": len(self._idle),
+                "in_use_connections": self._in_use,
+                "max_size": self.config.max_size,
+            }
+
+    def _take_idle(self) -> Optional[sqlite3.Connection]:
+        if not self._idle:
+            return None
+        preferred = getattr(self._local, "conn", None)
+        if preferred is not None and preferred is not self._idle[-1]:
+            for index, candidate in enumerate(self._idle):
+                if candidate is preferred:
+                    self._stats.same_thread_reuse += 1
+                    return self._idle.pop(index)
+        conn = self._idle.pop()
+        if conn is preferred:
+            self._stats.same_thread_reuse += 1
+        return conn
+
+
+class PooledConnection:
+    """Proxy for callers that manage lifetime themselves; ``close()`` returns it to the pool."""
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool: ConnectionPool, conn: sqlite3.Connection) -> None:
+        self._pool = pool
+        self._conn = conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "PooledConnection":
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return self._conn.__exit__(exc_type, exc, tb)
+
+
+# ================
+# Pool registry
+# ================
+
+_pools: Dict[str, ConnectionPool] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool(path: str, *, read_only: bool = False) -> ConnectionPool:
+    """Return the process-wide pool for ``path``, creating it on first use.
+
+    ``read_only`` pools are separate (keyed ``file:<path>?mode=ro``) and hand
+    out connections that cannot write.
+    """
+    key = f"file:{path}?mode=ro" if read_only else path
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _registry_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            config = PoolConfig.from_settings()
+            pool = ConnectionPool(path, replace(config, read_only=True) if read_only else config)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    with _registry_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def all_pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {path: pool.stats() for path, pool in list(_pools.items())}
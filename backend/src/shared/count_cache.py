@@ -0,0 +1,65 @@
+"""Bounded cache of COUNT(*) results, validated by a data version number."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CountCache:
+    """LRU of ``key -> (version, count, stored_at)``.
+
+    ``get`` only returns a count recorded at the caller's current data
+    version, so any write that bumps the version invalidates every entry
+    without touching the cache. ``peek`` ignores the version and returns
+    entries younger than ``estimate_ttl`` seconds, for callers that accept
+    an approximate total.
+    """
+
+    def __init__(self, max_entries: int = 1024, estimate_ttl: float = 60.0) -> None:
+        self.max_entries = max_entries
+        self.estimate_ttl = estimate_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[int, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def peek(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[2] > self.estimate_ttl:
+                return None
+            self._entries.move_to_end(key)
+            self._stale_hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, count: int) -> None:
+        with self._lock:
+            self._entries[key] = (version, count, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "estimate_hits": self._stale_hits,
+                "misses": self._misses,
+            }
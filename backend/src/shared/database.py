@@ -1,6 +1,10 @@
 import sqlite3
 import os
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from src.shared.connection_pool import PooledConnection, all_pool_stats, close_all_pools, get_pool
+from src.shared.migrations import apply_migrations, registered_migrations
 
 # ❌ PROBLEMA: Configuración global básica sin validación
 DATABASE_PATH = "ecommerce.db"
@@ -16,42 +20,58 @@ def get_database_url() -> str:
 
 def get_connection() -> sqlite3.Connection:
     """
-    Get database connection - shared utility.
-    
-    ❌ PROBLEMA: No connection pooling
-    ❌ PROBLEMA: No configuración de performance
-    ❌ PROBLEMA: No timeout configuration
+    Get a pooled database connection - shared utility.
+
+    The returned object behaves like ``sqlite3.Connection``; ``close()``
+    hands it back to the pool instead of closing the file handle.
+    Prefer ``connection()`` so the connection is always released.
     """
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        
-        # ❌ PROBLEMA: Configuraciones básicas comentadas
-        # conn.execute("PRAGMA foreign_keys = ON")  # Should be enabled
-        # conn.execute("PRAGMA journal_mode = WAL")  # For better concurrency
-        # conn.execute("PRAGMA synchronous = NORMAL")  # For performance
-        
-        return conn
+        pool = get_pool(DATABASE_PATH)
+        return PooledConnection(pool, pool.acquire())
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         raise
 
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """Check out a pooled connection for DATABASE_PATH and release it on exit."""
+    with get_pool(DATABASE_PATH).connection() as conn:
+        yield conn
+
+def get_pool_stats() -> dict:
+    """Checkouts, waits and open/idle connections for every pool in this process."""
+    return all_pool_stats()
+
 def init_db():
     """
     Initialize all database tables.
-    
-    ❌ PROBLEMA: Solo inicializa products, no es escalable
-    ❌ PROBLEMA: No migration system
-    ❌ PROBLEMA: No version control de schema
+
+    Applies every registered migration (products, users, ...) in order,
+    recording versions in ``schema_migrations``; then finishes any deferred
+    import that was interrupted and seeds sample products.
+    Idempotent, so it runs on every startup.
     """
     try:
         print("🔧 Initializing shared database...")
+
+        with connection() as conn:
+            applied = apply_migrations(conn, registered_migrations())
+        if applied:
+            print(f"✅ Applied migrations: {', '.join(applied)}")
+
+        # Bring back indexes/triggers left dropped by an import that was killed mid-load
+        from src.products.importer import restore_deferred
+        with connection() as conn:
+            restored = restore_deferred(conn)
+        if restored:
+            print(f"✅ Restored after an interrupted import: {', '.join(restored)}")
         
-        # Initialize products table
+        # Seed sample products when the catalog is empty
         from src.products.database import init_database as init_products_db
         init_products_db()
         
         # ❌ PROBLEMA: No inicialización de otras tablas futuras:
-        # - users table
         # - orders table  
         # - order_items table
         # - categories table
@@ -65,24 +85,24 @@ def init_db():
 def check_db_health() -> dict:
     """
     Basic database health check.
-    
-    ❌ PROBLEMA: Health check muy básico
-    ❌ PROBLEMA: No métricas de performance
+
+    Counts come from ``product_counts`` (one row per category and state),
+    not ``COUNT(*)`` over products, so the cost does not grow with the
+    catalog. The API serves cheaper and richer checks: /livez, /readyz and
+    /health/deep (see src/shared/health.py).
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Check if we can query
-        cursor.execute("SELECT 1")
-        result = cursor.fetchone()
-        
-        # Check products table
-        cursor.execute("SELECT COUNT(*) FROM products")
-        products_count = cursor.fetchone()[0]
-        
-        conn.close()
-        
+        with connection() as conn:
+            cursor = conn.cursor()
+
+            # Check if we can query
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+
+            # Check products table
+            cursor.execute("SELECT IFNULL(SUM(n), 0) FROM product_counts")
+            products_count = cursor.fetchone()[0]
+
         return {
             "status": "healthy",
             "database_path": DATABASE_PATH,
@@ -105,9 +125,14 @@ def reset_database():
     ❌ PROBLEMA: No backup antes del reset
     """
     try:
+        # Pooled connections would keep the old file (and its WAL) alive
+        close_all_pools()
         if os.path.exists(DATABASE_PATH):
             print("⚠️  WARNING: Deleting existing database...")
             os.remove(DATABASE_PATH)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(DATABASE_PATH + suffix):
+                os.remove(DATABASE_PATH + suffix)
             
         print("🔧 Recreating database...")
         init_db()
@@ -118,9 +143,6 @@ def reset_database():
         raise
 
 # ❌ PROBLEMA: No funciones para:
-# - Connection pooling management
-# - Database migrations
-# - Schema versioning
 # - Backup/restore utilities
 # - Performance monitoring
 # - Connection cleanup
@@ -0,0 +1,396 @@
+"""Deterministic synthetic products and users, fast enough for 10M-row catalogs.
+
+Value distributions are decided in Python from ``random.Random(seed)`` and
+stored as small lookup tables (TEMP tables of 256-4096 slots). The rows
+themselves are produced inside SQLite: a recursive sequence is expanded in
+``batch_size`` chunks with ``INSERT ... SELECT``, and each column picks its
+slot with a seeded integer hash of the row number. No per-row Python, so
+millions of rows cost seconds, and the same seed always yields the same data
+(row ``n`` depends only on ``n`` and the seed).
+
+The distributions aim at what indexes, caches and pagination see in practice:
+
+- categories follow a Zipf law (a few huge, a long tail of small ones);
+- prices are log-normal (median ~$30, tail into the thousands), mostly
+  ``.99`` endings;
+- descriptions are 0-8 sentences of varying length (some missing);
+- names repeat: a Zipf-popular base name plus variants like "Pro",
+  "2-Pack" or a colour, and occasional lower-case duplicates;
+- about 5% of products and 3% of users are inactive, and 8% of products are
+  out of stock.
+
+With ``defer_indexes`` (the default) the secondary indexes and per-row
+triggers on ``products`` (FTS sync, counters) and the email index on
+``users`` are dropped for the load and rebuilt once at the end, as
+``src/products/importer.py`` does for imports.
+
+    python -m src.shared.datagen --database catalog.db --products 10000000 --users 100000
+
+From tests::
+
+    path = generate_database(tmp_path / "catalog.db", products=50_000, users=1_000, seed=7)
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from statistics import NormalDist
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.shared.connection_pool import PoolConfig, open_connection
+from src.shared.migrations import apply_migrations, registered_migrations
+
+DEFAULT_SEED = 42
+DEFAULT_PASSWORD = "password123"
+
+CATEGORIES = (
+    "Electronics", "Home", "Clothing", "Sports", "Books", "Beauty", "Toys", "Garden", "Food", "Automotive",
+    "Office", "Pet Supplies", "Health", "Shoes", "Jewelry", "Music", "Baby", "Tools", "Outdoors", "Crafts",
+)
+BRANDS = (
+    "Acme", "Northwind", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent",
+    "Tyrell", "Cyberdyne", "Aperture", "Wonka", "Gringotts", "Oscorp", "Massive", "Pied Piper", "Duff", "Monarch",
+)
+ADJECTIVES = (
+    "Compact", "Deluxe", "Classic", "Portable", "Smart", "Premium", "Rustic", "Ultra", "Eco", "Vintage",
+    "Pro", "Wireless", "Ergonomic", "Foldable", "Heavy-Duty", "Lightweight", "Modern", "Organic", "Waterproof", "Quiet",
+)
+NOUNS = (
+    "Lamp", "Kettle", "Backpack", "Speaker", "Blender", "Jacket", "Notebook", "Drone", "Helmet", "Candle",
+    "Teapot", "Monitor", "Sandals", "Puzzle", "Grill", "Scarf", "Router", "Headphones", "Chair", "Desk",
+    "Water Bottle", "Yoga Mat", "Toaster", "Keyboard", "Mouse", "Tent", "Sneakers", "Watch", "Wallet", "Pan",
+)
+VARIANTS = (
+    ("", 40), (" Pro", 8), (" Mini", 6), (" Max", 4), (" 2-Pack", 5), (" 3-Pack", 3), (" (Black)", 6),
+    (" (White)", 5), (" (Blue)", 4), (" (Red)", 3), (" XL", 3), (" v2", 3), (" - Refurbished", 2),
+    (" Gift Set", 2), (" Bundle", 2), (" Limited Edition", 1),
+)
+MATERIALS = (
+    "bamboo", "steel", "leather", "ceramic", "walnut", "linen", "aluminium", "glass", "cotton", "granite",
+    "copper", "wool", "marble", "recycled plastic", "silicone", "oak",
+)
+WORDS = (
+    "durable", "designed", "for", "everyday", "use", "with", "a", "sleek", "finish", "and", "easy", "to",
+    "clean", "surface", "perfect", "gift", "the", "whole", "family", "built", "last", "years", "of", "reliable",
+    "performance", "comfortable", "grip", "fits", "most", "spaces", "includes", "warranty", "tested", "by",
+    "experts", "lightweight", "travel", "ready", "energy", "efficient", "quiet", "operation", "simple", "setup",
+    "in", "minutes", "premium", "materials", "sourced", "responsibly", "handmade", "small", "batches",
+)
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Betty", "Mark", "Sandra", "Diego", "Ashley",
+    "Lucia", "Sofia", "Mateo", "Valentina", "Wei", "Yuki", "Aisha", "Omar", "Priya", "Arjun",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Godoy", "Chen", "Wang", "Kim", "Nguyen", "Patel", "Singh", "Khan", "Tanaka", "Silva",
+)
+EMAIL_DOMAINS = (
+    ("gmail.com", 35), ("outlook.com", 12), ("yahoo.com", 10), ("icloud.com", 8), ("hotmail.com", 6),
+    ("proton.me", 2), ("example.com", 10), ("acme.test", 5), ("university.edu", 4), ("mail.test", 8),
+)
+
+# Slot hash: two rounds of (x * a + c) mod a 31-bit prime; every product stays below 2**63
+_PRIME = 2_147_483_647
+# 2023-01-01T00:00:00Z; created_at spans three years from here
+_EPOCH = 1_672_531_200
+_SPAN = 3 * 365 * 86_400
+
+Progress = Callable[[str, int, int], None]
+
+
+class _Hasher:
+    """SQL expressions for seeded pseudo-random integers derived from a row number."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self._streams: Dict[str, Tuple[int, int, int, int]] = {}
+        self._rng = rng
+
+    def __call__(self, stream: str, expr: str = "n") -> str:
+        if stream not in self._streams:
+            self._streams[stream] = tuple(self._rng.randrange(1, _PRIME) for _ in range(4))  # type: ignore[assignment]
+        a, c, b, d = self._streams[stream]
+        return f"((((({expr}) * {a} + {c}) % {_PRIME}) * {b} + {d}) % {_PRIME})"
+
+    def pick(self, table: str, column: str, size: int, stream: str) -> str:
+        return f"(SELECT {column} FROM {table} WHERE slot = {self(stream)} % {size})"
+
+
+def _weighted_slots(items: Sequence, weights: Sequence[float], size: int, rng: random.Random) -> List:
+    """``size`` slots holding ``items`` in proportion to ``weights``, shuffled."""
+    total = float(sum(weights))
+    counts = [max(1, round(w / total * size)) for w in weights]
+    while sum(counts) > size:
+        counts[counts.index(max(counts))] -= 1
+    while sum(counts) < size:
+        counts[counts.index(max(counts))] += 1
+    slots = [item for item, count in zip(items, counts) for _ in range(count)]
+    rng.shuffle(slots)
+    return slots
+
+
+def _zipf(n: int, s: float = 1.1) -> List[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _load_table(conn: sqlite3.Connection, name: str, values: Sequence) -> int:
+    conn.execute(f"DROP TABLE IF EXISTS temp.{name}")
+    conn.execute(f"CREATE TEMP TABLE {name} (slot INTEGER PRIMARY KEY, value)")
+    conn.executemany(f"INSERT INTO temp.{name} (slot, value) VALUES (?, ?)", enumerate(values))
+    return len(values)
+
+
+def _price_slots(rng: random.Random, size: int = 4096) -> List[int]:
+    """Log-normal price quantiles in cents, mostly ending in .99."""
+    normal = NormalDist(mu=3.4, sigma=1.2)  # median e**3.4 ~ $30
+    prices = []
+    for i in range(size):
+        dollars = min(25_000.0, max(0.5, 2.718281828459045 ** normal.inv_cdf((i + 0.5) / size)))
+        if dollars >= 2 and rng.random() < 0.7:
+            cents = int(dollars) * 100 + 99 - 100
+        else:
+            cents = round(dollars * 20) * 5
+        prices.append(max(49, cents))
+    rng.shuffle(prices)
+    return prices
+
+
+def _stock_slots(rng: random.Random, size: int = 256) -> List[int]:
+    return [0 if rng.random() < 0.08 else min(5_000, int(rng.paretovariate(1.2) * 5)) for _ in range(size)]
+
+
+def _sentence_slots(rng: random.Random, size: int = 2048) -> List[str]:
+    sentences = []
+    for _ in range(size):
+        length = max(3, min(40, int(rng.lognormvariate(2.2, 0.5))))
+        words = rng.choices(WORDS, k=length)
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(MATERIALS))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return sentences
+
+
+def _name_slots(rng: random.Random, size: int = 4096) -> List[str]:
+    combos = [f"{brand} {adjective} {noun}" for brand in BRANDS for adjective in ADJECTIVES for noun in NOUNS]
+    rng.shuffle(combos)
+    # Zipf over a few thousand base names: popular ones repeat across many products
+    return rng.choices(combos[:3000], weights=_zipf(3000, 0.9), k=size)
+
+
+def _load_product_tables(conn: sqlite3.Connection, rng: random.Random) -> Dict[str, int]:
+    return {
+        "gen_category": _load_table(conn, "gen_category", _weighted_slots(CATEGORIES, _zipf(len(CATEGORIES), 1.2), 1024, rng)),
+        "gen_price": _load_table(conn, "gen_price", _price_slots(rng)),
+        "gen_stock": _load_table(conn, "gen_stock", _stock_slots(rng)),
+        "gen_name": _load_table(conn, "gen_name", _name_slots(rng)),
+        "gen_variant": _load_table(conn, "gen_variant", _weighted_slots(*zip(*VARIANTS), 256, rng)),
+        "gen_sentence": _load_table(conn, "gen_sentence", _sentence_slots(rng)),
+        # Sentences per description: 10% none, most 1-3, a tail up to 8
+        "gen_sentences": _load_table(
+            conn, "gen_sentences", _weighted_slots(range(9), (10, 30, 25, 15, 8, 5, 3, 2, 2), 256, rng)
+        ),
+    }
+
+
+def _products_sql(h: _Hasher, sizes: Dict[str, int]) -> str:
+    def pick(table: str, stream: str) -> str:
+        return h.pick(f"temp.{table}", "value", sizes[table], stream)
+
+    name = f"{pick('gen_name', 'name')} || {pick('gen_variant', 'variant')}"
+    sentences = [pick("gen_sentence", f"sentence{i}") for i in range(8)]
+    description = sentences[0] + "".join(
+        f" || CASE WHEN k > {i} THEN ' ' || {sentence} ELSE '' END" for i, sentence in enumerate(sentences[1:], 1)
+    )
+    created = f"datetime({_EPOCH} + {h('created')} % {_SPAN}, 'unixepoch')"
+    return f"""
+        WITH RECURSIVE seq(n) AS (SELECT ? UNION ALL SELECT n + 1 FROM seq WHERE n < ?),
+        generated AS (
+            SELECT n,
+                   {name} AS name,
+                   {pick('gen_price', 'price')} AS cents,
+                   {pick('gen_sentences', 'sentences')} AS k
+            FROM seq
+        )
+        INSERT INTO products (name, price, price_cents, stock, category, description, is_active, created_at, updated_at)
+        SELECT CASE WHEN {h('lower')} % 100 < 3 THEN lower(name) ELSE name END,
+               cents / 100.0,
+               cents,
+               {pick('gen_stock', 'stock')},
+               {pick('gen_category', 'category')},
+               CASE WHEN k = 0 THEN NULL ELSE {description} END,
+               CASE WHEN {h('active')} % 100 < 95 THEN 1 ELSE 0 END,
+               {created},
+               {created}
+        FROM generated
+    """
+
+
+def _load_user_tables(conn: sqlite3.Connection, rng: random.Random) -> Dict[str, int]:
+    return {
+        "gen_first": _load_table(conn, "gen_first", _weighted_slots(FIRST_NAMES, _zipf(len(FIRST_NAMES), 0.8), 512, rng)),
+        "gen_last": _load_table(conn, "gen_last", _weighted_slots(LAST_NAMES, _zipf(len(LAST_NAMES), 0.8), 512, rng)),
+        "gen_domain": _load_table(conn, "gen_domain", _weighted_slots(*zip(*EMAIL_DOMAINS), 256, rng)),
+    }
+
+
+def _users_sql(h: _Hasher, sizes: Dict[str, int]) -> str:
+    def pick(table: str, stream: str) -> str:
+        return h.pick(f"temp.{table}", "value", sizes[table], stream)
+
+    created = f"datetime({_EPOCH} + {h('user_created')} % {_SPAN}, 'unixepoch')"
+    return f"""
+        WITH RECURSIVE seq(n) AS (SELECT ? UNION ALL SELECT n + 1 FROM seq WHERE n < ?),
+        generated AS (
+            SELECT n, {pick('gen_first', 'first')} AS first, {pick('gen_last', 'last')} AS last FROM seq
+        )
+        INSERT INTO users (email, password_hash, name, is_active, created_at, updated_at)
+        SELECT lower(first) || '.' || lower(last) || n || '@' || {pick('gen_domain', 'domain')},
+               ?,
+               first || ' ' || last,
+               CASE WHEN {h('user_active')} % 100 < 97 THEN 1 ELSE 0 END,
+               {created},
+               {created}
+        FROM generated
+    """
+
+
+# The load can be rerun from scratch, so it skips fsyncs; its statements stay out of the query log
+BULK_CONFIG = PoolConfig(synchronous="OFF", cache_size_kib=256 * 1024, trace_queries=False)
+
+
+def _insert_batches(
+    conn: sqlite3.Connection, table: str, sql: str, count: int, batch_size: int,
+    extra: Tuple = (), progress: Optional[Progress] = None,
+) -> int:
+    # Continue the row numbering after existing rows: appending is deterministic too
+    start = conn.execute(f"SELECT IFNULL(MAX(rowid), 0) FROM {table}").fetchone()[0] + 1
+    done = 0
+    while done < count:
+        size = min(batch_size, count - done)
+        first = start + done
+        conn.execute(sql, (first, first + size - 1, *extra))
+        conn.commit()
+        done += size
+        if progress is not None:
+            progress(table, done, count)
+    return done
+
+
+def generate_products(
+    conn: sqlite3.Connection, count: int, *, seed: int = DEFAULT_SEED, batch_size: int = 500_000,
+    defer_indexes: bool = True, progress: Optional[Progress] = None,
+) -> int:
+    """Append ``count`` synthetic products; the schema must exist."""
+    from src.products.importer import drop_deferrable, finish_deferred
+
+    rng = random.Random(f"products:{seed}")
+    sql = _products_sql(_Hasher(random.Random(f"products-hash:{seed}")), _load_product_tables(conn, rng))
+    deferred = drop_deferrable(conn) if defer_indexes else []
+    try:
+        return _insert_batches(conn, "products", sql, count, batch_size, progress=progress)
+    finally:
+        if deferred:
+            finish_deferred(conn, deferred)
+
+
+def generate_users(
+    conn: sqlite3.Connection, count: int, *, seed: int = DEFAULT_SEED, password_hash: Optional[str] = None,
+    batch_size: int = 500_000, defer_indexes: bool = True, progress: Optional[Progress] = None,
+) -> int:
+    """Append ``count`` synthetic users sharing one password (``DEFAULT_PASSWORD`` unless ``password_hash``).
+
+    bcrypt salts each hash, so pass ``password_hash`` for byte-identical databases.
+    """
+    if password_hash is None:
+        from src.shared.config import get_settings
+        from src.shared.security import hash_password
+
+        password_hash = hash_password(DEFAULT_PASSWORD, rounds=get_settings().BCRYPT_ROUNDS)
+    rng = random.Random(f"users:{seed}")
+    sql = _users_sql(_Hasher(random.Random(f"users-hash:{seed}")), _load_user_tables(conn, rng))
+    # The UNIQUE constraint's own index stays: emails embed the row number, so they never collide
+    index = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_users_email'").fetchone()
+    if defer_indexes and index is not None:
+        conn.execute("DROP INDEX idx_users_email")
+        conn.commit()
+    try:
+        return _insert_batches(conn, "users", sql, count, batch_size, extra=(password_hash,), progress=progress)
+    finally:
+        if defer_indexes and index is not None:
+            conn.execute(index[0])
+            conn.commit()
+
+
+def generate_database(
+    database: Union[str, Path],
+    *,
+    products: int = 0,
+    users: int = 0,
+    seed: int = DEFAULT_SEED,
+    batch_size: int = 500_000,
+    defer_indexes: bool = True,
+    password_hash: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> Path:
+    """Apply the schema to ``database`` and append the requested synthetic rows; returns the path."""
+    conn = open_connection(str(database), BULK_CONFIG)
+    try:
+        apply_migrations(conn, registered_migrations())
+        if products:
+            generate_products(
+                conn, products, seed=seed, batch_size=batch_size, defer_indexes=defer_indexes, progress=progress
+            )
+        if users:
+            generate_users(
+                conn, users, seed=seed, password_hash=password_hash, batch_size=batch_size,
+                defer_indexes=defer_indexes, progress=progress,
+            )
+        if not defer_indexes:
+            conn.execute("ANALYZE")  # finish_deferred analyzes after a deferred load
+            conn.commit()
+    finally:
+        conn.close()
+    return Path(database)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.shared.database import DATABASE_PATH
+
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic catalog and user base.")
+    parser.add_argument("--database", default=DATABASE_PATH)
+    parser.add_argument("--products", type=int, default=0)
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--batch-size", type=int, default=500_000)
+    parser.add_argument("--keep-indexes", action="store_true", help="maintain indexes/FTS row by row (slower)")
+    parser.add_argument("--replace", action="store_true", help="delete the database file first")
+    args = parser.parse_args(argv)
+    if not args.products and not args.users:
+        parser.error("nothing to generate: pass --products and/or --users")
+
+    if args.replace:
+        for suffix in ("", "-wal", "-shm"):
+            Path(args.database + suffix).unlink(missing_ok=True)
+    started = time.perf_counter()
+
+    def report(table: str, done: int, total: int) -> None:
+        print(f"{table}: {done:,}/{total:,} ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    generate_database(
+        args.database, products=args.products, users=args.users, seed=args.seed,
+        batch_size=args.batch_size, defer_indexes=not args.keep_indexes, progress=report,
+    )
+    elapsed = time.perf_counter() - started
+    total = args.products + args.users
+    print(f"Generated {total:,} rows into {args.database} in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
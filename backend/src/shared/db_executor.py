@@ -0,0 +1,104 @@
+"""Dedicated, bounded thread pool for running blocking database calls from async code.
+
+FastAPI handlers are ``async def``; calling sqlite3 directly from them blocks
+the event loop. ``run_in_db`` hands the call to a small pool sized like the
+connection pool, so DB work never waits on both a thread and a connection,
+and records how long calls queue before a DB thread picks them up.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from src.shared.config import get_settings
+
+T = TypeVar("T")
+
+
+class DBExecutor:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._run_time_total = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` on a DB thread and await its result."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            if self._queued > self._max_queue_depth:
+                self._max_queue_depth = self._queued
+
+        def task() -> T:
+            started = time.perf_counter()
+            waited = started - submitted
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_time_total += waited
+                if waited > self._wait_time_max:
+                    self._wait_time_max = waited
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_time_total += elapsed
+
+        future = self._executor.submit(task)
+        future.add_done_callback(self._dequeue_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _dequeue_if_cancelled(self, future: "Future[Any]") -> None:
+        # Cancelled (the awaiting coroutine was) before a DB thread picked it up: task() never ran
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "completed": completed,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+                "wait_time_avg": self._wait_time_total / completed if completed else 0.0,
+                "run_time_total": self._run_time_total,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_executor: Optional[DBExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DBExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = get_settings()
+                _executor = DBExecutor(settings.DB_EXECUTOR_WORKERS or settings.DB_POOL_SIZE)
+    return _executor
+
+
+async def run_in_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await a blocking database function without stalling the event loop."""
+    return await get_db_executor().run(fn, *args, **kwargs)
@@ -0,0 +1,233 @@
+"""Liveness, readiness and deep health checks, sized for frequent probes.
+
+- ``/livez``: the process is up and its event loop answers. No I/O.
+- ``/readyz``: startup has finished (``readiness``), the connection pools can
+  hand out connections and every registered migration is applied. Applied
+  migrations stay applied, so ``schema_migrations`` is read only until the
+  check first passes for a database; after that a probe is a few lock-guarded
+  reads of pool state.
+- ``/health/deep``: ``DeepHealth`` measures DB latency, pool saturation, WAL
+  size and cache/executor stats on a background task every
+  ``HEALTH_CHECK_INTERVAL`` seconds; the endpoint serves the last result, so
+  probes never add database work of their own.
+
+Each worker answers for itself (its own pools, caches and checker).
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.shared.config import get_settings
+from src.shared.connection_pool import all_pool_stats, get_pool
+from src.shared.migrations import registered_migrations
+
+logger = logging.getLogger(__name__)
+
+# Databases whose migrations were all found applied
+_migrated: Set[str] = set()
+# Pool timeouts seen by the previous readiness probe, per pool
+_timeouts_seen: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def liveness() -> Dict[str, Any]:
+    return {"status": "alive", "pid": os.getpid()}
+
+
+def pending_versions(path: str) -> List[str]:
+    """Registered migration versions not recorded in ``path`` (read-only; no table is created)."""
+    expected = [m.version for m in registered_migrations()]
+    with get_pool(path, read_only=True).connection() as conn:
+        try:
+            applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+        except sqlite3.OperationalError:  # no schema_migrations table yet
+            applied = set()
+    return [version for version in expected if version not in applied]
+
+
+def pool_check(path: str, *, read_only: bool = False) -> Dict[str, Any]:
+    """Whether the pool can serve requests.
+
+    A busy pool is still available; it is not when it is closed, or when it
+    is exhausted and callers have timed out waiting since the previous probe.
+    """
+    pool = get_pool(path, read_only=read_only)
+    stats = pool.stats()
+    key = f"{path}?ro" if read_only else path
+    with _lock:
+        new_timeouts = stats["timeouts"] - _timeouts_seen.get(key, stats["timeouts"])
+        _timeouts_seen[key] = stats["timeouts"]
+    exhausted = stats["idle_connections"] == 0 and stats["open_connections"] >= stats["max_size"]
+    ok = not pool.closed and not (exhausted and new_timeouts > 0)
+    return {
+        "ok": ok,
+        "closed": pool.closed,
+        "in_use": stats["in_use_connections"],
+        "max_size": stats["max_size"],
+        "timeouts_since_last_probe": new_timeouts,
+    }
+
+
+async def readiness_checks(path: str) -> Dict[str, Dict[str, Any]]:
+    """Pool and migration checks for ``/readyz``; DB I/O only until migrations first check out."""
+    checks = {
+        "pool": pool_check(path),
+        "read_pool": pool_check(path, read_only=True),
+    }
+    if path in _migrated:
+        checks["migrations"] = {"ok": True, "pending": []}
+    else:
+        try:
+            pending = await asyncio.to_thread(pending_versions, path)
+        except Exception as e:
+            checks["migrations"] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        else:
+            if not pending:
+                _migrated.add(path)
+            checks["migrations"] = {"ok": not pending, "pending": pending}
+    return checks
+
+
+class DeepHealth:
+    """Background database/pool/cache checks whose last result is served as-is."""
+
+    def __init__(
+        self,
+        interval: float = 15.0,
+        latency_warn_ms: float = 50.0,
+        saturation_warn: float = 0.9,
+        wal_warn_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.interval = interval
+        self.latency_warn_ms = latency_warn_ms
+        self.saturation_warn = saturation_warn
+        self.wal_warn_bytes = wal_warn_bytes
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._runs = 0
+
+    @classmethod
+    def from_settings(cls) -> "DeepHealth":
+        settings = get_settings()
+        return cls(
+            interval=settings.HEALTH_CHECK_INTERVAL,
+            latency_warn_ms=settings.HEALTH_DB_LATENCY_WARN_MS,
+            saturation_warn=settings.HEALTH_POOL_SATURATION_WARN,
+            wal_warn_bytes=int(settings.HEALTH_WAL_WARN_MB * 1024 * 1024),
+        )
+
+    def add_stats(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """Include ``stats()`` (a cache's, an executor's, ...) in every deep check."""
+        self._sources[name] = stats
+
+    def check(self, path: str) -> Dict[str, Any]:
+        """Run every check now (blocking) and store the result."""
+        problems: List[str] = []
+        failing = False
+        try:
+            database = self._database(path)
+        except Exception as e:
+            database = {"error": f"{type(e).__name__}: {e}"}
+            problems.append(f"database: {database['error']}")
+            failing = True
+        else:
+            if database["latency_ms"] > self.latency_warn_ms:
+                problems.append(f"database latency {database['latency_ms']} ms > {self.latency_warn_ms} ms")
+            if database["wal_bytes"] > self.wal_warn_bytes:
+                problems.append(f"WAL is {database['wal_bytes']} bytes > {self.wal_warn_bytes}")
+
+        pools = {}
+        for name, stats in all_pool_stats().items():
+            saturation = stats["in_use_connections"] / stats["max_size"] if stats["max_size"] else 0.0
+            pools[name] = {**stats, "saturation": round(saturation, 3)}
+            if saturation >= self.saturation_warn:
+                problems.append(f"pool {name} is {saturation:.0%} in use")
+
+        components = {}
+        for name, stats in self._sources.items():
+            try:
+                components[name] = stats()
+            except Exception as e:
+                components[name] = {"error": f"{type(e).__name__}: {e}"}
+                problems.append(f"{name}: {components[name]['error']}")
+
+        result = {
+            "status": "failing" if failing else "degraded" if problems else "ok",
+            "problems": problems,
+            "database": database,
+            "pools": pools,
+            "components": components,
+        }
+        self._result, self._checked_at = result, time.time()
+        self._runs += 1
+        return result
+
+    def result(self) -> Dict[str, Any]:
+        """The last stored result with its age; "failing" when none is recent."""
+        result, checked_at = self._result, self._checked_at
+        if result is None or checked_at is None:
+            return {"status": "unknown", "problems": ["no deep health check has completed yet"], "checked_at": None}
+        age = time.time() - checked_at
+        if age > 3 * self.interval:
+            result = {**result, "status": "failing", "problems": [*result["problems"], "deep health check is stale"]}
+        return {**result, "checked_at": checked_at, "age_seconds": round(age, 3), "interval_seconds": self.interval}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"runs": self._runs, "interval": self.interval, "running": self._task is not None}
+
+    async def start(self, path: Callable[[], str]) -> None:
+        """Check once now, then every ``interval`` seconds on a background task."""
+        await asyncio.to_thread(self.check, path())
+        self._task = asyncio.create_task(self._loop(path))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _loop(self, path: Callable[[], str]) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.check, path())
+            except Exception:
+                # check() reports its own failures; this guards the loop itself
+                logger.exception("Deep health check crashed")
+
+    def _database(self, path: str) -> Dict[str, Any]:
+        pool = get_pool(path, read_only=True)
+        started = time.perf_counter()
+        with pool.connection() as conn:
+            checked_out = time.perf_counter()
+            # Reads the schema page: a real round trip through the pager, constant time at any size
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            finished = time.perf_counter()
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        try:
+            wal_bytes = os.path.getsize(f"{path}-wal")
+        except OSError:
+            wal_bytes = 0
+        return {
+            "latency_ms": round((finished - started) * 1000, 3),
+            "checkout_ms": round((checked_out - started) * 1000, 3),
+            "query_ms": round((finished - checked_out) * 1000, 3),
+            "size_bytes": page_size * page_count,
+            "free_bytes": page_size * freelist,
+            "wal_bytes": wal_bytes,
+        }
+
+
+deep_health = DeepHealth.from_settings()
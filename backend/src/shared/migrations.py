@@ -0,0 +1,101 @@
+"""Versioned schema migrations tracked in a ``schema_migrations`` table.
+
+Each bounded context declares an ordered list of ``Migration`` objects. The
+runner applies the ones not yet recorded, one transaction per migration, and
+refreshes planner statistics with ``ANALYZE`` when anything changed. It is safe
+to call on every startup and from several workers at once: migrations run
+under ``BEGIN IMMEDIATE`` and the applied set is re-read inside the lock.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Set
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    description: str
+    statements: Sequence[str] = ()
+    apply: Optional[Callable[[sqlite3.Connection], None]] = None
+
+
+def ensure_migrations_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.commit()
+
+
+def applied_versions(conn: sqlite3.Connection) -> Set[str]:
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+
+def pending_migrations(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> List[Migration]:
+    ensure_migrations_table(conn)
+    done = applied_versions(conn)
+    return [m for m in migrations if m.version not in done]
+
+
+def apply_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration],
+    *,
+    analyze: bool = True,
+) -> List[str]:
+    """Apply pending migrations in order and return the versions applied."""
+    _check_unique(migrations)
+    ensure_migrations_table(conn)
+    applied: List[str] = []
+
+    for migration in migrations:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            already = conn.execute(
+                "SELECT 1 FROM schema_migrations WHERE version = ?", (migration.version,)
+            ).fetchone()
+            if already:
+                conn.rollback()
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            if migration.apply is not None:
+                migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (migration.version, migration.description),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+
+    if applied and analyze:
+        conn.execute("ANALYZE")
+        conn.commit()
+    return applied
+
+
+def registered_migrations() -> List[Migration]:
+    """All migrations of every bounded context, in application order."""
+    from src.orders.infrastructure.migrations import MIGRATIONS as order_migrations
+    from src.products.migrations import MIGRATIONS as product_migrations
+    from src.users.infrastructure.migrations import MIGRATIONS as user_migrations
+
+    # Orders reference products and users
+    return [*product_migrations, *user_migrations, *order_migrations]
+
+
+def _check_unique(migrations: Sequence[Migration]) -> None:
+    seen: Set[str] = set()
+    for migration in migrations:
+        if migration.version in seen:
+            raise ValueError(f"Duplicate migration version: {migration.version}")
+        seen.add(migration.version)
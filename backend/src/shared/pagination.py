@@ -1,10 +1,16 @@
 """Generic pagination helpers (framework-agnostic)."""
 
+import base64
+import binascii
+import json
 from dataclasses import dataclass
-from typing import Generic, List, TypeVar
+from typing import Any, Generic, List, Optional, Tuple, TypeVar, Union
 
 T = TypeVar("T")
 
+# Keys and ids end up as SQLite INTEGER parameters
+_MAX_INT_KEY = 2**63 - 1
+
 
 @dataclass
 class Page(Generic[T]):
@@ -14,6 +20,48 @@ class Page(Generic[T]):
     offset: int
 
 
+@dataclass
+class CursorPage(Page[T]):
+    """Page that can also be continued with keyset pagination via ``next_cursor``."""
+    next_cursor: Optional[str] = None
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor is malformed or was issued for a different sort order."""
+
+
+def encode_cursor(sort: str, key: Any, last_id: int) -> str:
+    """Opaque cursor for the row after (``key``, ``last_id``) in ``sort`` order."""
+    payload = json.dumps([sort, key, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"{name} is not a valid cursor value")
+
+
+def _is_int_key(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and -_MAX_INT_KEY <= value <= _MAX_INT_KEY
 
 
+def decode_cursor(
+    cursor: str, *, sort: str, key_type: Union[type, Tuple[type, ...]] = int
+) -> Tuple[Any, int]:
+    """Return (sort key, id) of the last row of the previous page.
 
+    The key must be an instance of ``key_type`` (an int that fits SQLite's
+    INTEGER by default); anything else raises ``InvalidCursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = base64.urlsafe_b64decode(padded.encode("ascii"))
+        cursor_sort, key, last_id = json.loads(payload, parse_constant=_reject_constant)
+    except (ValueError, TypeError, binascii.Error) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    if not _is_int_key(last_id):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(key, key_type) or isinstance(key, bool) or (isinstance(key, int) and not _is_int_key(key)):
+        raise InvalidCursor("Malformed cursor")
+    return key, last_id
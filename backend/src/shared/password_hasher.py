@@ -0,0 +1,137 @@
+"""bcrypt hashing and checks on a bounded process pool, awaited from async code.
+
+One bcrypt call at cost 12 is roughly 250 ms of CPU. Run inline from an
+``async def`` handler it freezes every other request on the worker, so
+``PasswordHasher`` sends the work to a process pool sized to the cores.
+Admission is bounded: when ``workers + queue_size`` calls are already in
+flight, new ones fail fast with ``PasswordHasherBusy`` (the API answers 503)
+instead of queueing for seconds.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.shared.config import get_settings
+from src.shared.security import hash_password, password_needs_rehash, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing pool already has its maximum of calls in flight."""
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> Tuple[T, float]:
+    # Runs in a worker process; returns the CPU-side time so the caller can split wait from run
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+class PasswordHasher:
+    def __init__(self, *, workers: int, rounds: int, queue_size: int) -> None:
+        self.workers = workers
+        self.rounds = rounds
+        self.max_in_flight = workers + queue_size
+        # spawn: forking a process that runs DB threads can copy held locks into the child
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._max_in_flight_seen = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._run_time_total = 0.0
+        self._latency_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        if not isinstance(password, str) or password == "":
+            raise ValueError("Password must be a non-empty string")
+        return await self._run(partial(hash_password, rounds=self.rounds), password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        if not password or not hashed_password:
+            return False
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return password_needs_rehash(hashed_password, rounds=self.rounds)
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                raise PasswordHasherBusy(f"{self._in_flight} password hashing calls in flight")
+            self._in_flight += 1
+            if self._in_flight > self._max_in_flight_seen:
+                self._max_in_flight_seen = self._in_flight
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        try:
+            result, run_time = await loop.run_in_executor(self._executor, _timed, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        latency = time.perf_counter() - submitted
+        waited = max(0.0, latency - run_time)
+        with self._lock:
+            self._completed += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+            self._run_time_total += run_time
+            self._latency_max = max(self._latency_max, latency)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "max_in_flight_seen": self._max_in_flight_seen,
+                "rejected": self._rejected,
+                "completed": completed,
+                "wait_time_avg": self._wait_time_total / completed if completed else 0.0,
+                "wait_time_max": self._wait_time_max,
+                "run_time_avg": self._run_time_total / completed if completed else 0.0,
+                "latency_max": self._latency_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                settings = get_settings()
+                _hasher = PasswordHasher(
+                    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+                    rounds=settings.BCRYPT_ROUNDS,
+                    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+                )
+    return _hasher
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the pool's worker processes; the next ``get_password_hasher()`` starts a new one."""
+    global _hasher
+    with _hasher_lock:
+        hasher, _hasher = _hasher, None
+    if hasher is not None:
+        hasher.shutdown()
@@ -0,0 +1,298 @@
+"""Per-statement query statistics and a slow-query log with captured plans.
+
+Connections opened by the shared pool and the SQLAlchemy engines use
+``TracedConnection`` (unless ``SLOW_QUERY_LOG_ENABLED=0``), whose cursors time
+each statement from ``execute`` until its rows are consumed (or the cursor is
+closed) and report it to ``query_log``:
+
+- every statement is aggregated under its fingerprint (whitespace collapsed,
+  literals and ``IN``/``VALUES`` lists folded to ``?``), which backs the
+  top-N view at ``GET /metrics/queries``;
+- each fingerprint's ``EXPLAIN QUERY PLAN`` is captured on first sight (and
+  again after a minute), so full scans are flagged there straight away;
+- statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged with the
+  fingerprint, the bound-parameter types (never the values), the rows
+  fetched and the plan.
+
+Rows are counted through ``fetchone``/``fetchmany``/``fetchall``; iterating a
+cursor directly still times the statement but reports 0 rows.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.shared.config import get_settings
+from src.shared.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+slow_queries = registry.counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_THRESHOLD_MS")
+
+# A plan is re-captured after this long (indexes or ANALYZE may have changed it)
+_PLAN_TTL = 60.0
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.:?$@])\d+(?:\.\d+)?(?![\w.])")
+_SPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?(?:, \.\.\.)?\))(?:\s*,\s*\1)+")
+_EXPLAINABLE = re.compile(r"\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+
+_fingerprints: Dict[str, str] = {}
+_FINGERPRINT_CACHE_SIZE = 4096
+
+
+def fingerprint(sql: str) -> str:
+    """Normalized statement text: one fingerprint for every literal/list-length variant."""
+    cached = _fingerprints.get(sql)
+    if cached is not None:
+        return cached
+    normalized = _STRING.sub("?", sql)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _SPACE.sub(" ", normalized).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(?, ...)", normalized)
+    normalized = _REPEATED_ROWS.sub(r"\1, ...", normalized)
+    if len(_fingerprints) >= _FINGERPRINT_CACHE_SIZE:
+        _fingerprints.clear()
+    _fingerprints[sql] = normalized
+    return normalized
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Types of the bound parameters, e.g. ``(str, int)`` or ``(int x 500)``."""
+    if not parameters:
+        return "()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    types = [type(value).__name__ for value in parameters]
+    if len(types) > 8:
+        if len(set(types)) == 1:
+            return f"({types[0]} x {len(types)})"
+        types = types[:8] + [f"... {len(types)} total"]
+    return "(" + ", ".join(types) + ")"
+
+
+def explain(conn: sqlite3.Connection, sql: str, parameters: Any = ()) -> List[str]:
+    """``EXPLAIN QUERY PLAN`` as indented lines ([] for statements without a useful plan)."""
+    if not _EXPLAINABLE.match(sql):
+        return []
+    # A plain cursor: explaining must not be traced itself
+    rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ()).fetchall()
+    depth: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent, _unused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def is_full_scan(plan: List[str]) -> bool:
+    return any(
+        line.lstrip().startswith("SCAN ") and "VIRTUAL TABLE" not in line and "CONSTANT ROW" not in line
+        for line in plan
+    )
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    slow_calls: int = 0
+    plan: List[str] = field(default_factory=list)
+    plan_captured_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "total_ms": round(self.total_time * 1000, 3),
+            "avg_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "rows": self.rows,
+            "avg_rows": round(self.rows / self.calls, 1) if self.calls else 0.0,
+            "slow_calls": self.slow_calls,
+            "full_scan": is_full_scan(self.plan),
+            "plan": self.plan,
+        }
+
+
+class QueryLog:
+    """Statement statistics by fingerprint (bounded) plus slow-statement logging."""
+
+    def __init__(self, threshold_ms: float = 100.0, max_fingerprints: int = 500) -> None:
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "QueryLog":
+        settings = get_settings()
+        return cls(threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS, max_fingerprints=settings.SLOW_QUERY_MAX_FINGERPRINTS)
+
+    def is_slow(self, seconds: float) -> bool:
+        return seconds * 1000 >= self.threshold_ms
+
+    def needs_plan(self, sql: str) -> bool:
+        """True when the statement's fingerprint has no plan yet, or an old one."""
+        # Unlocked read on the hot path: at worst two threads explain the same statement
+        stats = self._stats.get(fingerprint(sql))
+        return stats is None or stats.plan_captured_at is None or time.monotonic() - stats.plan_captured_at > _PLAN_TTL
+
+    def record(self, sql: str, parameters: Any, seconds: float, rows: int, plan: Optional[List[str]] = None) -> None:
+        """Account one finished statement (with a freshly captured ``plan``, if any); log it when slow."""
+        key = fingerprint(sql)
+        slow = self.is_slow(seconds)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Forget the statement that has cost the least so far
+                    del self._stats[min(self._stats.values(), key=lambda s: s.total_time).fingerprint]
+                stats = self._stats[key] = QueryStats(key)
+            stats.calls += 1
+            stats.total_time += seconds
+            stats.max_time = max(stats.max_time, seconds)
+            stats.rows += rows
+            if plan is not None:
+                stats.plan = plan
+                stats.plan_captured_at = time.monotonic()
+            if slow:
+                stats.slow_calls += 1
+                plan = stats.plan
+        if slow:
+            slow_queries.inc()
+            logger.warning(
+                "Slow query: %.1f ms, %d rows, params %s\n  %s\n  plan:\n%s",
+                seconds * 1000,
+                rows,
+                parameter_shape(parameters),
+                key,
+                "\n".join(f"    {line}" for line in plan) or "    (none)",
+            )
+
+    def top(self, limit: int = 20, order_by: str = "total_time") -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda s: getattr(s, order_by), reverse=True)[:limit]
+            return [stats.as_dict() for stats in ranked]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "fingerprints": len(self._stats),
+                "max_fingerprints": self.max_fingerprints,
+                "slow_calls": sum(s.slow_calls for s in self._stats.values()),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_log = QueryLog.from_settings()
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to ``query_log`` once its rows are consumed."""
+
+    # [sql, parameters, seconds, rows, plan] of the statement whose rows are still being read
+    _statement: Optional[list] = None
+
+    def execute(self, sql: str, parameters: Any = ()) -> "TracedCursor":
+        self._finish()
+        started = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed = time.perf_counter() - started
+        self._statement = [sql, parameters, elapsed, 0, self._plan(sql, parameters)]
+        if self.description is None:
+            self._statement[3] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> "TracedCursor":
+        self._finish()
+        seq_of_parameters = list(seq_of_parameters)
+        started = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        elapsed = time.perf_counter() - started
+        first = seq_of_parameters[0] if seq_of_parameters else ()
+        query_log.record(sql, first, elapsed, max(self.rowcount, 0), self._plan(sql, first))
+        return self
+
+    def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = super().fetchone()
+        statement = self._statement
+        if statement is not None:
+            statement[2] += time.perf_counter() - started
+            if row is None:
+                self._finish()
+            else:
+                statement[3] += 1
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        statement = self._statement
+        if statement is not None:
+            statement[2] += time.perf_counter() - started
+            statement[3] += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchall()
+        statement = self._statement
+        if statement is not None:
+            statement[2] += time.perf_counter() - started
+            statement[3] += len(rows)
+            self._finish()
+        return rows
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        self._finish()
+
+    def _plan(self, sql: str, parameters: Any) -> Optional[List[str]]:
+        # Once per fingerprint (and plan TTL), right after execute while the connection is ours:
+        # a full scan is visible in the top-N view before it ever crosses the slow threshold
+        if not query_log.needs_plan(sql):
+            return None
+        try:
+            return explain(self.connection, sql, parameters)
+        except sqlite3.Error as e:
+            return [f"(EXPLAIN QUERY PLAN failed: {e})"]
+
+    def _finish(self) -> None:
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            query_log.record(*statement)
+
+
+class TracedConnection(sqlite3.Connection):
+    """``sqlite3.Connection`` whose cursors (including ``execute`` shortcuts) are ``TracedCursor``."""
+
+    def cursor(self, factory: Any = TracedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,191 @@
+"""In-process cache for read endpoints, invalidated through versioned namespaces.
+
+Every entry depends on one or more namespaces (e.g. ``products:list`` and
+``products:item:42``). A write calls ``bump`` on the namespaces it affects;
+that records a new write sequence number for them, and any entry loaded
+before that sequence is no longer served as fresh. Nothing is scanned or
+deleted on write, so invalidation is O(namespaces bumped).
+
+Entries are bounded by ``max_entries`` (LRU) and expire after ``ttl``
+seconds. For ``stale_ttl`` seconds after that they can still be used:
+
+- stale-while-revalidate: an expired but not invalidated entry is served
+  immediately while one background task reloads it;
+- stale-if-locked: when reloading fails with SQLite's "database is locked",
+  the last entry for the key is served even if a write invalidated it.
+
+The cache is per process, and ``bump`` only reaches the entries of the
+process that made the write. When several processes serve the same data
+(``--workers N``), pass ``version``: an async callable returning a value
+that every write changes, wherever it was made (e.g. the trigger-maintained
+``catalog_version``). Each entry stores the version read before its load,
+and a read serves it only while the version is unchanged, at the cost of
+one version read per request.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def is_database_locked(exc: BaseException) -> bool:
+    """True for SQLite busy/locked errors, raw, wrapped (e.g. by SQLAlchemy) or re-raised as another error."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc):
+            return True
+        seen.add(id(exc))
+        exc = getattr(exc, "orig", None) or exc.__cause__ or exc.__context__
+    return False
+
+
+@dataclass
+class _Entry:
+    value: Any
+    namespaces: Tuple[str, ...]
+    seq: int          # write sequence when the load started
+    loaded_at: float  # monotonic time when the load started
+    version: Hashable = None  # external version when the load started
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        stale_while_revalidate: bool = True,
+        enabled: bool = True,
+        version: Optional[Callable[[], Awaitable[Hashable]]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.enabled = enabled
+        self.version = version
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # namespace -> (write sequence of its last bump, monotonic time of that bump)
+        self._marks: Dict[str, Tuple[int, float]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "stale_on_locked": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "refreshes": 0,
+        }
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        namespaces: Sequence[str],
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Cached value for ``key``, calling ``loader`` on a miss."""
+        if not self.enabled:
+            return await loader()
+
+        namespaces = tuple(namespaces)
+        version = None if self.version is None else await self.version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.loaded_at > self.ttl + self.stale_ttl:
+                del self._entries[key]
+                entry = None
+            current = entry is not None and entry.version == version and self._is_current(entry)
+            if current and now - entry.loaded_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry.value
+            if current and self.stale_while_revalidate:
+                self._counters["stale_served"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.get_running_loop().create_task(self._refresh(key, namespaces, loader, version))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry.value
+            self._counters["misses"] += 1
+
+        try:
+            return await self._load(key, namespaces, loader, version)
+        except Exception as exc:
+            if entry is None or not is_database_locked(exc):
+                raise
+            with self._lock:
+                self._counters["stale_on_locked"] += 1
+            return entry.value
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate every entry that depends on any of ``namespaces``."""
+        now = time.monotonic()
+        with self._lock:
+            self._seq += 1
+            for namespace in namespaces:
+                self._marks[namespace] = (self._seq, now)
+            self._counters["invalidations"] += 1
+            if len(self._marks) > 4 * self.max_entries:
+                # A mark older than the longest entry lifetime can no longer invalidate anything
+                horizon = now - (self.ttl + self.stale_ttl)
+                self._marks = {ns: mark for ns, mark in self._marks.items() if mark[1] >= horizon}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "version_checked": self.version is not None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                **self._counters,
+            }
+
+    async def _load(
+        self, key: Hashable, namespaces: Tuple[str, ...], loader: Callable[[], Awaitable[T]], version: Hashable
+    ) -> T:
+        with self._lock:
+            seq = self._seq
+        loaded_at = time.monotonic()
+        value = await loader()
+        with self._lock:
+            entry = _Entry(value, namespaces, seq, loaded_at, version)
+            # A write that landed while we were loading makes this value stale already
+            if self._is_current(entry):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._counters["evictions"] += 1
+        return value
+
+    async def _refresh(
+        self, key: Hashable, namespaces: Tuple[str, ...], loader: Callable[[], Awaitable[Any]], version: Hashable
+    ) -> None:
+        try:
+            await self._load(key, namespaces, loader, version)
+            with self._lock:
+                self._counters["refreshes"] += 1
+        except Exception:
+            pass  # keep serving the stale entry; the next request past stale_ttl loads inline
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _is_current(self, entry: _Entry) -> bool:
+        return all(self._marks.get(ns, (0, 0.0))[0] <= entry.seq for ns in entry.namespaces)
@@ -1,12 +1,16 @@
 """Security helpers, JWT service and password hashing utilities."""
 
+import base64
+import json
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 import bcrypt
 import jwt
 
 from src.shared.config import get_jwt_secret, get_settings
+from src.shared.token_cache import TokenCache
 
 
 def get_cors_settings() -> dict:
@@ -31,6 +35,13 @@ def hash_password(password: str, *, rounds: int = 12) -> str:
     return hashed.decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str, *, rounds: int) -> bool:
+    """True when ``hashed_password`` was made with a bcrypt cost other than ``rounds``."""
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    parts = hashed_password.split("$")
+    return len(parts) != 4 or not parts[2].isdigit() or int(parts[2]) != rounds
+
+
 def verify_password(password: str, hashed_password: str) -> bool:
     if not password or not hashed_password:
         return False
@@ -44,6 +55,62 @@ def verify_password(password: str, hashed_password: str) -> bool:
 # JWT service
 # ============
 
+@dataclass(frozen=True)
+class JWTKeyring:
+    """Signing and verification keys, resolved once from settings.
+
+    Tokens are signed with ``active_kid`` and carry it in their ``kid``
+    header; verification picks the key by that header, so old and new keys
+    are both live during a rotation at the cost of one dict lookup. Tokens
+    without a ``kid`` (issued before rotation support) use the active key.
+    """
+
+    algorithm: str
+    active_kid: str
+    keys: Mapping[str, str]
+
+    @classmethod
+    def from_settings(cls) -> "JWTKeyring":
+        settings = get_settings()
+        keys: Dict[str, str] = {}
+        for entry in filter(None, (e.strip() for e in settings.JWT_KEYS.split(","))):
+            kid, sep, secret = entry.partition(":")
+            if not sep or not kid or not secret:
+                raise ValueError("JWT_KEYS entries must look like kid:secret")
+            keys[kid] = secret
+        if not keys:
+            keys["default"] = get_jwt_secret()
+        active_kid = settings.JWT_ACTIVE_KID or next(iter(keys))
+        if active_kid not in keys:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} is not in JWT_KEYS")
+        return cls(algorithm=settings.JWT_ALGORITHM, active_kid=active_kid, keys=keys)
+
+    def verification_key(self, kid: Optional[str]) -> str:
+        key = self.keys.get(self.active_kid if kid is None else kid)
+        if key is None:
+            raise ValueError("Invalid token")
+        return key
+
+
+_keyring: Optional[JWTKeyring] = None
+_settings = get_settings()
+token_cache = TokenCache(max_entries=_settings.TOKEN_CACHE_SIZE, ttl=_settings.TOKEN_CACHE_TTL)
+
+
+def get_keyring() -> JWTKeyring:
+    global _keyring
+    if _keyring is None:
+        _keyring = JWTKeyring.from_settings()
+    return _keyring
+
+
+def reset_keyring() -> None:
+    """Rebuild the keyring from settings on next use and drop cached verifications."""
+    global _keyring
+    _keyring = None
+    token_cache.clear()
+
+
 def create_token(
     data: Dict[str, Any],
     *,
@@ -54,37 +121,66 @@ def create_token(
 
     - `data` should be small, non-sensitive claims (e.g., {"sub": user_id}).
     - `expires_minutes` defaults to configured ACCESS_TOKEN_EXPIRE_MINUTES.
+    - Signed with the keyring's active key (``kid`` header) unless `secret` is given.
     """
-    settings = get_settings()
-    algorithm = getattr(settings, "JWT_ALGORITHM", "HS256")
-    expire_in = expires_minutes if expires_minutes is not None else getattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 30)
+    keyring = get_keyring()
+    expire_in = expires_minutes if expires_minutes is not None else _settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
     now = datetime.now(timezone.utc)
     payload = {**data, "iat": int(now.timestamp())}
     if expire_in and expire_in > 0:
         payload["exp"] = int((now + timedelta(minutes=expire_in)).timestamp())
 
-    secret_key = secret or get_jwt_secret()
-    token = jwt.encode(payload, secret_key, algorithm=algorithm)
+    if secret is not None:
+        return jwt.encode(payload, secret, algorithm=keyring.algorithm)
     # PyJWT returns str for modern versions
-    return token
+    return jwt.encode(
+        payload,
+        keyring.keys[keyring.active_kid],
+        algorithm=keyring.algorithm,
+        headers={"kid": keyring.active_kid},
+    )
 
 
 def verify_token(token: str, *, secret: Optional[str] = None) -> Dict[str, Any]:
-    """Verify and decode a JWT, raising ValueError on failure."""
+    """Verify and decode a JWT, raising ValueError on failure.
+
+    Keyring verifications are cached by token digest until the token's
+    ``exp`` (bounded by TOKEN_CACHE_TTL); an explicit `secret` bypasses the cache.
+    """
     if not token:
         raise ValueError("Token is required")
 
-    settings = get_settings()
-    algorithm = getattr(settings, "JWT_ALGORITHM", "HS256")
-    secret_key = secret or get_jwt_secret()
+    keyring = get_keyring()
+    if secret is not None:
+        return _decode(token, secret, keyring.algorithm)
+
+    cached = token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+    payload = _decode(token, keyring.verification_key(_token_kid(token)), keyring.algorithm)
+    token_cache.put(token, payload)
+    return dict(payload)
+
 
+def _token_kid(token: str) -> Optional[str]:
+    # Only picks the key; the signature check in _decode is what authenticates the header.
+    # Much cheaper than jwt.get_unverified_header, which validates the whole token layout.
+    segment = token.partition(".")[0]
     try:
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
-        return payload
+        header = json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid token") from exc
+    kid = header.get("kid") if isinstance(header, dict) else None
+    if kid is not None and not isinstance(kid, str):
+        raise ValueError("Invalid token")
+    return kid
+
+
+def _decode(token: str, key: str, algorithm: str) -> Dict[str, Any]:
+    try:
+        return jwt.decode(token, key, algorithms=[algorithm])
     except jwt.ExpiredSignatureError as exc:
         raise ValueError("Token has expired") from exc
     except jwt.InvalidTokenError as exc:
         raise ValueError("Invalid token") from exc
-
-
@@ -0,0 +1,179 @@
+"""Production serving: a pre-fork supervisor around uvicorn workers.
+
+The supervisor binds the listening socket once (with ``backlog``), prepares
+the database (migrations, seed data) before any worker exists, then spawns
+``workers`` processes that share the socket. Each worker opens its own
+connection pools and engines in the app lifespan; nothing SQLite-related is
+inherited across processes, which WAL mode requires.
+
+A worker that exits is replaced: after ``max_requests`` (plus a random
+jitter, so workers do not all recycle together) uvicorn finishes its
+in-flight requests and exits cleanly. On SIGTERM/SIGINT every worker gets
+SIGTERM, stops accepting, drains for up to ``graceful_timeout`` seconds and
+is killed only if it overstays.
+
+Each worker has its own in-process caches. With more than one worker the
+catalog cache is told to check ``catalog_version`` on every read
+(``RESPONSE_CACHE_VERSION_CHECK``, unless set explicitly), so a write
+handled by one worker is not served stale by the others.
+"""
+
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from src.shared.config import get_settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# A worker dying this soon after its start is failing to boot; wait before replacing it
+_CRASH_WINDOW = 1.0
+_CRASH_BACKOFF = 1.0
+
+
+@dataclass(frozen=True)
+class ServerOptions:
+    host: str
+    port: int
+    workers: int
+    backlog: int
+    keepalive: int
+    graceful_timeout: int
+    max_requests: int
+    max_requests_jitter: int
+    log_level: str
+
+    @classmethod
+    def from_settings(cls) -> "ServerOptions":
+        settings = get_settings()
+        return cls(
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=settings.SERVER_WORKERS or multiprocessing.cpu_count(),
+            backlog=settings.SERVER_BACKLOG,
+            keepalive=settings.SERVER_KEEPALIVE,
+            graceful_timeout=settings.SERVER_GRACEFUL_TIMEOUT,
+            max_requests=settings.SERVER_MAX_REQUESTS,
+            max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER,
+            log_level=settings.LOG_LEVEL.lower(),
+        )
+
+    def with_overrides(self, **overrides) -> "ServerOptions":
+        return replace(self, **{k: v for k, v in overrides.items() if v is not None})
+
+
+def build_config(options: ServerOptions, app: str = "main:app") -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=options.host,
+        port=options.port,
+        backlog=options.backlog,
+        timeout_keep_alive=options.keepalive,
+        timeout_graceful_shutdown=options.graceful_timeout,
+        log_level=options.log_level,
+        lifespan="on",
+    )
+
+
+def _serve(config: uvicorn.Config, sockets: List[socket.socket], max_requests: Optional[int]) -> None:
+    # Runs in a spawned worker process. Own process group: a terminal Ctrl-C reaches only the
+    # supervisor, which sends one SIGTERM (a second signal would make uvicorn skip the drain)
+    os.setpgrp()
+    config.limit_max_requests = max_requests
+    config.configure_logging()
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+class Supervisor:
+    def __init__(self, options: ServerOptions, app: str = "main:app") -> None:
+        self.options = options
+        self.app = app
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, "multiprocessing.process.BaseProcess"] = {}
+        self._started_at: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self.recycled = 0
+        self.crashed = 0
+
+    def run(self) -> int:
+        config = build_config(self.options, self.app)
+        config.configure_logging()
+        self._prepare_database()
+        # Spawned workers import the settings afresh and inherit this environment
+        os.environ.setdefault("RESPONSE_CACHE_VERSION_CHECK", "1" if self.options.workers > 1 else "0")
+        sock = config.bind_socket()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self._stop.set())
+        logger.info(f"Supervisor {multiprocessing.current_process().pid}: {self.options.workers} workers")
+        try:
+            for _ in range(self.options.workers):
+                self._spawn(config, sock)
+            while not self._stop.wait(0.2):
+                self._replace_exited(config, sock)
+        finally:
+            self._shutdown()
+            sock.close()
+        return 0
+
+    def _prepare_database(self) -> None:
+        # Once, before any worker exists: workers' own init_db then finds nothing to do,
+        # and no two workers race to seed an empty catalog
+        from src.shared.connection_pool import close_all_pools
+        from src.shared.database import init_db
+
+        init_db()
+        close_all_pools()
+
+    def _spawn(self, config: uvicorn.Config, sock: socket.socket) -> None:
+        max_requests = None
+        if self.options.max_requests > 0:
+            max_requests = self.options.max_requests + random.randint(0, max(0, self.options.max_requests_jitter))
+        process = self._context.Process(target=_serve, args=(config, [sock], max_requests), daemon=False)
+        process.start()
+        self._workers[process.pid] = process
+        self._started_at[process.pid] = time.monotonic()
+
+    def _replace_exited(self, config: uvicorn.Config, sock: socket.socket) -> None:
+        for pid, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            lifetime = time.monotonic() - self._started_at.pop(pid)
+            del self._workers[pid]
+            if process.exitcode == 0:
+                self.recycled += 1
+                logger.info(f"Worker {pid} recycled after {lifetime:.1f}s")
+            else:
+                self.crashed += 1
+                logger.warning(f"Worker {pid} exited with code {process.exitcode} after {lifetime:.1f}s")
+                if lifetime < _CRASH_WINDOW and self._stop.wait(_CRASH_BACKOFF):
+                    return
+            self._spawn(config, sock)
+
+    def _shutdown(self) -> None:
+        logger.info(f"Draining {len(self._workers)} workers (up to {self.options.graceful_timeout}s)")
+        for process in self._workers.values():
+            if process.is_alive():
+                process.terminate()  # SIGTERM: uvicorn stops accepting and drains
+        deadline = time.monotonic() + self.options.graceful_timeout + 5
+        for process in self._workers.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not drain in time; killing it")
+                process.kill()
+                process.join()
+        self._workers.clear()
+
+
+def serve(options: ServerOptions, app: str = "main:app") -> int:
+    """Run the app with ``options.workers`` supervised workers until SIGTERM/SIGINT."""
+    return Supervisor(options, app).run()
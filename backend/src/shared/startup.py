@@ -0,0 +1,92 @@
+"""Explicit application startup: ordered, timed steps and a readiness flag.
+
+Importing the app does no I/O. The FastAPI lifespan (main.py) runs the
+startup steps once per worker (logging, migrations, pools, engines, warm-up)
+and only then marks the process ready, which ``/readyz`` reports so load
+balancers keep traffic away from workers that are still booting.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ready = False
+        self._error: Optional[str] = None
+        self._steps: List[Tuple[str, float]] = []
+        self._started_at: Optional[float] = None
+        self._startup_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def begin(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._error = None
+            self._steps = []
+            self._started_at = time.perf_counter()
+            self._startup_seconds = None
+
+    def record(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self._steps.append((step, seconds))
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self._ready = True
+            if self._started_at is not None:
+                self._startup_seconds = time.perf_counter() - self._started_at
+
+    def mark_failed(self, error: BaseException) -> None:
+        with self._lock:
+            self._ready = False
+            self._error = f"{type(error).__name__}: {error}"
+
+    def mark_stopping(self) -> None:
+        with self._lock:
+            self._ready = False
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self._ready,
+                "error": self._error,
+                "startup_seconds": self._startup_seconds,
+                "steps": {name: round(seconds, 4) for name, seconds in self._steps},
+            }
+
+
+readiness = Readiness()
+
+Step = Tuple[str, Callable[[], Awaitable[None]]]
+
+
+async def run_startup(steps: List[Step]) -> None:
+    """Run ``steps`` in order, recording their durations; ready only if all succeed."""
+    readiness.begin()
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            readiness.mark_failed(e)
+            logger.exception(f"Startup step {name!r} failed")
+            raise
+        readiness.record(name, time.perf_counter() - started)
+    readiness.mark_ready()
+    logger.info(f"Startup completed in {readiness.status()['startup_seconds']:.3f}s")
+
+
+def configure_logging() -> None:
+    """Root logging at ``LOG_LEVEL``; a no-op when the root logger already has handlers."""
+    logging.basicConfig(level=getattr(logging, get_settings().LOG_LEVEL.upper(), logging.INFO))
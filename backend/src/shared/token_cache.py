@@ -0,0 +1,66 @@
+"""Bounded cache of verified JWT payloads, keyed by token digest."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenCache:
+    """LRU of ``sha256(token) -> (claims, expires_at)``.
+
+    An entry lives until the token's ``exp`` or ``ttl`` seconds after it was
+    verified, whichever comes first, so a cached token is never accepted past
+    its expiry and key removals take effect within ``ttl`` even without a
+    ``clear()``. Only digests are stored, never the tokens themselves.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        lifetime = self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            lifetime = min(lifetime, exp - time.time())
+        if lifetime <= 0 or self.max_entries <= 0:
+            return
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = (claims, time.monotonic() + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
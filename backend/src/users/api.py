@@ -0,0 +1,120 @@
+"""Signup and login endpoints.
+
+bcrypt runs on the shared ``PasswordHasher`` process pool, never on the event
+loop; when that pool is saturated the endpoints answer 503 with Retry-After.
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.shared.db_executor import run_in_db
+from src.shared.password_hasher import PasswordHasher, PasswordHasherBusy, get_password_hasher
+from src.shared.security import create_token, verify_token
+from .domain.entities import User as DomainUser
+from .infrastructure.repositories.user_repository_sqlite import SQLiteUserRepository
+from .models import AccessToken, LoginRequest, User, UserCreateRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+_BUSY = HTTPException(
+    status_code=503,
+    detail="Authentication is busy, retry shortly",
+    headers={"Retry-After": "1"},
+)
+_INVALID_CREDENTIALS = HTTPException(status_code=401, detail="Invalid email or password")
+
+_bearer = HTTPBearer(auto_error=False)
+
+# Hash checked for unknown emails so they cost the same bcrypt time as wrong passwords
+_dummy_hashes: Dict[int, str] = {}
+
+
+def get_user_repository() -> SQLiteUserRepository:
+    """User repository (overridable via ``app.dependency_overrides``)."""
+    return SQLiteUserRepository()
+
+
+async def get_token_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Dict[str, Any]:
+    """Claims of the request's bearer token; 401 when missing, invalid or expired."""
+    # async: verification is a cache lookup or one HMAC, cheaper than a threadpool hop
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return verify_token(credentials.credentials)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+
+async def _dummy_hash(hasher: PasswordHasher) -> str:
+    if hasher.rounds not in _dummy_hashes:
+        _dummy_hashes[hasher.rounds] = await hasher.hash("not-a-real-password")
+    return _dummy_hashes[hasher.rounds]
+
+
+def _to_api_user(user: DomainUser) -> User:
+    return User(id=user.id, email=user.email, full_name=user.name, is_active=user.is_active)
+
+
+@router.post("/register", response_model=User, status_code=201)
+async def register(
+    request: UserCreateRequest,
+    users: SQLiteUserRepository = Depends(get_user_repository),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+):
+    """Create a user; the password is stored as a bcrypt hash at the configured cost."""
+    try:
+        password_hash = await hasher.hash(request.password)
+    except PasswordHasherBusy:
+        raise _BUSY
+    user = DomainUser.create(email=request.email, password_hash=password_hash, name=request.full_name)
+    try:
+        user.id = await run_in_db(users.create_user, user)
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=409, detail="Email already registered")
+    return _to_api_user(user)
+
+
+@router.post("/login", response_model=AccessToken)
+async def login(
+    request: LoginRequest,
+    users: SQLiteUserRepository = Depends(get_user_repository),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+):
+    """
+    Exchange email and password for an access token.
+
+    A password stored with a bcrypt cost other than ``BCRYPT_ROUNDS`` is
+    rehashed at the current cost once it has been verified.
+    """
+    user = await run_in_db(users.get_user_by_email, request.email)
+    try:
+        if user is None or not user.is_active:
+            await hasher.verify(request.password, await _dummy_hash(hasher))
+            raise _INVALID_CREDENTIALS
+        valid = await hasher.verify(request.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _BUSY
+    if not valid:
+        raise _INVALID_CREDENTIALS
+    if hasher.needs_rehash(user.password_hash):
+        try:
+            new_hash = await hasher.hash(request.password)
+            await run_in_db(users.update_user, user.with_updates(password_hash=new_hash))
+        except Exception as e:
+            # The old hash still works; the next login tries again
+            logger.warning(f"Could not rehash password for user {user.id}: {e}")
+    return AccessToken(access_token=create_token({"sub": str(user.id)}))
+
+
+@router.get("/me", response_model=dict)
+async def me(claims: Dict[str, Any] = Depends(get_token_claims)):
+    """Identity of the bearer token."""
+    return {"user_id": int(claims["sub"]), "expires_at": claims.get("exp")}
@@ -0,0 +1,24 @@
+"""Schema migrations for the users table."""
+
+from src.shared.migrations import Migration
+
+MIGRATIONS = [
+    Migration(
+        version="users_0001",
+        description="Create users table",
+        statements=[
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT NOT NULL UNIQUE,
+                password_hash TEXT NOT NULL,
+                name TEXT,
+                is_active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+        ],
+    ),
+]
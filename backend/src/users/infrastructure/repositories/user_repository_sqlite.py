@@ -1,33 +1,13 @@
-"""SQLite implementation of UserRepository using shared connection utilities."""
+"""SQLite implementation of UserRepository using the shared connection pool."""
 
 from typing import Optional
 
-from sqlite3 import Connection
-
-from src.shared.database import get_connection
+from src.shared.database import connection
+from src.shared.metrics import timed_methods
 from ...application.ports import UserRepository
 from ...domain.entities import User
 
 
-def _ensure_schema(conn: Connection) -> None:
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            name TEXT,
-            is_active INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-    conn.commit()
-
-
 def _row_to_domain(row: tuple) -> User:
     return User(
         id=row[0],
@@ -40,18 +20,12 @@ def _row_to_domain(row: tuple) -> User:
     )
 
 
+@timed_methods("user_repository")
 class SQLiteUserRepository(UserRepository):
-    def __init__(self) -> None:
-        # Ensure table exists on first use
-        conn = get_connection()
-        try:
-            _ensure_schema(conn)
-        finally:
-            conn.close()
+    """Users on the shared connection pool; the table comes from migration users_0001."""
 
     def create_user(self, user: User) -> int:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -63,12 +37,9 @@ class SQLiteUserRepository(UserRepository):
             user_id = cur.lastrowid
             conn.commit()
             return int(user_id)
-        finally:
-            conn.close()
 
     def get_user_by_email(self, email: str) -> Optional[User]:
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -79,14 +50,11 @@ class SQLiteUserRepository(UserRepository):
             )
             row = cur.fetchone()
             return None if row is None else _row_to_domain(row)
-        finally:
-            conn.close()
 
     def update_user(self, user: User) -> None:
         if user.id is None:
             raise ValueError("User id is required for update")
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -97,8 +65,6 @@ class SQLiteUserRepository(UserRepository):
                 (user.email.lower(), user.password_hash, user.name, 1 if user.is_active else 0, user.id),
             )
             conn.commit()
-        finally:
-            conn.close()
 
 
 
@@ -16,7 +16,7 @@ class User(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat() if v else None
         }
-        schema_extra = {
+        json_schema_extra = {
             "example": {
                 "email": "jane.doe@example.com",
                 "full_name": "Jane Doe",
@@ -40,3 +40,12 @@ class UserUpdateRequest(BaseModel):
     password: Optional[str] = Field(None, min_length=8, max_length=128)
 
 
+class LoginRequest(BaseModel):
+    """Credentials for POST /auth/login."""
+    email: EmailStr
+    password: str = Field(..., min_length=1, max_length=128)
+
+
+class AccessToken(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
@@ -0,0 +1,21 @@
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="function")
+def client(tmp_path, monkeypatch) -> Generator[TestClient, None, None]:
+    # Point the products and shared DB modules to a temporary sqlite file and initialize schema + sample data
+    from src.products import database as pdb
+    from src.shared import database as shared_db
+
+    test_db_path = tmp_path / "test_products.db"
+    monkeypatch.setattr(pdb, "DATABASE_PATH", str(test_db_path), raising=False)
+    monkeypatch.setattr(shared_db, "DATABASE_PATH", str(test_db_path), raising=False)
+    pdb.init_database()
+
+    # The app's lifespan (startup) runs on entering the client, against the patched path
+    from main import app
+    with TestClient(app) as c:
+        yield c
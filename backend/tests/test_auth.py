@@ -0,0 +1,129 @@
+import asyncio
+import time
+from typing import Generator
+
+import bcrypt
+import jwt
+import pytest
+from fastapi.testclient import TestClient
+
+from src.shared.password_hasher import PasswordHasher, PasswordHasherBusy, get_password_hasher
+from src.shared.security import create_token, reset_keyring, token_cache, verify_token
+from src.shared.token_cache import TokenCache
+from src.users.infrastructure.repositories.user_repository_sqlite import SQLiteUserRepository
+
+
+@pytest.fixture(scope="module")
+def hasher() -> Generator[PasswordHasher, None, None]:
+    # Low cost keeps the suite fast; one worker process shared by the module
+    h = PasswordHasher(workers=1, rounds=4, queue_size=8)
+    yield h
+    h.shutdown()
+
+
+@pytest.fixture()
+def auth_client(client: TestClient, hasher: PasswordHasher) -> Generator[TestClient, None, None]:
+    client.app.dependency_overrides[get_password_hasher] = lambda: hasher
+    yield client
+    client.app.dependency_overrides.pop(get_password_hasher, None)
+
+
+def test_register_and_login(auth_client: TestClient):
+    resp = auth_client.post("/auth/register", json={"email": "Ana@Example.com", "password": "s3cret-pass", "full_name": "Ana"})
+    assert resp.status_code == 201
+    assert resp.json()["email"] == "ana@example.com"
+    assert auth_client.post("/auth/register", json={"email": "ana@example.com", "password": "other-pass"}).status_code == 409
+
+    ok = auth_client.post("/auth/login", json={"email": "ana@example.com", "password": "s3cret-pass"})
+    assert ok.status_code == 200 and ok.json()["token_type"] == "bearer"
+    assert auth_client.post("/auth/login", json={"email": "ana@example.com", "password": "wrong"}).status_code == 401
+    assert auth_client.post("/auth/login", json={"email": "nobody@example.com", "password": "x"}).status_code == 401
+
+
+def test_login_rehashes_when_cost_changes(auth_client: TestClient):
+    users = SQLiteUserRepository()
+    from src.users.domain.entities import User
+
+    old_hash = bcrypt.hashpw(b"legacy-pass", bcrypt.gensalt(5)).decode()
+    users.create_user(User.create(email="old@example.com", password_hash=old_hash))
+
+    assert auth_client.post("/auth/login", json={"email": "old@example.com", "password": "legacy-pass"}).status_code == 200
+    new_hash = users.get_user_by_email("old@example.com").password_hash
+    assert new_hash.startswith("$2b$04$") and bcrypt.checkpw(b"legacy-pass", new_hash.encode())
+
+
+def test_saturated_pool_rejects_instead_of_queueing():
+    hasher = PasswordHasher(workers=1, rounds=10, queue_size=1)
+
+    async def scenario():
+        return await asyncio.gather(*(hasher.hash(f"pw-{i}") for i in range(4)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 2
+    assert all(r.startswith("$2b$10$") for r in results if isinstance(r, str))
+    stats = hasher.stats()
+    assert (stats["completed"], stats["rejected"], stats["in_flight"]) == (2, 2, 0)
+    assert stats["max_in_flight_seen"] == 2 and stats["run_time_avg"] > 0
+
+
+@pytest.fixture()
+def keyring(monkeypatch):
+    from src.shared.config import Settings
+
+    def configure(keys: str, active: str = "") -> None:
+        monkeypatch.setattr(Settings, "JWT_KEYS", keys)
+        monkeypatch.setattr(Settings, "JWT_ACTIVE_KID", active)
+        reset_keyring()
+
+    yield configure
+    reset_keyring()  # rebuilt from the restored settings on next use
+
+
+def test_verified_tokens_are_cached_until_exp():
+    token = create_token({"sub": "7"})
+    before = token_cache.stats()
+    assert verify_token(token)["sub"] == "7"
+    claims = verify_token(token)
+    claims["sub"] = "tampered"  # callers get copies
+    assert verify_token(token)["sub"] == "7"
+    after = token_cache.stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (2, 1)
+
+    cache = TokenCache(ttl=60)
+    cache.put("short-lived", {"sub": "1", "exp": time.time() + 0.05})
+    cache.put("expired", {"sub": "1", "exp": time.time() - 1})
+    assert cache.get("short-lived")["sub"] == "1"
+    time.sleep(0.06)
+    assert cache.get("short-lived") is None and cache.get("expired") is None
+
+
+def test_kid_rotation_keeps_old_tokens_valid(keyring):
+    keyring("k1:first-secret-with-enough-bytes-0001")
+    old = create_token({"sub": "1"})
+    assert jwt.get_unverified_header(old)["kid"] == "k1"
+
+    keyring("k1:first-secret-with-enough-bytes-0001,k2:second-secret-with-enough-bytes-002", active="k2")
+    new = create_token({"sub": "2"})
+    assert jwt.get_unverified_header(new)["kid"] == "k2"
+    assert verify_token(old)["sub"] == "1" and verify_token(new)["sub"] == "2"
+
+    keyring("k2:second-secret-with-enough-bytes-002")
+    with pytest.raises(ValueError, match="Invalid token"):
+        verify_token(old)
+    forged = jwt.encode({"sub": "1"}, "second-secret-with-enough-bytes-002", algorithm="HS256", headers={"kid": "k3"})
+    with pytest.raises(ValueError, match="Invalid token"):
+        verify_token(forged)
+
+
+def test_me_requires_a_valid_bearer_token(auth_client: TestClient):
+    assert auth_client.get("/auth/me").status_code == 401
+    assert auth_client.get("/auth/me", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    auth_client.post("/auth/register", json={"email": "me@example.com", "password": "s3cret-pass"})
+    token = auth_client.post("/auth/login", json={"email": "me@example.com", "password": "s3cret-pass"}).json()["access_token"]
+    resp = auth_client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200 and resp.json()["user_id"] >= 1
@@ -0,0 +1,35 @@
+import json
+
+from benchmarks import suite
+from src.products.cache import catalog_cache
+
+
+def test_suite_writes_a_report_for_every_path_and_scenario(tmp_path):
+    output = tmp_path / "report.json"
+    cache_enabled = catalog_cache.enabled
+
+    assert suite.main([
+        "--sizes", "300", "--requests", "4", "--warmup", "1", "--concurrency", "2",
+        "--db-dir", str(tmp_path / "dbs"), "--output", str(output),
+    ]) == 0
+
+    report = json.loads(output.read_text())
+    assert report["meta"]["sizes"] == [300]
+    results = report["results"]["300"]
+    assert set(results) == {"legacy", "uow"}
+    for scenarios in results.values():
+        assert set(scenarios) == set(results["legacy"])
+        for stats in scenarios.values():
+            assert stats["errors"] == 0
+            assert stats["requests"] == 4
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+    # The seeded template is kept for the next run; per-path copies are not
+    assert [p.name for p in (tmp_path / "dbs").iterdir()] == ["catalog_300.db"]
+    assert catalog_cache.enabled == cache_enabled
+
+
+def test_workload_is_deterministic():
+    first, second = suite.Workload(1000, 50), suite.Workload(1000, 50)
+    assert first.read_ids == second.read_ids and first.delete_ids == second.delete_ids
+    assert len(set(first.delete_ids)) == 50
+    assert all(product_id % 10 for product_id in first.update_ids)  # only active products
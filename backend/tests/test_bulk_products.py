@@ -0,0 +1,72 @@
+from typing import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.products import database as pdb
+from src.products.api import get_uow
+from src.products.infrastructure.uow import SQLAlchemyUnitOfWork
+
+
+@pytest.fixture()
+def bulk_client(client: TestClient) -> Generator[TestClient, None, None]:
+    # The bulk endpoints go through SQLAlchemyUnitOfWork; bind it to the test database
+    engine = create_engine(f"sqlite:///{pdb.DATABASE_PATH}", future=True)
+    factory = sessionmaker(bind=engine, future=True)
+    client.app.dependency_overrides[get_uow] = lambda: SQLAlchemyUnitOfWork(factory)
+    yield client
+    client.app.dependency_overrides.pop(get_uow, None)
+    engine.dispose()
+
+
+def test_bulk_create_reports_each_item(bulk_client: TestClient):
+    resp = bulk_client.post("/products/bulk", json={"items": [
+        {"name": "Desk Lamp", "price": 25.5, "stock": 4, "category": "Home"},
+        {"name": "  ", "price": 10, "category": "Home"},
+        {"name": "Tent", "price": -1, "category": "Sports"},
+        {"name": "Camping Stove", "price": 60, "stock": 2, "category": "Sports"},
+    ]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["succeeded"], data["failed"]) == (2, 2)
+    assert [r["ok"] for r in data["results"]] == [True, False, False, True]
+
+    created = bulk_client.get(f"/products/{data['results'][3]['id']}").json()
+    assert created["name"] == "Camping Stove" and created["price"] == 60
+    assert bulk_client.get("/products", params={"category": "Home"}).json()["total"] == 4
+
+
+def test_bulk_rejects_amounts_too_large_to_store(bulk_client: TestClient):
+    resp = bulk_client.post("/products/bulk", json={"items": [
+        {"name": "Yacht", "price": 1e30, "category": "Sports"},
+        {"name": "Pebbles", "price": 1, "stock": 99999999999999999999, "category": "Garden"},
+        {"name": "Kayak", "price": 450, "stock": 1, "category": "Sports"},
+    ]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["error"] for r in data["results"]] == ["Price is too large", "Stock is too large", None]
+
+    kayak = data["results"][2]["id"]
+    resp = bulk_client.patch("/products/bulk", json={"items": [{"id": kayak, "price": 1e30}]})
+    assert resp.json()["results"][0]["error"] == "Price is too large"
+    assert bulk_client.get(f"/products/{kayak}").json()["price"] == 450
+
+
+def test_bulk_update_and_delete(bulk_client: TestClient):
+    ids = [p["id"] for p in bulk_client.get("/products", params={"category": "Home"}).json()["items"]]
+
+    resp = bulk_client.patch("/products/bulk", json={"items": [
+        {"id": ids[0], "price": 9.5},
+        {"id": ids[1], "stock": -3},
+        {"id": 999999, "name": "Ghost"},
+    ]})
+    assert [r["error"] for r in resp.json()["results"]][::2] == [None, "Product not found"]
+    assert resp.json()["results"][1]["ok"] is False
+    assert bulk_client.get(f"/products/{ids[0]}").json()["price"] == 9.5
+
+    resp = bulk_client.request("DELETE", "/products/bulk", json={"ids": [ids[0], ids[2], 999999]})
+    assert [r["ok"] for r in resp.json()["results"]] == [True, True, False]
+    assert bulk_client.get("/products", params={"category": "Home"}).json()["total"] == 1
+    assert bulk_client.get(f"/products/{ids[0]}").status_code == 404
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from src.shared.connection_pool import ConnectionPool, PoolConfig, PoolTimeout
+
+
+@pytest.fixture()
+def pool(tmp_path):
+    p = ConnectionPool(str(tmp_path / "pool.db"), PoolConfig(max_size=2, timeout=0.2))
+    yield p
+    p.close()
+
+
+def test_connections_are_tuned(pool: ConnectionPool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == pool.config.busy_timeout_ms
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_same_thread_gets_its_connection_back(pool: ConnectionPool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["connections_created"] == 1
+    assert stats["open_connections"] == 1
+    assert stats["idle_connections"] == 1
+
+
+def test_pool_is_bounded_and_times_out(pool: ConnectionPool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+    # A waiter is woken up as soon as a connection is released
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    pool.release(held.pop())
+    waiter.join(timeout=1)
+    assert got and pool.stats()["waits"] == 2
+
+    for conn in held + got:
+        pool.release(conn)
+    assert pool.stats()["open_connections"] == 2
+
+
+def test_release_rolls_back_open_transaction(pool: ConnectionPool):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
@@ -0,0 +1,89 @@
+import sqlite3
+from collections import Counter
+
+import pytest
+
+from src.shared.datagen import generate_database
+
+# A fixed hash keeps bcrypt out of the fixtures (and makes the rows byte-identical)
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuxV6Se5ubfz1h6Wk5dUYnWLb4j0cz7O."
+
+
+@pytest.fixture(scope="module")
+def synthetic_db(tmp_path_factory):
+    """A 20k-product, 500-user catalog shared by the tests of a module."""
+    path = tmp_path_factory.mktemp("datagen") / "catalog.db"
+    return generate_database(path, products=20_000, users=500, seed=7, batch_size=6_000, password_hash=PASSWORD_HASH)
+
+
+def _rows(path, sql):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_same_seed_same_rows(synthetic_db, tmp_path):
+    other = generate_database(
+        tmp_path / "again.db", products=1_000, users=50, seed=7, batch_size=300, password_hash=PASSWORD_HASH
+    )
+    different = generate_database(tmp_path / "other.db", products=1_000, seed=8, password_hash=PASSWORD_HASH)
+
+    products = "SELECT * FROM products WHERE id <= 1000 ORDER BY id"
+    users = "SELECT * FROM users WHERE id <= 50 ORDER BY id"
+    assert _rows(other, products) == _rows(synthetic_db, products)
+    assert _rows(other, users) == _rows(synthetic_db, users)
+    assert _rows(different, products) != _rows(other, products)
+
+
+def test_distributions_are_skewed(synthetic_db):
+    by_category = Counter(dict(_rows(synthetic_db, "SELECT category, COUNT(*) FROM products GROUP BY 1")))
+    (top, top_n), *_rest, (_bottom, bottom_n) = by_category.most_common()
+    assert len(by_category) == 20 and top_n > 10 * bottom_n
+
+    ((median, p99, maximum),) = _rows(
+        synthetic_db,
+        "SELECT (SELECT price_cents FROM products ORDER BY price_cents LIMIT 1 OFFSET 10000),"
+        " (SELECT price_cents FROM products ORDER BY price_cents LIMIT 1 OFFSET 19800), MAX(price_cents) FROM products",
+    )
+    assert 1_500 < median < 6_000 and p99 > 10 * median and maximum > p99
+    assert all(price == round(price_cents / 100, 2) for price, price_cents in _rows(
+        synthetic_db, "SELECT price, price_cents FROM products LIMIT 500"
+    ))
+
+    ((missing, shortest, longest, distinct_names, inactive),) = _rows(
+        synthetic_db,
+        "SELECT SUM(description IS NULL), MIN(length(description)), MAX(length(description)),"
+        " COUNT(DISTINCT name), SUM(is_active = 0) FROM products",
+    )
+    assert 0 < missing < 4_000 and longest > 10 * shortest
+    assert distinct_names < 15_000  # popular names repeat
+    assert 500 < inactive < 1_500
+
+
+def test_indexes_triggers_and_derived_tables_are_restored(synthetic_db):
+    names = {r[0] for r in _rows(synthetic_db, "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    assert {
+        "idx_products_active_category_id", "trg_products_fts_insert", "trg_products_counts_insert", "idx_users_email"
+    } <= names
+
+    counts = dict(
+        ((category, active), n) for category, active, n in _rows(synthetic_db, "SELECT * FROM product_counts")
+    )
+    actual = _rows(synthetic_db, "SELECT category, is_active, COUNT(*) FROM products GROUP BY 1, 2")
+    assert counts == {(category, active): n for category, active, n in actual}
+
+    ((matches,),) = _rows(synthetic_db, "SELECT COUNT(*) FROM products_fts WHERE products_fts MATCH 'lamp'")
+    ((expected,),) = _rows(synthetic_db, "SELECT COUNT(*) FROM products WHERE name LIKE '%lamp%'")
+    assert matches >= expected > 0
+
+
+def test_users_have_unique_emails_and_usable_passwords(synthetic_db):
+    ((total, distinct, hashes),) = _rows(
+        synthetic_db, "SELECT COUNT(*), COUNT(DISTINCT email), COUNT(DISTINCT password_hash) FROM users"
+    )
+    assert total == distinct == 500 and hashes == 1
+    email, name = _rows(synthetic_db, "SELECT email, name FROM users WHERE id = 1")[0]
+    first, last = name.lower().split(" ")
+    assert email.startswith(f"{first}.{last}1@")
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+from src.shared.db_executor import DBExecutor
+
+
+def test_blocking_calls_do_not_stall_the_event_loop():
+    executor = DBExecutor(max_workers=2)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(executor.run(time.sleep, 0.05) for _ in range(4)))
+        task.cancel()
+        return ticks, results
+
+    try:
+        ticks, results = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert results == [None] * 4
+    assert ticks >= 10  # the loop kept running while the sleeps were in progress
+    stats = executor.stats()
+    assert stats["completed"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] >= 2  # 4 submitted to 2 workers
+    assert stats["wait_time_max"] > 0
+
+
+def test_cancelled_calls_leave_the_queue():
+    executor = DBExecutor(max_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.create_task(executor.run(release.wait))
+        waiting = asyncio.create_task(executor.run(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queue_depth"] == 1
+        waiting.cancel()  # e.g. the client went away before a DB thread was free
+        await asyncio.sleep(0)
+        release.set()
+        await busy
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats["queue_depth"], stats["running"], stats["completed"]) == (0, 0, 1)
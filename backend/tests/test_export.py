@@ -0,0 +1,105 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.products.export import stream_export
+from src.products.migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+from src.shared.connection_pool import close_all_pools, get_pool
+from src.shared.migrations import apply_migrations
+
+
+def test_export_formats_follow_listing_filters(client: TestClient):
+    params = {"category": "Electronics", "limit": 100}
+    listed = client.get("/products", params=params).json()["items"]
+
+    resp = client.get("/products/export", params={"category": "Electronics"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    assert exported == [{k: p[k] for k in exported[0]} for p in listed]
+
+    resp = client.get("/products/export", params={"category": "Electronics", "format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [int(r["id"]) for r in rows] == [p["id"] for p in listed]
+    assert rows[0]["is_active"] == "true"
+
+
+def test_client_leaving_mid_fetch_releases_the_connection(client: TestClient, monkeypatch):
+    from src.products import database as pdb
+    from src.products import export
+
+    def slow_batches(*args):
+        for rows in pdb.iter_products_from_db(*args):
+            yield rows
+            time.sleep(0.2)  # the next batch is still being fetched when the client leaves
+
+    monkeypatch.setattr(export, "iter_products_from_db", slow_batches)
+    pool = get_pool(pdb.DATABASE_PATH)
+
+    async def scenario():
+        stream = stream_export("ndjson", "is_active = 1", [], 2)
+        await stream.__anext__()
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_use_connections"] == 1
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        return pool.stats()["in_use_connections"]
+
+    assert asyncio.run(scenario()) == 0
+
+
+def _rss_bytes() -> int:
+    # Anonymous RSS only: SQLite's mmap'd database pages are file-backed page cache, not our memory
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("RssAnon not reported")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc to read RSS")
+def test_export_of_one_million_rows_uses_flat_memory(tmp_path, monkeypatch):
+    from src.products import database as pdb
+
+    db_path = str(tmp_path / "export.db")
+    conn = sqlite3.connect(db_path)
+    apply_migrations(conn, PRODUCT_MIGRATIONS[:1])  # plain table: fast to seed, same export query
+    conn.execute("ALTER TABLE products ADD COLUMN price_cents INTEGER")
+    conn.execute(
+        """
+        WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 1000000)
+        INSERT INTO products (name, price, price_cents, stock, category, description, is_active)
+        SELECT 'Product ' || n, n % 1000 + 0.99, (n % 1000) * 100 + 99, n % 50, 'Bulk', 'Row number ' || n || ' of the export test', 1
+        FROM seq
+        """
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(pdb, "DATABASE_PATH", db_path, raising=False)
+
+    async def consume():
+        lines = size = 0
+        baseline = peak = _rss_bytes()
+        async for chunk in stream_export("ndjson", "is_active = 1", [], 1000):
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+            peak = max(peak, _rss_bytes())
+        return lines, size, peak - baseline
+
+    try:
+        lines, size, rss_growth = asyncio.run(consume())
+    finally:
+        close_all_pools()
+
+    assert lines == 1_000_000
+    assert size > 100 * 1024 * 1024
+    assert rss_growth < 32 * 1024 * 1024
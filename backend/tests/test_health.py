@@ -0,0 +1,77 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from src.products import database as pdb
+from src.shared import health
+from src.shared.connection_pool import get_pool
+from src.shared.health import DeepHealth, deep_health
+from src.shared.migrations import Migration
+
+
+def test_livez_does_no_io(client: TestClient, monkeypatch):
+    monkeypatch.setattr(health, "get_pool", None)  # any pool access would raise
+    resp = client.get("/livez")
+    assert resp.status_code == 200 and resp.json()["status"] == "alive"
+
+
+def test_readyz_checks_pools_and_migrations_once(client: TestClient, monkeypatch):
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    checks = resp.json()["checks"]
+    assert checks["pool"]["ok"] and checks["read_pool"]["ok"] and checks["migrations"] == {"ok": True, "pending": []}
+
+    # Once migrations have checked out, later probes do not read schema_migrations again
+    monkeypatch.setattr(health, "pending_versions", None)
+    assert client.get("/readyz").status_code == 200
+
+
+def test_readyz_fails_on_pending_migrations_and_closed_pools(client: TestClient, monkeypatch):
+    monkeypatch.setattr(health, "_migrated", set())
+    extra = Migration("zz_9999", "not applied yet", ("SELECT 1",))
+    registered = health.registered_migrations()
+    monkeypatch.setattr(health, "registered_migrations", lambda: [*registered, extra])
+    resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.json()["checks"]["migrations"] == {"ok": False, "pending": ["zz_9999"]}
+
+    monkeypatch.setattr(health, "registered_migrations", lambda: registered)
+    get_pool(pdb.DATABASE_PATH).close()
+    resp = client.get("/readyz")
+    assert resp.status_code == 503
+    pool = resp.json()["checks"]["pool"]
+    assert not pool["ok"] and pool["closed"]
+
+
+def test_deep_health_serves_the_background_result(client: TestClient, monkeypatch):
+    runs = deep_health.stats()["runs"]
+    first = client.get("/health/deep")
+    second = client.get("/health/deep")
+    assert first.status_code == second.status_code == 200
+    body = second.json()
+    assert body["status"] in ("ok", "degraded") and body["checked_at"] == first.json()["checked_at"]
+    assert deep_health.stats()["runs"] == runs  # probes did not trigger checks
+    assert {"latency_ms", "wal_bytes", "size_bytes"} <= set(body["database"])
+    assert {"catalog_cache", "count_cache", "db_executor"} <= set(body["components"])
+    assert all("saturation" in pool for pool in body["pools"].values())
+
+
+def test_deep_health_grades_problems(tmp_path):
+    path = str(tmp_path / "deep.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE t (x)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.commit()
+
+    checker = DeepHealth(interval=60, wal_warn_bytes=0)
+    assert checker.result()["status"] == "unknown"
+    result = checker.check(path)
+    assert result["status"] == "degraded" and any("WAL" in p for p in result["problems"])
+
+    checker.add_stats("broken_cache", lambda: 1 / 0)
+    get_pool(path, read_only=True).close()
+    result = checker.check(path)
+    assert result["status"] == "failing"
+    assert result["components"]["broken_cache"] == {"error": "ZeroDivisionError: division by zero"}
+    conn.close()
@@ -0,0 +1,100 @@
+import io
+import json
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+from src.products import database as pdb
+from src.products.importer import drop_deferrable, import_products
+from src.shared import database as shared_db
+
+CSV = (
+    "name,price,stock,category,description\n"
+    "Garden Hose,24.90,10,Garden,Expandable hose\n"
+    ",5,1,Garden,missing name\n"
+    "Rake,abc,1,Garden,bad price\n"
+    "Trowel,7.5,,Garden,\n"
+    "Seeds,2,-4,Garden,negative stock\n"
+    "Shed,1e30,1,Garden,price beyond a 64-bit integer\n"
+    "Pots,3,99999999999999999999,Garden,stock beyond a 64-bit integer\n"
+)
+
+
+def test_import_validates_each_record_and_defers_indexes(client: TestClient):
+    stats = import_products(
+        io.BytesIO(CSV.encode()), "csv", database=pdb.DATABASE_PATH, chunk_size=2, defer_indexes=True
+    )
+
+    assert (stats.status, stats.rows_read, stats.rows_imported, stats.rows_rejected) == ("completed", 7, 2, 5)
+    assert [r["line"] for r in stats.rejected_samples] == [3, 4, 6, 7, 8]
+
+    # Indexes, triggers, FTS and counters are back and consistent after the deferred load
+    conn = sqlite3.connect(pdb.DATABASE_PATH)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    conn.close()
+    assert {"idx_products_active_category_id", "trg_products_fts_insert", "trg_products_counts_insert"} <= names
+    assert client.get("/products", params={"category": "Garden"}).json()["total"] == 2
+    assert client.get("/products", params={"search": "hose"}).json()["items"][0]["name"] == "Garden Hose"
+
+
+def test_interrupted_deferred_load_is_finished_at_startup(client: TestClient):
+    conn = sqlite3.connect(pdb.DATABASE_PATH)
+    drop_deferrable(conn)
+    # The process dies mid-load: rows went in without the FTS/counter triggers
+    conn.execute("INSERT INTO products (name, price, price_cents, stock, category) VALUES ('Hammock', 40, 4000, 1, 'Outdoor')")
+    conn.commit()
+    conn.close()
+
+    shared_db.init_db()
+
+    conn = sqlite3.connect(pdb.DATABASE_PATH)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    pending = conn.execute("SELECT COUNT(*) FROM import_deferred_ddl").fetchone()[0]
+    conn.close()
+    assert {"idx_products_active_category_id", "trg_products_fts_insert", "trg_products_counts_insert"} <= names
+    assert pending == 0
+    assert client.get("/products", params={"search": "hammock"}).json()["total"] == 1
+
+
+def _wait_for_import(client: TestClient, status_url: str) -> dict:
+    for _ in range(100):
+        status = client.get(status_url).json()
+        if status["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.05)
+    return status
+
+
+def test_import_job_drops_cached_lists_and_products(client: TestClient):
+    product = client.get("/products", params={"limit": 1}).json()["items"][0]
+    assert client.get(f"/products/{product['id']}").json()["name"] == product["name"]
+    total = client.get("/products").json()["total"]
+
+    # A write the cache was not told about, then an import that knows no ids
+    conn = sqlite3.connect(pdb.DATABASE_PATH)
+    conn.execute("UPDATE products SET name = 'Renamed' WHERE id = ?", (product["id"],))
+    conn.commit()
+    conn.close()
+    upload = ("catalog.csv", b"name,price,category\nLamp,12,Home\n", "text/csv")
+    resp = client.post("/products/import", data={"format": "csv"}, files={"file": upload})
+    assert _wait_for_import(client, resp.json()["status_url"])["status"] == "completed"
+
+    assert client.get(f"/products/{product['id']}").json()["name"] == "Renamed"
+    assert client.get("/products").json()["total"] == total + 1
+
+
+def test_import_job_endpoint_reports_progress(client: TestClient):
+    lines = [json.dumps({"name": f"Bulk {i}", "price": 3, "category": "Toys"}) for i in range(50)]
+    lines.append("{not json")
+    upload = ("catalog.ndjson", "\n".join(lines).encode(), "application/x-ndjson")
+
+    resp = client.post("/products/import", data={"format": "ndjson"}, files={"file": upload})
+    assert resp.status_code == 202
+
+    status = _wait_for_import(client, resp.json()["status_url"])
+    assert (status["status"], status["rows_imported"], status["rows_rejected"]) == ("completed", 50, 1)
+    assert status["progress"] == 1.0
+    assert client.get("/products", params={"category": "Toys"}).json()["total"] == 50
+
+    assert client.post("/products/import", data={"format": "csv", "path": "../../etc/passwd"}).status_code == 400
@@ -0,0 +1,115 @@
+import importlib.util
+import re
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.shared.metrics import Registry, registry, timed_query
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _sample(text: str, name: str, default=None, **labels: str) -> float:
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    pattern = "^" + re.escape(name + (f"{{{wanted}}}" if wanted else "")) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    if match is None and default is not None:
+        return default
+    assert match, f"{name}{{{wanted}}} not in output"
+    return float(match.group(1))
+
+
+def test_histogram_buckets_are_cumulative_across_threads():
+    local = Registry()
+    latency = local.histogram("op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0))
+    child = latency.labels("read")
+
+    def observe():
+        for value in (0.05, 0.5, 5.0):
+            child.observe(value)
+
+    threads = [threading.Thread(target=observe) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = local.render()
+    assert "# TYPE op_seconds histogram" in text
+    assert _sample(text, "op_seconds_bucket", op="read", le="0.1") == 4
+    assert _sample(text, "op_seconds_bucket", op="read", le="1.0") == 8
+    assert _sample(text, "op_seconds_bucket", op="read", le="+Inf") == 12
+    assert _sample(text, "op_seconds_count", op="read") == 12
+    assert _sample(text, "op_seconds_sum", op="read") == pytest.approx(4 * 5.55)
+
+
+def test_label_values_are_escaped_and_arity_checked():
+    local = Registry()
+    errors = local.counter("errors_total", "Errors", ("reason",))
+    errors.labels('bad "quote"\n').inc(2)
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 2' in local.render()
+    with pytest.raises(ValueError):
+        errors.labels("a", "b")
+    with pytest.raises(ValueError):
+        local.counter("errors_total", "Duplicate")
+
+
+def test_timed_query_counts_errors_and_times_generators():
+    @timed_query("test.failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    @timed_query("test.batches")
+    def batches():
+        yield [1]
+        yield [2]
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert list(batches()) == [[1], [2]]
+    early = batches()
+    assert next(early) == [1]
+    early.close()  # a consumer that stops reading is not a failed query
+
+    text = registry.render()
+    assert _sample(text, "db_query_errors_total", function="test.failing") == 1
+    assert _sample(text, "db_query_duration_seconds_count", function="test.failing") == 1
+    assert _sample(text, "db_query_duration_seconds_count", function="test.batches") == 2
+    assert _sample(text, "db_query_errors_total", function="test.batches") == 0
+
+
+def test_metrics_endpoint_reports_route_templates_queries_and_pools(client: TestClient):
+    series = dict(method="GET", route="/products/{product_id}", status="200")
+    count_before = _sample(client.get("/metrics").text, "http_requests_total", default=0.0, **series)
+
+    assert client.get("/products/1").status_code == 200
+    assert client.get("/products/2").status_code == 200
+    assert client.get("/no-such-route").status_code == 404
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    # Path parameters stay templated: one series for every product id
+    assert _sample(text, "http_requests_total", **series) == count_before + 2
+    assert "/products/1" not in text
+    assert _sample(text, "http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route="/products/{product_id}") >= 2
+    assert _sample(text, "http_requests_in_flight") == 1  # the scrape itself
+    assert _sample(text, "db_query_duration_seconds_count", function="products.get_product_by_id") >= 2
+    assert re.search(r'^db_pool_max_size\{pool="[^"]+"\} \d+$', text, re.MULTILINE)
+    assert "db_executor_max_workers" in text
+    assert "catalog_cache_entries" in text
+    assert "token_cache_entries" in text
+
+
+def test_every_sample_is_exposed_once_even_if_main_is_imported_twice(client: TestClient):
+    # A spawned worker imports main.py as __mp_main__, then uvicorn imports main:app again
+    spec = importlib.util.spec_from_file_location("main_imported_again", BACKEND_DIR / "main.py")
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+
+    samples = [line for line in client.get("/metrics").text.splitlines() if line and not line.startswith("#")]
+    assert "catalog_cache_hits" in "\n".join(samples)
+    assert len(samples) == len(set(line.rsplit(" ", 1)[0] for line in samples))
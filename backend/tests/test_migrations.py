@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from src.products.migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+from src.shared.migrations import Migration, apply_migrations, pending_migrations
+
+
+def _connect(tmp_path) -> sqlite3.Connection:
+    return sqlite3.connect(str(tmp_path / "migrations.db"))
+
+
+def test_migrations_are_recorded_and_idempotent(tmp_path):
+    conn = _connect(tmp_path)
+
+    first = apply_migrations(conn, PRODUCT_MIGRATIONS)
+    second = apply_migrations(conn, PRODUCT_MIGRATIONS)
+
+    assert first == [m.version for m in PRODUCT_MIGRATIONS]
+    assert second == []
+    assert pending_migrations(conn, PRODUCT_MIGRATIONS) == []
+    versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    assert versions == sorted(m.version for m in PRODUCT_MIGRATIONS)
+    # ANALYZE ran after applying
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(tmp_path):
+    conn = _connect(tmp_path)
+    broken = Migration(
+        version="test_0001",
+        description="half-applied",
+        statements=["CREATE TABLE t (x INTEGER)", "INSERT INTO missing_table VALUES (1)"],
+    )
+
+    with pytest.raises(sqlite3.OperationalError):
+        apply_migrations(conn, [broken])
+
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 't'").fetchone() is None
+    assert [m.version for m in pending_migrations(conn, [broken])] == ["test_0001"]
+
+
+def test_listing_query_shapes_use_indexes(tmp_path):
+    conn = _connect(tmp_path)
+    apply_migrations(conn, PRODUCT_MIGRATIONS)
+
+    def plan(sql, params):
+        return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    by_category = plan(
+        "SELECT id FROM products WHERE is_active = 1 AND category = ? ORDER BY id LIMIT 20", ("Home",)
+    )
+    by_price = plan(
+        "SELECT id FROM products WHERE is_active = 1 AND price_cents >= ? AND price_cents <= ? ORDER BY id LIMIT 20",
+        (1000, 2000),
+    )
+
+    assert "idx_products_active_category_id" in by_category
+    assert "TEMP B-TREE" not in by_category
+    assert "idx_products_active_" in by_price
@@ -0,0 +1,93 @@
+import sqlite3
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.products.application.dto import ListProductsFilters
+from src.products.application.use_cases.list_products import list_products
+from src.products.domain.value_objects import MAX_STORED_INTEGER, Money, cents_at_least, cents_at_most, format_cents
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork
+from src.products.migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+from src.shared.migrations import apply_migrations
+
+
+@pytest.mark.parametrize("amount", [
+    "0", "0.1", "0.10", "19.99", "1.", "  5.5 ", "1.005", "1.015", "2.675", "0.125",
+    "1e2", "+3.1", "-0.001", "123456789012.345", "0.999999", 7, 1.1, 2.675,
+])
+def test_cents_match_decimal_quantize(amount):
+    expected = Decimal(amount).quantize(Decimal("0.01"))
+    money = Money(amount)
+
+    assert money.value == expected
+    assert money.cents == int(expected.scaleb(2))
+    assert Money(str(money)) == money
+
+
+@pytest.mark.parametrize("amount", ["abc", "", "1,50", None, "-1", "-0.01"])
+def test_invalid_or_negative_amounts_are_rejected(amount):
+    with pytest.raises(ValueError):
+        Money(amount)
+
+
+def test_every_cent_round_trips_through_strings_and_floats():
+    cents = list(range(0, 200_000)) + [10**15 + 1, 2**53 - 1]
+    amounts = format_cents(cents)
+
+    assert amounts[:3] == ["0.00", "0.01", "0.02"] and amounts[199_999] == "1999.99"
+    assert [Money(a).cents for a in amounts] == cents
+    assert all(str(Money.from_cents(c)) == a for c, a in zip(cents, amounts))
+    # The REAL mirror (cents / 100) maps back to the same cents
+    assert all(round(c / 100 * 100) == c for c in cents[:200_000])
+
+
+def test_range_bounds_are_the_tightest_whole_cents():
+    assert (cents_at_least(0.1 + 0.2), cents_at_most(0.1 + 0.2)) == (31, 30)
+    assert (cents_at_least(1.1), cents_at_most(1.1)) == (110, 110)
+    assert (cents_at_least(10.005), cents_at_most(10.005)) == (1001, 1000)
+    assert (cents_at_least(1e300), cents_at_most(1e300)) == (MAX_STORED_INTEGER, MAX_STORED_INTEGER)
+
+
+def test_huge_price_bounds_are_clamped(client: TestClient):
+    assert client.get("/products", params={"min_price": 1e300}).json()["total"] == 0
+    everything = client.get("/products").json()["total"]
+    assert client.get("/products", params={"max_price": 1e300}).json()["total"] == everything
+
+    uow = SQLAlchemyReadOnlyUnitOfWork()
+    with uow:
+        page = list_products(uow, filters=ListProductsFilters(min_price="1e300"), limit=5, offset=0)
+    assert page.total == 0 and page.items == []
+
+
+def test_migration_backfills_cents_and_keeps_legacy_writes_in_sync(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "cents.db"))
+    apply_migrations(conn, [m for m in PRODUCT_MIGRATIONS if m.version < "products_0006"])
+    conn.executemany(
+        "INSERT INTO products (name, price, category) VALUES (?, ?, 'Home')",
+        [("a", 19.99), ("b", 0.1 + 0.2), ("c", 1e6 + 0.07)],
+    )
+    apply_migrations(conn, PRODUCT_MIGRATIONS)
+
+    rows = conn.execute("SELECT price_cents, price FROM products ORDER BY id").fetchall()
+    assert rows == [(1999, 19.99), (30, 0.3), (100000007, 1000000.07)]
+
+    # Writers that only know about price get price_cents derived
+    conn.execute("INSERT INTO products (name, price, category) VALUES ('d', 4.2, 'Home')")
+    conn.execute("UPDATE products SET price = 5.551 WHERE name = 'a'")
+    rows = conn.execute("SELECT name, price_cents, price FROM products WHERE name IN ('a', 'd') ORDER BY name")
+    assert rows.fetchall() == [("a", 555, 5.55), ("d", 420, 4.2)]
+
+
+def test_price_filters_and_sort_use_cents(client: TestClient):
+    created = client.post("/products", json={"name": "Penny Sweet", "price": 0.3, "stock": 1, "category": "Food"})
+    assert created.status_code == 201
+
+    resp = client.get("/products", params={"min_price": 0.3, "max_price": 0.3})
+    assert [p["name"] for p in resp.json()["items"]] == ["Penny Sweet"]
+
+    prices = [p["price"] for p in client.get("/products", params={"sort": "price", "limit": 100}).json()["items"]]
+    assert prices == sorted(prices) and prices[0] == 0.3
+
+    exported = client.get("/products/export", params={"category": "Food", "format": "csv"}).text
+    assert exported.splitlines()[1].split(",")[2] == "0.30"
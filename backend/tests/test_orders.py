@@ -0,0 +1,122 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.orders.application.dto import CheckoutLine
+from src.orders.application.use_cases.place_order import place_order
+from src.orders.domain.entities import Order
+from src.orders.domain.errors import InsufficientStock, InvalidQuantity
+from src.orders.infrastructure.uow import SQLAlchemyOrderUnitOfWork
+from src.products import database as pdb
+from src.shared.security import create_token
+
+
+def _db() -> sqlite3.Connection:
+    return sqlite3.connect(pdb.DATABASE_PATH)
+
+
+def _user(email: str) -> dict:
+    conn = _db()
+    user_id = conn.execute("INSERT INTO users (email, password_hash) VALUES (?, 'x')", (email,)).lastrowid
+    conn.commit()
+    conn.close()
+    return {"Authorization": f"Bearer {create_token({'sub': str(user_id)})}"}
+
+
+def _set_stock(stock: dict) -> None:
+    conn = _db()
+    conn.executemany("UPDATE products SET stock = ? WHERE id = ?", [(units, pid) for pid, units in stock.items()])
+    conn.commit()
+    conn.close()
+
+
+def _stock(*ids: int) -> list:
+    conn = _db()
+    rows = [conn.execute("SELECT stock FROM products WHERE id = ?", (pid,)).fetchone()[0] for pid in ids]
+    conn.close()
+    return rows
+
+
+def test_order_merges_repeated_products_and_validates_quantities():
+    order = Order.create(user_id=1, lines=[(3, 1), (5, 2), (3, 4)])
+    assert order.quantities == {3: 5, 5: 2}
+    assert order.priced({3: 250, 5: 1000}).total_cents == 3250
+    with pytest.raises(InvalidQuantity):
+        Order.create(user_id=1, lines=[(3, 0)])
+
+
+def test_checkout_reserves_stock_and_records_the_order(client: TestClient):
+    headers = _user("buyer@example.com")
+    _set_stock({1: 10, 2: 5})
+    assert client.get("/products/2").json()["stock"] == 5
+    resp = client.post("/orders", headers=headers, json={"items": [
+        {"product_id": 1, "quantity": 3}, {"product_id": 2, "quantity": 5}, {"product_id": 1, "quantity": 1},
+    ]})
+    assert resp.status_code == 201
+    order = resp.json()
+    assert [(i["product_id"], i["quantity"]) for i in order["items"]] == [(1, 4), (2, 5)]
+    assert order["total"] == pytest.approx(sum(i["line_total"] for i in order["items"]))
+    assert _stock(1, 2) == [6, 0]
+    # Product reads see the new stock, not a cached copy
+    assert client.get("/products/2").json()["stock"] == 0
+
+    assert client.get(f"/orders/{order['id']}", headers=headers).json() == order
+    assert client.get(f"/orders/{order['id']}", headers=_user("other@example.com")).status_code == 404
+    assert client.post("/orders", json={"items": [{"product_id": 1, "quantity": 1}]}).status_code == 401
+
+
+def test_checkout_is_all_or_nothing(client: TestClient):
+    headers = _user("buyer@example.com")
+    _set_stock({1: 10, 2: 1})
+    resp = client.post("/orders", headers=headers, json={"items": [
+        {"product_id": 1, "quantity": 2}, {"product_id": 2, "quantity": 3}, {"product_id": 999999, "quantity": 1},
+    ]})
+    assert resp.status_code == 409
+    assert sorted(resp.json()["shortfalls"], key=lambda s: s["product_id"]) == [
+        {"product_id": 2, "requested": 3, "available": 1},
+        {"product_id": 999999, "requested": 1, "available": None},
+    ]
+    assert _stock(1, 2) == [10, 1]
+    conn = _db()
+    assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0
+    conn.close()
+    assert client.post("/orders", headers=headers, json={"items": []}).status_code == 422
+
+
+def test_concurrent_checkouts_never_oversell(client: TestClient):
+    _set_stock({1: 20, 2: 15, 3: 10})
+
+    def checkout(i: int) -> bool:
+        lines = [CheckoutLine(1 + i % 3, 1 + i % 2), CheckoutLine(1 + (i + 1) % 3, 1)]
+        try:
+            with SQLAlchemyOrderUnitOfWork() as uow:
+                place_order(uow, user_id=None, lines=lines)
+            return True
+        except InsufficientStock:
+            return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        placed = sum(pool.map(checkout, range(60)))
+
+    conn = _db()
+    sold = dict(conn.execute("SELECT product_id, SUM(quantity) FROM order_items GROUP BY product_id").fetchall())
+    orders = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    conn.close()
+    remaining = _stock(1, 2, 3)
+    assert orders == placed and 0 < placed < 60
+    assert min(remaining) >= 0
+    assert [sold.get(pid, 0) + left for pid, left in zip((1, 2, 3), remaining)] == [20, 15, 10]
+
+
+def test_products_with_orders_cannot_be_hard_deleted(client: TestClient):
+    headers = _user("buyer@example.com")
+    _set_stock({4: 5})
+    assert client.post("/orders", headers=headers, json={"items": [{"product_id": 4, "quantity": 1}]}).status_code == 201
+    assert client.delete("/products/4").status_code == 409
+    assert client.get("/products/4").status_code == 200
+
+    resp = client.request("DELETE", "/products/bulk", params={"hard": True}, json={"ids": [5, 4]})
+    assert resp.status_code == 409
+    assert client.get("/products/5").status_code == 200  # the whole batch was rolled back
@@ -0,0 +1,77 @@
+import asyncio
+import sqlite3
+from typing import Dict, Generator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from src.products import database as pdb
+from src.products.api import get_read_uow_factory
+from src.products.infrastructure.db.session import ReadOnlySession, create_read_only_engine
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork
+from src.shared.batch_loader import BatchLoader
+
+
+@pytest.fixture()
+def lookup_client(client: TestClient) -> Generator[TestClient, None, None]:
+    # The lookup endpoint reads through SQLAlchemyReadOnlyUnitOfWork; bind it to the test database
+    engine = create_read_only_engine(pdb.DATABASE_PATH)
+    factory = sessionmaker(bind=engine, class_=ReadOnlySession, autoflush=False, expire_on_commit=False)
+    client.app.dependency_overrides[get_read_uow_factory] = lambda: lambda: SQLAlchemyReadOnlyUnitOfWork(factory)
+    yield client
+    client.app.dependency_overrides.pop(get_read_uow_factory, None)
+    engine.dispose()
+
+
+def test_lookup_keeps_request_order_and_reports_missing(lookup_client: TestClient):
+    with sqlite3.connect(pdb.DATABASE_PATH) as conn:
+        conn.execute("UPDATE products SET is_active = 0 WHERE id = 4")
+
+    resp = lookup_client.post("/products/lookup", json={"ids": [7, 999, 2, 4, 7, 1]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [p["id"] for p in data["items"]] == [7, 2, 1]
+    assert data["missing"] == [999, 4]
+
+    single = lookup_client.get("/products/2").json()
+    assert data["items"][1] == single
+
+    assert lookup_client.post("/products/lookup", json={"ids": []}).status_code == 422
+
+
+def test_concurrent_loads_share_one_batch():
+    calls: List[List[int]] = []
+
+    async def batch_load(ids: List[int]) -> Dict[int, str]:
+        calls.append(ids)
+        return {i: f"p{i}" for i in ids if i != 3}
+
+    async def scenario():
+        loader = BatchLoader(batch_load, max_batch_size=2)
+        found = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3), loader.load(1))
+        again = await loader.load(2)  # memoized
+        return loader, found, again
+
+    loader, found, again = asyncio.run(scenario())
+    assert found == ["p1", "p2", None, "p1"] and again == "p2"
+    assert calls == [[1, 2], [3]] and loader.batches == 2
+
+
+def test_failed_batch_is_retried_on_next_load():
+    attempts = []
+
+    async def batch_load(ids: List[int]) -> Dict[int, int]:
+        attempts.append(ids)
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+        return {i: i * 10 for i in ids}
+
+    async def scenario():
+        loader = BatchLoader(batch_load)
+        with pytest.raises(RuntimeError):
+            await loader.load_many([1, 2])
+        return await loader.load_many([2, 1])
+
+    assert asyncio.run(scenario()) == [20, 10]
+    assert attempts == [[1, 2], [2, 1]]
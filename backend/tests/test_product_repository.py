@@ -0,0 +1,98 @@
+from typing import Generator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.products.application.dto import ListProductsFilters
+from src.products.application.use_cases.list_products import list_products
+from src.products.infrastructure.repositories.product_repository_sqlalchemy import SQLAlchemyProductRepository
+from src.shared.pagination import InvalidCursor
+
+
+class _SessionUoW:
+    """Minimal unit of work over an existing session, for driving use cases in tests."""
+
+    def __init__(self, session: Session) -> None:
+        self.products = SQLAlchemyProductRepository(session)
+
+
+@pytest.fixture()
+def session(tmp_path, monkeypatch) -> Generator[Session, None, None]:
+    from src.products import database as pdb
+
+    db_path = tmp_path / "repo.db"
+    monkeypatch.setattr(pdb, "DATABASE_PATH", str(db_path), raising=False)
+    pdb.init_database()
+
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    with Session(engine) as s:
+        yield s
+    engine.dispose()
+
+
+def test_keyset_pages_match_offset_pages(session: Session):
+    uow = _SessionUoW(session)
+    filters = ListProductsFilters()
+    everything = list_products(uow, filters=filters, limit=100, offset=0, sort="price")
+
+    ids, cursor = [], None
+    while True:
+        page = list_products(uow, filters=filters, limit=4, offset=0, sort="price", cursor=cursor)
+        ids.extend(p.id for p in page.items)
+        assert page.total == everything.total
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert ids == [p.id for p in everything.items]
+
+
+def test_cursor_for_other_sort_is_rejected(session: Session):
+    uow = _SessionUoW(session)
+    page = list_products(uow, filters=ListProductsFilters(), limit=2, offset=0)
+
+    with pytest.raises(InvalidCursor):
+        list_products(uow, filters=ListProductsFilters(), limit=2, offset=0, sort="-price", cursor=page.next_cursor)
+
+
+def test_full_text_search_ranks_by_relevance(session: Session):
+    uow = _SessionUoW(session)
+    page = list_products(uow, filters=ListProductsFilters(search="coffee"), limit=10, offset=0, sort="relevance")
+
+    assert page.total == 2
+    assert [p.name for p in page.items] == ["Coffee Maker Deluxe", "Ceramic Coffee Mug"]
+
+
+def test_page_and_exact_total_come_from_one_statement(session: Session):
+    from sqlalchemy import event
+
+    from src.products.totals import count_cache
+
+    statements = []
+    listener = lambda conn, cursor, stmt, *args: statements.append(stmt)  # noqa: E731
+    event.listen(session.get_bind(), "before_cursor_execute", listener)
+    count_cache.clear()
+    try:
+        page = list_products(
+            _SessionUoW(session), filters=ListProductsFilters(min_price="50", max_price="300"), limit=2, offset=0
+        )
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", listener)
+
+    product_queries = [s for s in statements if "FROM products" in s]
+    assert len(product_queries) == 1 and "count(*)" in product_queries[0]
+    assert page.total == 6 and [p.price_amount for p in page.items] == ["159.99", "129.99"]
+    assert len(session.identity_map) == 0
+
+
+def test_price_bounds_round_like_the_router(session: Session):
+    session.execute(text("UPDATE products SET price = 10.0, price_cents = 1000 WHERE id = 1"))
+    uow = _SessionUoW(session)
+
+    def ids(**bounds):
+        return [p.id for p in list_products(uow, filters=ListProductsFilters(**bounds), limit=100, offset=0).items]
+
+    assert 1 in ids(min_price="10.00", max_price="10.00")
+    assert 1 not in ids(min_price="10.005", max_price="10.01")
+    assert 1 not in ids(min_price="0", max_price="9.999")
@@ -1,31 +1,22 @@
+import base64
 import importlib
 import os
-from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.shared.pagination import encode_cursor
 
-@pytest.fixture(scope="function")
-def client(tmp_path, monkeypatch) -> Generator[TestClient, None, None]:
-    # Point products DB to a temporary sqlite file and initialize schema + sample data
-    from src.products import database as pdb
 
-    test_db_path = tmp_path / "test_products.db"
-    monkeypatch.setattr(pdb, "DATABASE_PATH", str(test_db_path), raising=False)
-    pdb.init_database()
-
-    # Build app after DB setup so routes use the patched DB module
-    from main import app
-    with TestClient(app) as c:
-        yield c
+def _raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
 
 
 def test_get_products_default_pagination(client: TestClient):
     resp = client.get("/products")
     assert resp.status_code == 200
     data = resp.json()
-    assert set(data.keys()) == {"items", "total", "limit", "offset"}
+    assert set(data.keys()) == {"items", "total", "limit", "offset", "next_cursor"}
     assert isinstance(data["items"], list)
     assert data["limit"] == 20
     assert data["offset"] == 0
@@ -68,3 +59,80 @@ def test_pagination_offset_changes_results(client: TestClient):
         assert first["items"][0]["id"] != second["items"][0]["id"]
 
 
+def test_cursor_pagination_walks_whole_catalog(client: TestClient):
+    expected = [p["id"] for p in client.get("/products", params={"limit": 100}).json()["items"]]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        data = client.get("/products", params=params).json()
+        seen.extend(p["id"] for p in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_cursor_pagination_by_price_desc(client: TestClient):
+    first = client.get("/products", params={"limit": 4, "sort": "-price"}).json()
+    second = client.get(
+        "/products", params={"limit": 4, "sort": "-price", "cursor": first["next_cursor"]}
+    ).json()
+
+    prices = [p["price"] for p in first["items"] + second["items"]]
+    assert prices == sorted(prices, reverse=True)
+    assert not {p["id"] for p in first["items"]} & {p["id"] for p in second["items"]}
+
+
+def test_invalid_or_mismatched_cursor_is_rejected(client: TestClient):
+    assert client.get("/products", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    cursor = client.get("/products", params={"limit": 2}).json()["next_cursor"]
+    assert client.get("/products", params={"cursor": cursor, "sort": "price"}).status_code == 400
+    assert client.get("/products", params={"cursor": cursor, "offset": 2}).status_code == 400
+
+
+@pytest.mark.parametrize("sort", ["price", "-price", "relevance", "id"])
+@pytest.mark.parametrize("key", [[1], {"a": 1}, "abc", None, True, 2**70, "Infinity"])
+def test_cursor_with_malformed_sort_key_is_rejected(client: TestClient, sort, key):
+    params = {"sort": sort, "search": "a"} if sort == "relevance" else {"sort": sort}
+    if key == "Infinity":
+        cursor = _raw_cursor(f'["{sort}",Infinity,1]')
+    else:
+        cursor = encode_cursor(sort, key, 1)
+    assert client.get("/products", params={**params, "cursor": cursor}).status_code == 400
+
+
+def test_legacy_price_cursor_in_amounts_still_pages(client: TestClient):
+    first = client.get("/products", params={"limit": 2, "sort": "price"}).json()
+    amount = first["items"][-1]["price"]
+    legacy = encode_cursor("price", float(amount), first["items"][-1]["id"])
+    resp = client.get("/products", params={"limit": 2, "sort": "price", "cursor": legacy})
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["price"] >= amount
+
+
+def test_search_uses_prefixes_and_description(client: TestClient):
+    # "prem" prefixes "Premium", which appears in one name and two descriptions
+    resp = client.get("/products", params={"search": "prem", "sort": "relevance", "limit": 2})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 3
+    assert data["items"][0]["name"] == "Yoga Mat Premium"  # name hits outrank description hits
+
+    rest = client.get(
+        "/products", params={"search": "prem", "sort": "relevance", "limit": 2, "cursor": data["next_cursor"]}
+    ).json()
+    names = {p["name"] for p in data["items"] + rest["items"]}
+    assert names == {"Yoga Mat Premium", "Coffee Maker Deluxe", "Wireless Headphones"}
+    assert rest["next_cursor"] is None
+
+
+def test_search_index_follows_updates(client: TestClient):
+    product_id = client.get("/products", params={"search": "Smart Watch"}).json()["items"][0]["id"]
+    assert client.put(f"/products/{product_id}", json={"name": "Fitness Tracker"}).status_code == 200
+
+    assert client.get("/products", params={"search": "watch"}).json()["total"] == 0
+    found = client.get("/products", params={"search": "tracker"}).json()["items"]
+    assert [p["id"] for p in found] == [product_id]
@@ -0,0 +1,84 @@
+import logging
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.shared.query_log import TracedConnection, fingerprint, parameter_shape, query_log
+
+
+@pytest.fixture
+def traced(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "traced.db"), factory=TracedConnection)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price INTEGER)")
+    conn.executemany("INSERT INTO items (name, price) VALUES (?, ?)", [(f"item {i}", i) for i in range(50)])
+    conn.commit()
+    query_log.clear()
+    yield conn
+    conn.close()
+    query_log.clear()
+
+
+def test_fingerprint_folds_literals_and_lists():
+    assert fingerprint("SELECT * FROM products WHERE id = 42 AND name = 'it''s'") == (
+        "SELECT * FROM products WHERE id = ? AND name = ?"
+    )
+    assert fingerprint("SELECT *\n  FROM t WHERE id IN (?, ?,?)") == "SELECT * FROM t WHERE id IN (?, ...)"
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    # Identifiers with digits and placeholders are left alone
+    assert fingerprint("SELECT col1 FROM t2 WHERE x = :p1 LIMIT ?") == "SELECT col1 FROM t2 WHERE x = :p1 LIMIT ?"
+
+
+def test_parameter_shape_reports_types_not_values():
+    assert parameter_shape(("secret", 3, None)) == "(str, int, NoneType)"
+    assert parameter_shape(list(range(500))) == "(int x 500)"
+    assert parameter_shape({"email": "a@b.c"}) == "{email: str}"
+
+
+def test_statements_are_aggregated_with_rows_and_plans(traced):
+    for low in (1, 2, 3):
+        rows = traced.execute("SELECT * FROM items WHERE price > ?", (low,)).fetchall()
+    cursor = traced.execute("SELECT id FROM items WHERE id = 7")
+    assert cursor.fetchone() == (7,)
+    cursor.close()
+
+    top = {q["fingerprint"]: q for q in query_log.top(10)}
+    scan = top["SELECT * FROM items WHERE price > ?"]
+    assert scan["calls"] == 3
+    assert scan["rows"] == len(rows) * 3 + 3
+    assert scan["full_scan"] and scan["plan"] == ["SCAN items"]
+    lookup = top["SELECT id FROM items WHERE id = ?"]
+    assert lookup["rows"] == 1 and not lookup["full_scan"]
+    assert query_log.top(1, order_by="calls")[0]["fingerprint"] == "SELECT * FROM items WHERE price > ?"
+
+
+def test_fetchmany_batches_count_as_one_statement(traced):
+    cursor = traced.execute("SELECT * FROM items")
+    while cursor.fetchmany(20):
+        pass
+    (stats,) = [q for q in query_log.top(10) if q["fingerprint"] == "SELECT * FROM items"]
+    assert stats["calls"] == 1 and stats["rows"] == 50
+
+
+def test_slow_statements_are_logged_with_shape_and_plan(traced, monkeypatch, caplog):
+    monkeypatch.setattr(query_log, "threshold_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="src.shared.query_log"):
+        traced.execute("SELECT name FROM items WHERE name LIKE ?", ("item 1%",)).fetchall()
+
+    (record,) = [r for r in caplog.records if "FROM items WHERE name LIKE" in r.getMessage()]
+    message = record.getMessage()
+    assert "11 rows" in message
+    assert "params (str)" in message
+    assert "SCAN items" in message
+    assert "item 1%" not in message
+
+
+def test_top_queries_endpoint(client: TestClient):
+    assert client.get("/products/?limit=5").status_code == 200
+    resp = client.get("/metrics/queries", params={"limit": 5})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["threshold_ms"] == query_log.threshold_ms
+    totals = [q["total_ms"] for q in body["queries"]]
+    assert 0 < len(totals) <= 5 and totals == sorted(totals, reverse=True)
+    assert client.get("/metrics/queries", params={"order_by": "name"}).status_code == 422
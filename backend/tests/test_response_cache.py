@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from src.products.cache import catalog_cache
+from src.shared.response_cache import ResponseCache
+
+
+def _loader(values):
+    async def load():
+        return values.pop(0)
+    return load
+
+
+def test_namespaces_invalidate_only_dependent_entries():
+    async def scenario():
+        cache = ResponseCache(max_entries=2, ttl=60)
+        assert await cache.get_or_load("a", ["list", "item:1"], _loader(["a1"])) == "a1"
+        assert await cache.get_or_load("b", ["list", "item:2"], _loader(["b1"])) == "b1"
+        assert await cache.get_or_load("a", ["list", "item:1"], _loader(["unused"])) == "a1"
+
+        cache.bump("item:2")
+        assert await cache.get_or_load("a", ["list", "item:1"], _loader(["unused"])) == "a1"
+        assert await cache.get_or_load("b", ["list", "item:2"], _loader(["b2"])) == "b2"
+
+        await cache.get_or_load("c", ["list"], _loader(["c1"]))  # evicts the least recently used
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["hits"] == 2 and stats["misses"] == 4
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+
+
+def test_serves_stale_when_database_is_locked_and_revalidates_in_background():
+    async def scenario():
+        cache = ResponseCache(ttl=0, stale_ttl=60)
+        await cache.get_or_load("k", ["list"], _loader(["v1"]))
+
+        # Expired but not invalidated: served at once, refreshed by a background task
+        assert await cache.get_or_load("k", ["list"], _loader(["v2"])) == "v1"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        async def locked():
+            raise sqlite3.OperationalError("database is locked")
+
+        cache.bump("list")
+        assert await cache.get_or_load("k", ["list"], locked) == "v2"
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["stale_served"] == 1 and stats["refreshes"] == 1 and stats["stale_on_locked"] == 1
+
+
+def test_external_version_invalidates_writes_from_other_processes():
+    async def scenario():
+        version = [7]
+
+        async def current_version():
+            return version[0]
+
+        cache = ResponseCache(ttl=60, version=current_version)
+        await cache.get_or_load("k", ["list"], _loader(["v1"]))
+        assert await cache.get_or_load("k", ["list"], _loader(["unused"])) == "v1"
+
+        version[0] += 1  # a write in another process: no bump() here
+        assert await cache.get_or_load("k", ["list"], _loader(["v2"])) == "v2"
+        assert await cache.get_or_load("k", ["list"], _loader(["unused"])) == "v2"
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["version_checked"]
+
+
+def test_product_writes_invalidate_cached_reads(client: TestClient):
+    product = client.get("/products", params={"search": "yoga"}).json()["items"][0]
+    hits_before = catalog_cache.stats()["hits"]
+    assert client.get(f"/products/{product['id']}").json()["name"] == "Yoga Mat Premium"
+    assert client.get(f"/products/{product['id']}").json()["name"] == "Yoga Mat Premium"
+    assert catalog_cache.stats()["hits"] == hits_before + 1
+
+    client.put(f"/products/{product['id']}", json={"name": "Yoga Mat Travel"})
+
+    assert client.get(f"/products/{product['id']}").json()["name"] == "Yoga Mat Travel"
+    assert client.get("/products", params={"search": "yoga"}).json()["items"][0]["name"] == "Yoga Mat Travel"
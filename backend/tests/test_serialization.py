@@ -0,0 +1,61 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.products.models import PaginatedProducts, Product
+from src.products.serialization import render_page, render_page_with_models
+
+ROWS = [
+    (1, "Laptop HP Pavilion", 89999, 10, "Electronics", "High performance laptop", 1),
+    (2, 'Quote " backslash \\ slash /', 10, 0, "Home", None, 1),
+    (3, "Ünïcödé café ☕ 👟", 10**18, 2**40, "Sports", "", 0),
+    (4, "Control \n\t\x01 chars", 1, 5, "Books", "line\nbreak sep", 1),
+    (5, "x" * 255, 12345678913, 1, "C", "d" * 1000, 1),
+    (6, "Whole", 1000, 3, "Toys", "ten", 1),
+]
+
+
+def _legacy_app(rows, **page) -> FastAPI:
+    """The previous path: Product models validated and rendered through response_model."""
+    app = FastAPI()
+
+    @app.get("/page", response_model=PaginatedProducts)
+    async def page_route():
+        products: List[Product] = []
+        for p in rows:
+            products.append(Product(
+                id=p[0], name=p[1], price=p[2] / 100, stock=p[3], category=p[4],
+                description=p[5] if p[5] else "", is_active=bool(p[6]),
+            ))
+        return PaginatedProducts(items=products, **page)
+
+    return app
+
+
+@pytest.mark.parametrize("page", [
+    dict(total=5, limit=20, offset=0, next_cursor=None),
+    dict(total=None, limit=2, offset=40, next_cursor="WyJpZCIsMiwyXQ"),
+])
+def test_fast_path_is_byte_identical_to_response_model_path(page):
+    expected = TestClient(_legacy_app(ROWS, **page)).get("/page").content
+
+    assert render_page(ROWS, **page) == expected
+    assert render_page_with_models(ROWS, **page) == expected
+    assert render_page([], **page) == TestClient(_legacy_app([], **page)).get("/page").content
+
+
+@pytest.mark.parametrize("bad_row", [
+    (7, "", 100, 1, "Home", None, 1),               # empty name
+    (8, "Free", 0, 1, "Home", None, 1),             # price must be > 0
+    (9, "Broken", None, 1, "Home", None, 1),
+    (10, "Missing category", 500, 1, None, None, 1),
+    (11, "Negative", 500, -1, "Home", None, 1),
+])
+def test_rows_outside_the_model_fall_back_to_validation(bad_row):
+    page = dict(total=1, limit=20, offset=0, next_cursor=None)
+    assert render_page([ROWS[0], bad_row], **page) is None
+    with pytest.raises(ValidationError):
+        render_page_with_models([ROWS[0], bad_row], **page)
@@ -0,0 +1,59 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_supervised_workers_recycle_and_drain(tmp_path):
+    port = _free_port()
+    # cwd=tmp_path: the default relative database file is created there
+    server = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "main.py"), "--workers", "2", "--host", "127.0.0.1",
+         "--port", str(port), "--max-requests", "8", "--graceful-timeout", "5"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/readyz").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.monotonic() < deadline and server.poll() is None, "server did not start"
+            time.sleep(0.2)
+
+        # Each request opens a new connection; 20 requests recycle at least one worker
+        statuses = []
+        for i in range(20):
+            for _ in range(50):
+                try:
+                    statuses.append(httpx.get(f"http://127.0.0.1:{port}/products/{1 + i % 10}").status_code)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.1)  # every worker is restarting at this instant
+        assert statuses == [200] * 20
+    finally:
+        server.send_signal(signal.SIGTERM)
+        output, _ = server.communicate(timeout=30)
+
+    assert server.returncode == 0
+    assert "recycled" in output and "Draining" in output
+    assert (tmp_path / "ecommerce.db").exists()
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.bench_startup import IMPORT_FIRST_PARTY_BUDGET_MS, import_profile, summarize_imports
+from src.shared import password_hasher
+from src.shared.startup import Readiness, readiness, run_startup
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_app_has_no_side_effects(tmp_path):
+    # Run from an empty directory: the default "ecommerce.db" would be created there
+    probe = "import logging, main; print(len(logging.getLogger().handlers))"
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "0"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lifespan_marks_ready_after_startup(client: TestClient):
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert set(resp.json()["steps"]) == {"logging", "database", "pools", "warm_caches", "health_checks"}
+    assert readiness.ready
+
+
+def test_lifespan_shuts_down_the_password_hashing_pool(client: TestClient):
+    with TestClient(client.app):
+        hasher = password_hasher.get_password_hasher()
+    assert password_hasher._hasher is None
+    with pytest.raises(RuntimeError):
+        hasher._executor.submit(int)
+
+
+def test_failed_startup_step_stays_not_ready(monkeypatch):
+    import src.shared.startup as startup
+
+    state = Readiness()
+    monkeypatch.setattr(startup, "readiness", state)
+
+    async def ok() -> None:
+        pass
+
+    async def broken() -> None:
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run_startup([("ok", ok), ("broken", broken)]))
+    status = state.status()
+    assert not status["ready"] and status["error"] == "RuntimeError: disk full"
+    assert list(status["steps"]) == ["ok"]
+
+
+def test_first_party_import_time_within_budget():
+    summary = summarize_imports(import_profile())
+    assert summary["first_party_ms"] < IMPORT_FIRST_PARTY_BUDGET_MS
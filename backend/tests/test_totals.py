@@ -0,0 +1,65 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from src.products.migrations import MIGRATIONS as PRODUCT_MIGRATIONS
+from src.shared.migrations import apply_migrations
+
+
+def test_counters_follow_inserts_updates_and_deletes(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "counts.db"))
+    # Rows that exist before the migration are backfilled
+    apply_migrations(conn, PRODUCT_MIGRATIONS[:1])
+    conn.execute("INSERT INTO products (name, price, category) VALUES ('a', 1, 'Home')")
+    conn.commit()
+    apply_migrations(conn, PRODUCT_MIGRATIONS)
+
+    conn.executemany(
+        "INSERT INTO products (name, price, category, is_active) VALUES (?, ?, ?, ?)",
+        [("b", 2, "Home", 1), ("c", 3, "Toys", 1), ("d", 4, None, 0)],
+    )
+    conn.execute("UPDATE products SET category = 'Toys' WHERE name = 'a'")
+    conn.execute("UPDATE products SET is_active = 0 WHERE name = 'b'")
+    conn.execute("DELETE FROM products WHERE name = 'c'")
+    conn.commit()
+
+    expected = conn.execute(
+        "SELECT IFNULL(category, ''), CASE WHEN is_active = 1 THEN 1 ELSE 0 END, COUNT(*) "
+        "FROM products GROUP BY 1, 2 ORDER BY 1, 2"
+    ).fetchall()
+    counters = conn.execute(
+        "SELECT category, active, n FROM product_counts WHERE n > 0 ORDER BY 1, 2"
+    ).fetchall()
+    assert counters == expected
+
+
+def test_total_modes(client: TestClient):
+    params = {"min_price": 80, "max_price": 200, "limit": 1}
+    exact = client.get("/products", params=params).json()["total"]
+
+    assert client.get("/products", params={**params, "total_mode": "none"}).json()["total"] is None
+    assert client.get("/products", params={**params, "total_mode": "estimate"}).json()["total"] == exact
+    assert client.get("/products", params={"category": "Home", "total_mode": "exact"}).json()["total"] == 3
+
+
+def test_exact_total_sees_writes(client: TestClient):
+    params = {"min_price": 80, "max_price": 200}
+    before = client.get("/products", params=params).json()["total"]
+
+    created = client.post(
+        "/products", json={"name": "Desk Lamp", "price": 99.0, "stock": 3, "category": "Home"}
+    )
+    assert created.status_code == 201
+
+    assert client.get("/products", params=params).json()["total"] == before + 1
+    assert client.get("/products", params={"category": "Home"}).json()["total"] == 4
+
+
+def test_sub_cent_price_bounds_do_not_share_a_cache_entry(client: TestClient):
+    created = client.post("/products", json={"name": "Tea Cup", "price": 10.0, "stock": 1, "category": "Kitchen"})
+    assert created.status_code == 201
+
+    exact = client.get("/products", params={"min_price": "10.00", "max_price": "10.00"}).json()
+    empty = client.get("/products", params={"min_price": "10.001", "max_price": "10.00"}).json()
+    assert created.json()["id"] in [p["id"] for p in exact["items"]]
+    assert empty["total"] == 0 and empty["items"] == []
@@ -0,0 +1,90 @@
+import sqlite3
+from typing import Generator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.products.application.dto import ListProductsFilters
+from src.products.application.use_cases.create_product import create_product
+from src.products.application.use_cases.delete_product import delete_product
+from src.products.application.use_cases.get_product import get_product
+from src.products.application.use_cases.list_products import list_products
+from src.products.domain.entities import Product
+from src.products.infrastructure.db.session import ReadOnlySession, ReadOnlyViolation, create_read_only_engine
+from src.products.infrastructure.uow import SQLAlchemyReadOnlyUnitOfWork, SQLAlchemyUnitOfWork
+from src.shared.connection_pool import close_all_pools, get_pool
+
+
+@pytest.fixture()
+def read_only_factory(tmp_path, monkeypatch) -> Generator[sessionmaker, None, None]:
+    from src.products import database as pdb
+
+    db_path = str(tmp_path / "uow.db")
+    monkeypatch.setattr(pdb, "DATABASE_PATH", db_path, raising=False)
+    pdb.init_database()
+
+    engine = create_read_only_engine(db_path)
+    yield sessionmaker(bind=engine, class_=ReadOnlySession, autoflush=False, expire_on_commit=False)
+    engine.dispose()
+    close_all_pools()
+
+
+def test_query_use_cases_run_without_committing(read_only_factory):
+    with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+        page = list_products(uow, filters=ListProductsFilters(category="Home"), limit=2, offset=0)
+        product = get_product(uow, product_id=page.items[0].id)
+
+    assert page.total == 3 and product.name == page.items[0].name
+    with pytest.raises(ReadOnlyViolation):
+        with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+            uow.commit()
+
+
+def test_after_commit_gets_the_products_written(read_only_factory):
+    from src.products import database as pdb
+
+    engine = create_engine(f"sqlite:///{pdb.DATABASE_PATH}", future=True)
+    calls = []
+    uow = SQLAlchemyUnitOfWork(sessionmaker(bind=engine), after_commit=lambda *ids: calls.append(set(ids)))
+    with uow:
+        new_id = create_product(uow, name="Lamp", price_amount="9.00", stock_units=1, category="Home")
+        delete_product(uow, product_id=1)
+    assert calls == [{new_id}, {1}]  # nothing left to report when the block exits
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.products.delete(2)
+            raise RuntimeError("rolled back")
+    with uow:
+        uow.products.update_many([])
+    assert calls == [{new_id}, {1}]
+    engine.dispose()
+
+
+def test_writes_are_rejected_before_and_by_sqlite(read_only_factory):
+    with pytest.raises(ReadOnlyViolation):
+        with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+            create_product(uow, name="Sneaky", price_amount="1.00", stock_units=1, category="Home")
+
+    new = Product.create(name="Bulk", price_amount="2.00", stock_units=1, category="Home")
+    with pytest.raises(ReadOnlyViolation):
+        with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+            uow.products.create_many([new])
+
+    # Raw SQL skips the session checks; the mode=ro / query_only connection still refuses it
+    with pytest.raises(Exception, match="readonly"):
+        with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+            uow.products.session.execute(text("DELETE FROM products"))
+
+    with SQLAlchemyReadOnlyUnitOfWork(read_only_factory) as uow:
+        assert list_products(uow, filters=ListProductsFilters(), limit=1, offset=0).total == 10
+
+
+def test_read_only_pool_connections_cannot_write(read_only_factory):
+    from src.products import database as pdb
+
+    with get_pool(pdb.DATABASE_PATH, read_only=True).connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 10
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("UPDATE products SET stock = 0")